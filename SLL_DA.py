@@ -4,13 +4,17 @@
 
 
 class SLNode:
-    def __init__(self, key: str, value: object) -> None:
+    # Nodes make up most of a hash map's memory, so they do not carry an instance __dict__.
+    __slots__ = ('next', 'key', 'value', 'hash')
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
         """
-        Singly Linked List Node class.
+        Singly Linked List Node class.  The full hash value of the key can be stored with the node so that it does not have to be recomputed.
         """
         self.next = None
         self.key = key
         self.value = value
+        self.hash = hash
 
     def __str__(self):
         """ 
@@ -21,9 +25,11 @@ class SLNode:
 
 class LinkedList:
     """
-    Class implementing a Singly Linked List.  Supported methods are: insert(), remove(), contains(), length(), and iterator().
+    Class implementing a Singly Linked List.  Supported methods are: insert(), insert_node(), remove(), contains(), length(), and iterator().
     """
 
+    __slots__ = ('head', 'size')
+
     def __init__(self) -> None:
         """ 
         Init a new SLL. 
@@ -44,20 +50,40 @@ class LinkedList:
                 cur = cur.next
         return 'SLL [' + content + ']'
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """ 
         Insert a new node at the beginning of the list. 
         """
-        new_node = SLNode(key, value)
+        new_node = SLNode(key, value, hash)
         new_node.next = self.head
         self.head = new_node
         self.size = self.size + 1
 
-    def remove(self, key: str) -> bool:
+    def insert_node(self, node: SLNode) -> None:
+        """
+        Insert an existing node at the beginning of the list.  Used to move nodes between lists without allocating new ones.
+        """
+        node.next = self.head
+        self.head = node
+        self.size = self.size + 1
+
+    def remove(self, key: str, hash: int = None) -> bool:
         """
-        Remove the first node with matching key.  Return True if some node was removed, False otherwise.
+        Remove the first node with matching key.  Return True if some node was removed, False otherwise.  If hash is given, the stored hashes are compared before the keys.
         """
         prev, cur = None, self.head
+        if hash is not None:
+            while cur is not None and (cur.hash != hash or cur.key != key):
+                prev, cur = cur, cur.next
+            if cur is None:
+                return False
+            if prev:
+                prev.next = cur.next
+            else:
+                self.head = cur.next
+            self.size -= 1
+            return True
+
         while cur is not None:
             if cur.key == key:
                 if prev:
@@ -69,11 +95,16 @@ class LinkedList:
             prev, cur = cur, cur.next
         return False
 
-    def contains(self, key: str) -> SLNode:
+    def contains(self, key: str, hash: int = None) -> SLNode:
         """
-        If a node with matching key is in the list, return the pointer to that node (SLNode).  Otherwise, return None.
+        If a node with matching key is in the list, return the pointer to that node (SLNode).  Otherwise, return None.  If hash is given, the stored hashes are compared before the keys.
         """
         cur = self.head
+        if hash is not None:
+            while cur is not None and (cur.hash != hash or cur.key != key):
+                cur = cur.next
+            return cur
+
         while cur is not None:
             if cur.key == key:
                 return cur
@@ -108,6 +139,8 @@ class DynamicArray:
     Class implementing a Dynamic Array.  Supported methods are: append(), pop(), swap(), get_at_index(), set_at_index(), and length().
     """
 
+    __slots__ = ('data',)
+
     def __init__(self, arr=None):
         """ 
         Init a new dynamic array.
@@ -0,0 +1,1023 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Benchmarks for hash_map_chaining.py and hash_map_open_addressing.py.  Run "python benchmark.py" to run all of them.
+
+import asyncio
+import collections
+import functools
+import gc
+import io
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+
+import hash_functions
+import hash_map_async
+import hash_map_chaining
+import hash_map_concurrent
+import hash_map_flat
+import hash_map_lru
+import hash_map_mmap
+import hash_map_open_addressing
+import hash_map_shared
+import hash_map_ttl
+import hash_map_wal
+import memoize
+import probing
+
+
+def make_keys(count: int, prefix: str = 'key') -> list:
+    """
+    This function returns a list of count distinct string keys.
+    """
+    return [prefix + str(i) for i in range(count)]
+
+
+def make_key_sets(count: int) -> dict:
+    """
+    This function returns a few realistic key sets of count keys each: sequential ids, permutations of the same characters, UUIDs, and URL paths.
+    """
+    rng = random.Random(42)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    anagrams = set()
+    base = list('key0123456789')
+    while len(anagrams) < count:
+        rng.shuffle(base)
+        anagrams.add(''.join(base))
+    return {
+        'sequential': make_keys(count),
+        'anagrams': list(anagrams),
+        'uuid': [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(count)],
+        'url': ['/' + '/'.join(''.join(rng.choice(letters) for _ in range(rng.randint(3, 8))) for _ in range(3)) + '?id=' + str(i) for i in range(count)],
+    }
+
+
+def time_call(function, *args) -> float:
+    """
+    This function calls function with the given arguments and returns the elapsed wall-clock time in seconds.
+    """
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+
+def bulk_load(hash_map, keys: list) -> None:
+    """
+    This function puts every key of keys into hash_map.
+    """
+    for i, key in enumerate(keys):
+        hash_map.put(key, i)
+
+
+class RepeatedWalkHashMap(hash_map_chaining.HashMap):
+    """
+    Chaining hash map with the original get(), put() and contains_key(), which hash the key and walk the chain several times per call and compare keys only.  It is only kept here for comparison.  Nodes still get their hash, so the other HashMap methods work on it.
+    """
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Original contains_key(): compares keys without the stored hashes.
+        """
+        if self.size == 0:
+            return False
+        bucket = self.buckets.get_at_index(self.hash_function(key) % self.buckets.length())
+        return bucket.contains(key) is not None
+
+    def get(self, key: str) -> object:
+        """
+        Original get(): contains_key() followed by a second hash and chain walk.
+        """
+        if self.contains_key(key) is False:
+            return None
+        bucket = self.buckets.get_at_index(self.hash_function(key) % self.buckets.length())
+        return bucket.contains(key).value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Original put(): up to two contains() walks, then remove() and insert() on overwrite.
+        """
+        hashed_val = self.hash_function(key)
+        bucket = self.buckets.get_at_index(hashed_val % self.buckets.length())
+        if bucket.length() == 0:
+            bucket.insert(key, value, hashed_val)
+            self.size += 1
+        elif bucket.contains(key) is None:
+            bucket.insert(key, value, hashed_val)
+            self.size += 1
+        elif bucket.contains(key) is not None:
+            bucket.remove(key)
+            bucket.insert(key, value, hashed_val)
+
+
+def lookup_all(hash_map, keys: list) -> None:
+    """
+    This function calls get() for every key of keys.
+    """
+    for key in keys:
+        hash_map.get(key)
+
+
+def benchmark_chaining_probes(capacity: int = 10000, load_factors=(0.5, 1, 2, 4)) -> None:
+    """
+    This function compares the original chaining get()/put() against the single-walk versions at several load factors.  The table is not resized, so the load factor is the average chain length.
+    """
+    print("\nChaining single-walk get()/put()")
+    print("--------------------------------")
+    print(f"{'load':>6} {'op':>10} {'old us/op':>10} {'new us/op':>10} {'speedup':>8}")
+    for load_factor in load_factors:
+        keys = make_keys(int(capacity * load_factor))
+        misses = make_keys(len(keys), 'miss')
+        results = {}
+        for name, cls in (('old', RepeatedWalkHashMap), ('new', hash_map_chaining.HashMap)):
+            m = cls(capacity, hash)
+            insert = time_call(bulk_load, m, keys)
+            overwrite = time_call(bulk_load, m, keys)
+            hit = time_call(lookup_all, m, keys)
+            miss = time_call(lookup_all, m, misses)
+            # Make sure both maps really find their keys, so the hit timings are not misses.
+            assert m.get(keys[-1]) == len(keys) - 1 and m.contains_key(keys[0])
+            results[name] = (insert, overwrite, hit, miss)
+        for i, op in enumerate(('insert', 'overwrite', 'get hit', 'get miss')):
+            old, new = results['old'][i], results['new'][i]
+            print(f"{load_factor:>6} {op:>10} {old / len(keys) * 1e6:>10.2f} {new / len(keys) * 1e6:>10.2f} {old / new:>7.2f}x")
+
+
+def benchmark_hash_functions(count: int = 100000) -> None:
+    """
+    This function measures the speed of each hash function and how evenly it spreads each key set over count buckets.  With an ideal hash about 63.2% of the buckets are used and the longest chain is short.
+    """
+    functions = (
+        ('hash_function_1', hash_map_chaining.hash_function_1),
+        ('hash_function_2', hash_map_chaining.hash_function_2),
+        ('fnv1a_hash', hash_functions.fnv1a_hash),
+        ('builtin_hash', hash_functions.builtin_hash),
+        ('seeded_hash', hash_functions.seeded_hash(12345)),
+    )
+    print("\nHash functions")
+    print("--------------")
+    print(f"{'keys':>12} {'function':>16} {'ns/hash':>10} {'buckets used':>13} {'max chain':>10}")
+    for set_name, keys in make_key_sets(count).items():
+        for name, function in functions:
+            start = time.perf_counter()
+            hashes = [function(key) for key in keys]
+            elapsed = time.perf_counter() - start
+            chains = {}
+            for hashed in hashes:
+                index = hashed % count
+                chains[index] = chains.get(index, 0) + 1
+            print(f"{set_name:>12} {name:>16} {elapsed / count * 1e9:>10.0f} {len(chains) / count:>12.1%} {max(chains.values()):>10}")
+
+
+def benchmark_resize(sizes=(10000, 100000, 1000000)) -> None:
+    """
+    This function doubles the capacity of both hash maps holding increasing numbers of entries and prints the time per entry and the memory allocated by resize_table() per new bucket.  Both should stay flat as the number of entries grows.
+    """
+    print("\nresize_table() to double capacity")
+    print("---------------------------------")
+    print(f"{'map':>16} {'entries':>10} {'seconds':>10} {'us/entry':>10} {'peak B/bucket':>14}")
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        for size in sizes:
+            m = module.HashMap(3 * size, hash)
+            bulk_load(m, make_keys(size))
+            new_capacity = 2 * m.capacity
+            elapsed = time_call(m.resize_table, new_capacity)
+            assert m.capacity == new_capacity and m.size == size
+
+            # Measure allocations separately, since tracemalloc slows everything down.
+            m.resize_table(new_capacity // 2)
+            tracemalloc.start()
+            m.resize_table(new_capacity)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            print(f"{module.__name__[9:]:>16} {size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f} {peak / new_capacity:>14.1f}")
+
+
+def benchmark_hash_cache(size: int = 100000, key_length: int = 200) -> None:
+    """
+    This function resizes both hash maps holding long keys hashed by a Python hash function (fnv1a_hash()) and compares the time taken with the time it would take just to rehash every key, which is the work the stored hashes save.
+    """
+    print("\nStored hashes")
+    print("-------------")
+    print(f"{'map':>16} {'resize s':>10} {'rehash s':>10} {'saved':>8}")
+    keys = [str(i).rjust(key_length, 'k') for i in range(size)]
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        m = module.HashMap(3 * size, hash_functions.fnv1a_hash)
+        bulk_load(m, keys)
+        resize = time_call(m.resize_table, 2 * m.capacity)
+        rehash = time_call(lambda: [m.hash_function(key) for key in keys])
+        print(f"{module.__name__[9:]:>16} {resize:>10.3f} {rehash:>10.3f} {(resize + rehash) / resize:>7.1f}x")
+
+
+class DictSLNode:
+    """
+    SLNode laid out as it was before __slots__, i.e. with an instance __dict__.  Only kept here for comparison.
+    """
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        self.next = None
+        self.key = key
+        self.value = value
+        self.hash = hash
+
+
+class DictHashEntry:
+    """
+    HashEntry laid out as it was before __slots__ and the shared TOMBSTONE.  Only kept here for comparison.
+    """
+
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        self.key = key
+        self.value = value
+        self.hash = hash
+        self.is_tombstone = False
+
+
+def object_bytes(cls, keys: list) -> float:
+    """
+    This function creates one cls(key, value, hash) object per key and returns the memory allocated per object.
+    """
+    value, hashed = object(), 0
+    tracemalloc.start()
+    objects = [cls(key, value, hashed) for key in keys]
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # Do not count the list holding the objects.
+    return (allocated - sys.getsizeof(objects)) / len(objects)
+
+
+def map_bytes_per_entry(module, keys: list) -> float:
+    """
+    This function loads keys into a new hash map from module and returns the memory allocated per entry, including the bucket array but not the keys and values themselves.
+    """
+    value = object()
+    tracemalloc.start()
+    m = module.HashMap(3 * len(keys), hash)
+    for key in keys:
+        m.put(key, value)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return allocated / len(keys)
+
+
+def benchmark_memory(size: int = 1000000) -> None:
+    """
+    This function reports the bytes per entry of both hash maps for size string keys, and the size of a single node/entry object with the old __dict__ layout and with __slots__.
+    """
+    print("\nMemory per entry")
+    print("----------------")
+    print(f"{'map':>16} {'entries':>10} {'bytes/entry':>12}")
+    keys = make_keys(size)
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        print(f"{module.__name__[9:]:>16} {size:>10} {map_bytes_per_entry(module, keys):>12.1f}")
+
+    print(f"\n{'entry object':>16} {'__dict__ B':>12} {'__slots__ B':>12}")
+    print(f"{'SLNode':>16} {object_bytes(DictSLNode, keys):>12.1f} {object_bytes(hash_map_chaining.SLNode, keys):>12.1f}")
+    print(f"{'HashEntry':>16} {object_bytes(DictHashEntry, keys):>12.1f} {object_bytes(hash_map_open_addressing.HashEntry, keys):>12.1f}")
+
+
+def remove_all(hash_map, keys: list) -> None:
+    """
+    This function calls remove() for every key of keys.
+    """
+    for key in keys:
+        hash_map.remove(key)
+
+
+def benchmark_flat_storage(sizes=(10000, 1000000)) -> None:
+    """
+    This function compares the HashEntry layout of hash_map_open_addressing.HashMap with the parallel-array layout of hash_map_flat.FlatHashMap for put, get and remove, and reports the memory used per entry.  Pass sizes=(10000, 1000000, 10000000) for the full comparison; 10M entries need several GB of memory.
+    """
+    print("\nHashEntry vs parallel-array storage")
+    print("-----------------------------------")
+    print(f"{'storage':>12} {'entries':>10} {'put us':>8} {'get us':>8} {'remove us':>10} {'bytes/entry':>12}")
+    for size in sizes:
+        keys = make_keys(size)
+        for name, cls in (('HashEntry', hash_map_open_addressing.HashMap), ('flat', hash_map_flat.FlatHashMap)):
+            m = cls(50, hash)
+            put = time_call(bulk_load, m, keys)
+            get = time_call(lookup_all, m, keys)
+            remove = time_call(remove_all, m, keys)
+            value = object()
+            tracemalloc.start()
+            m = cls(3 * size, hash)
+            for key in keys:
+                m.put(key, value)
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del m
+            print(f"{name:>12} {size:>10} {put / size * 1e6:>8.2f} {get / size * 1e6:>8.2f} {remove / size * 1e6:>10.2f} {allocated / size:>12.1f}")
+
+
+def probe_length(hash_map, key: str) -> int:
+    """
+    This function returns the number of buckets an open addressing HashMap probes to look up key, following its probing strategy.
+    """
+    hashed_key = hash_map.hash_function(key)
+    capacity = hash_map.capacity
+    initial_index = hashed_key % capacity
+    index, length = initial_index, 1
+    bucket = hash_map.buckets.get_at_index(index)
+    while bucket is not None and not (bucket.hash == hashed_key and bucket.key == key):
+        # Robin Hood lookups stop at the first entry that is closer to its initial index.
+        if hash_map.probing.robin_hood and (index - bucket.hash) % capacity < length - 1:
+            break
+        index = hash_map.probing.probe(initial_index, length, hashed_key, capacity)
+        bucket = hash_map.buckets.get_at_index(index)
+        length += 1
+    return length
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    This function returns the value at the given fraction (0 to 1) of the sorted values.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def benchmark_probing(size: int = 100000, hash_function=hash) -> None:
+    """
+    This function loads size keys into an open addressing HashMap with each probing strategy and prints the probe length distribution of hits and misses along with put/get throughput.  Pass a poor hash function such as hash_function_2 (with a small size) to see how the strategies cope with clustering.
+    """
+    strategies = (probing.LinearProbing(), probing.QuadraticProbing(), probing.TriangularProbing(), probing.DoubleHashing(), probing.RobinHoodProbing())
+    print("\nProbing strategies")
+    print("------------------")
+    print(f"{'strategy':>18} {'capacity':>9} {'hit mean':>9} {'hit p99':>8} {'hit max':>8} {'miss mean':>10} {'miss p99':>9} {'miss max':>9} {'put us':>7} {'get us':>7}")
+    keys = make_keys(size)
+    sample = keys[::max(1, size // 10000)]
+    misses = make_keys(len(sample), 'miss')
+    for strategy in strategies:
+        m = hash_map_open_addressing.HashMap(50, hash_function, probing=strategy)
+        put = time_call(bulk_load, m, keys)
+        get = time_call(lookup_all, m, keys)
+        hits = [probe_length(m, key) for key in sample]
+        missed = [probe_length(m, key) for key in misses]
+        print(f"{str(strategy):>18} {m.capacity:>9} {sum(hits) / len(hits):>9.2f} {percentile(hits, 0.99):>8} {max(hits):>8} "
+              f"{sum(missed) / len(missed):>10.2f} {percentile(missed, 0.99):>9} {max(missed):>9} {put / size * 1e6:>7.2f} {get / size * 1e6:>7.2f}")
+
+
+def benchmark_tombstone_churn(size: int = 10000, operations: int = 200000, checkpoints: int = 8) -> None:
+    """
+    This function keeps size live keys in an open addressing HashMap while repeatedly removing a random key and inserting a new one.  It prints the tombstone count and the mean/max probe length of lookup misses, which stay bounded thanks to tombstone reuse and compaction.
+    """
+    print("\nDelete churn (open addressing)")
+    print("------------------------------")
+    print(f"{'operations':>10} {'capacity':>9} {'tombstones':>10} {'miss mean':>10} {'miss max':>9} {'us/op':>7}")
+    rng = random.Random(1)
+    m = hash_map_open_addressing.HashMap(50, hash)
+    live = make_keys(size)
+    bulk_load(m, live)
+    misses = make_keys(1000, 'miss')
+    next_key = size
+    start = time.perf_counter()
+    for operation in range(1, operations + 1):
+        index = rng.randrange(size)
+        m.remove(live[index])
+        live[index] = 'key' + str(next_key)
+        m.put(live[index], next_key)
+        next_key += 1
+        if operation % (operations // checkpoints) == 0:
+            elapsed = time.perf_counter() - start
+            lengths = [probe_length(m, key) for key in misses]
+            print(f"{operation:>10} {m.capacity:>9} {m.tombstones:>10} {sum(lengths) / len(lengths):>10.2f} {max(lengths):>9} {elapsed / (operations // checkpoints) * 1e6:>7.2f}")
+            start = time.perf_counter()
+    assert m.size == size
+
+
+def benchmark_batch(sizes=(10000, 100000, 1000000)) -> None:
+    """
+    This function compares put_many()/get_many()/remove_many() with loops over put()/get()/remove() on both hash maps, starting from a small table so the single-key loop has to grow it.  The chaining map is given a resize policy so that it grows too.
+    """
+    print("\nBatch operations vs single-key loops")
+    print("------------------------------------")
+    print(f"{'map':>16} {'keys':>9} {'op':>7} {'loop us':>8} {'batch us':>9} {'speedup':>8}")
+    makers = (
+        ('chaining', lambda: hash_map_chaining.HashMap(50, hash, max_load_factor=1.0)),
+        ('open_addressing', lambda: hash_map_open_addressing.HashMap(50, hash)),
+    )
+    for size in sizes:
+        keys = make_keys(size)
+        pairs = [(key, i) for i, key in enumerate(keys)]
+        for name, make in makers:
+            loop, batch = make(), make()
+            results = (
+                ('put', time_call(bulk_load, loop, keys), time_call(batch.put_many, pairs)),
+                ('get', time_call(lookup_all, loop, keys), time_call(batch.get_many, keys)),
+                ('remove', time_call(remove_all, loop, keys), time_call(batch.remove_many, keys)),
+            )
+            for op, looped, batched in results:
+                print(f"{name:>16} {size:>9} {op:>7} {looped / size * 1e6:>8.2f} {batched / size * 1e6:>9.2f} {looped / batched:>7.1f}x")
+
+
+def benchmark_vectorized_hashing(size: int = 1000000) -> None:
+    """
+    This function compares hash_functions.hash_batch() with hashing one key at a time for the hash functions that have a NumPy version, and checks that both give the same hashes and bucket indices.
+    """
+    print("\nBatch hashing (NumPy " + ("available" if hash_functions.np is not None else "not installed") + ")")
+    print("--------------------------------------")
+    print(f"{'function':>16} {'keys':>9} {'scalar ns':>10} {'batch ns':>9} {'speedup':>8}")
+    keys = make_keys(size)
+    capacity = 2 * size + 1
+    for function in (hash_functions.hash_function_1, hash_functions.hash_function_2, hash_functions.fnv1a_hash):
+        start = time.perf_counter()
+        hashes = [function(key) for key in keys]
+        indices = [hashed % capacity for hashed in hashes]
+        scalar = time.perf_counter() - start
+        start = time.perf_counter()
+        result = hash_functions.hash_batch(keys, function, capacity)
+        batch = time.perf_counter() - start
+        assert result == (hashes, indices)
+        print(f"{function.__name__:>16} {size:>9} {scalar / size * 1e9:>10.0f} {batch / size * 1e9:>9.0f} {scalar / batch:>7.1f}x")
+
+
+def benchmark_from_items(sizes=(100000, 1000000)) -> None:
+    """
+    This function compares building both hash maps with from_items() against creating a small map and calling put() for every item, and counts the resizes each needs.  Pass sizes=(5000000,) to check a 5M-entry build.
+    """
+    print("\nfrom_items() vs put() loop")
+    print("--------------------------")
+    print(f"{'map':>16} {'items':>9} {'loop s':>8} {'resizes':>8} {'from_items s':>13} {'resizes':>8}")
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        class CountingHashMap(module.HashMap):
+            """
+            HashMap that counts the calls to resize_table().
+            """
+            resizes = 0
+
+            def resize_table(self, new_capacity: int) -> None:
+                CountingHashMap.resizes += 1
+                super().resize_table(new_capacity)
+
+        options = {'max_load_factor': 1.0} if module is hash_map_chaining else {}
+        for size in sizes:
+            items = {key: i for i, key in enumerate(make_keys(size))}
+            CountingHashMap.resizes = 0
+            m = CountingHashMap(50, hash, **options)
+            loop = time_call(bulk_load, m, list(items))
+            loop_resizes = CountingHashMap.resizes
+            CountingHashMap.resizes = 0
+            start = time.perf_counter()
+            m = CountingHashMap.from_items(items, hash, **options)
+            built = time.perf_counter() - start
+            assert m.size == size
+            print(f"{module.__name__[9:]:>16} {size:>9} {loop:>8.2f} {loop_resizes:>8} {built:>13.2f} {CountingHashMap.resizes:>8}")
+
+
+def benchmark_bulk_load(sizes=(1000, 10000, 100000)) -> None:
+    """
+    This function bulk loads the open addressing hash map with increasing numbers of keys and prints the cost per put().  With O(1) size tracking the cost per put() stays flat as the number of keys grows, i.e. bulk loading scales linearly.
+    """
+    print("\nOpen addressing bulk load")
+    print("-------------------------")
+    print(f"{'keys':>10} {'seconds':>10} {'us/put':>10}")
+    for size in sizes:
+        keys = make_keys(size)
+        # Python's built-in hash() is used so that the timing is not dominated by the collisions of the sample hash functions.
+        m = hash_map_open_addressing.HashMap(50, hash)
+        elapsed = time_call(bulk_load, m, keys)
+        # The full-table scan is only run once here to verify the incrementally tracked counters.
+        assert m.calculate_size() and m.size == size
+        print(f"{size:>10} {elapsed:>10.3f} {elapsed / size * 1e6:>10.2f}")
+
+
+def put_latencies(hash_map, keys: list) -> list:
+    """
+    This function puts every key into the hash map and returns the latency of each put() in microseconds.
+    """
+    latencies = []
+    clock = time.perf_counter
+    for key in keys:
+        start = clock()
+        hash_map.put(key, key)
+        latencies.append((clock() - start) * 1e6)
+    return latencies
+
+
+def benchmark_incremental_resize(size: int = 1000000, steps=(16, 64, 256)) -> None:
+    """
+    This function grows an open addressing HashMap from a small capacity to size keys and prints the put() latency distribution with the default stop-the-world resize and with incremental resizing at several numbers of buckets moved per operation.  The total time shows the cost of checking both tables during a migration.
+    """
+    keys = make_keys(size)
+    print("\nIncremental resize put() latency (" + str(size) + " keys, microseconds)")
+    print("--------------------------------------------------------------")
+    print(f"{'mode':>16} {'p50':>8} {'p99':>8} {'p99.99':>10} {'max':>12} {'total s':>9}")
+    for step in (0,) + tuple(steps):
+        m = hash_map_open_addressing.HashMap(50, hash, incremental_resize=step)
+        # The cyclic garbage collector pauses for a full pass over the million entries now and then, in either mode, which would hide the resize pauses.
+        gc.disable()
+        try:
+            latencies = put_latencies(m, keys)
+        finally:
+            gc.enable()
+        assert m.size == size
+        mode = 'stop-the-world' if step == 0 else 'incremental ' + str(step)
+        print(f"{mode:>16} {percentile(latencies, 0.5):>8.2f} {percentile(latencies, 0.99):>8.2f} "
+              f"{percentile(latencies, 0.9999):>10.2f} {max(latencies):>12.0f} {sum(latencies) / 1e6:>9.2f}")
+
+
+class GlobalLockHashMap:
+    """
+    Chaining HashMap behind a single lock, the way it has to be shared between threads without ConcurrentHashMap.
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        self.map = hash_map_chaining.HashMap(capacity, function, max_load_factor=1.0)
+        self.lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        with self.lock:
+            return self.map.get(key)
+
+    def put(self, key: str, value: object) -> None:
+        with self.lock:
+            self.map.put(key, value)
+
+    def remove(self, key: str) -> None:
+        with self.lock:
+            self.map.remove(key)
+
+
+def mixed_operations(hash_map, keys: list, operations: int, seed: int) -> None:
+    """
+    This function runs a read-heavy mix of get() (80%), put() (15%) and remove() (5%) on random keys.
+    """
+    rng = random.Random(seed)
+    choices = [rng.random() for _ in range(operations)]
+    picks = [keys[rng.randrange(len(keys))] for _ in range(operations)]
+    for choice, key in zip(choices, picks):
+        if choice < 0.8:
+            hash_map.get(key)
+        elif choice < 0.95:
+            hash_map.put(key, choice)
+        else:
+            hash_map.remove(key)
+
+
+def benchmark_concurrent(size: int = 100000, operations: int = 200000, thread_counts=(1, 2, 4, 8)) -> None:
+    """
+    This function runs the same total number of mixed operations spread over an increasing number of threads, on a chaining HashMap behind one global lock and on a ConcurrentHashMap, and prints the throughput.  With the GIL the threads cannot run Python code in parallel, so striping only pays off on a free-threaded build; the GIL column shows which build ran the benchmark.
+    """
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    keys = make_keys(size)
+    print("\nConcurrent throughput (GIL " + ("enabled" if gil else "disabled") + ", ops per second)")
+    print("-------------------------------------------------")
+    print(f"{'threads':>8} {'global lock':>12} {'striped':>12} {'speedup':>8}")
+    for thread_count in thread_counts:
+        results = []
+        for make in (lambda: GlobalLockHashMap(size, hash), lambda: hash_map_concurrent.ConcurrentHashMap(size, hash, stripes=64)):
+            m = make()
+            for i, key in enumerate(keys):
+                m.put(key, i)
+            per_thread = operations // thread_count
+            threads = [threading.Thread(target=mixed_operations, args=(m, keys, per_thread, seed)) for seed in range(thread_count)]
+            start = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            results.append(per_thread * thread_count / (time.perf_counter() - start))
+        print(f"{thread_count:>8} {results[0]:>12.0f} {results[1]:>12.0f} {results[1] / results[0]:>7.2f}x")
+
+
+def shared_reader(hash_map, keys: list, lookups: int, seed: int, start, results) -> None:
+    """
+    Reader process of benchmark_shared(): looks up random keys of a SharedHashMap once start is set and reports how many were found.
+    """
+    rng = random.Random(seed)
+    picks = [keys[rng.randrange(len(keys))] for _ in range(lookups)]
+    results.put(None)
+    # Wait for every reader to be ready, so the lookups overlap.
+    start.wait()
+    found = sum(1 for key in picks if hash_map.get(key) is not None)
+    hash_map.close()
+    results.put(found)
+
+
+def benchmark_shared(size: int = 10000000, lookups: int = 200000, reader_counts=(1, 2, 4)) -> None:
+    """
+    This function builds a SharedHashMap with size keys and prints the lookup throughput of 1, 2 and 4 reader processes that attach to it by name.  Every reader does the given number of lookups.  The 10M-key default needs about 1.5 GB of shared memory.
+    """
+    keys = make_keys(size)
+    m = hash_map_shared.SharedHashMap(size, 40 * size)
+    build = time_call(m.put_many, [(key, i) for i, key in enumerate(keys)])
+    print("\nShared memory readers (" + str(size) + " keys, built in " + format(build, '.1f') + " s, " + str(os.cpu_count()) + " CPUs)")
+    print("-----------------------------------------------------------")
+    print(f"{'readers':>8} {'lookups/s':>12} {'per reader':>12}")
+    try:
+        for reader_count in reader_counts:
+            start_event, results = multiprocessing.Event(), multiprocessing.Queue()
+            readers = [multiprocessing.Process(target=shared_reader, args=(m, keys, lookups, seed, start_event, results)) for seed in range(reader_count)]
+            for reader in readers:
+                reader.start()
+            for _ in readers:
+                results.get()
+            start = time.perf_counter()
+            start_event.set()
+            found = sum(results.get() for _ in readers)
+            elapsed = time.perf_counter() - start
+            for reader in readers:
+                reader.join()
+            assert found == lookups * reader_count
+            total = lookups * reader_count / elapsed
+            print(f"{reader_count:>8} {total:>12.0f} {total / reader_count:>12.0f}")
+    finally:
+        m.close()
+        m.unlink()
+
+
+async def measure_stall(work) -> tuple:
+    """
+    This coroutine runs the awaitable work next to a ticker task that wakes up as often as the event loop lets it, and returns (seconds taken by work, longest gap between two ticks in seconds).
+    """
+    gaps = []
+    done = False
+
+    async def ticker() -> None:
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    tick = asyncio.ensure_future(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await work
+    elapsed = time.perf_counter() - start
+    done = True
+    await tick
+    return elapsed, max(gaps)
+
+
+def benchmark_async_resize(size: int = 1000000, step: int = 1000) -> None:
+    """
+    This function doubles the capacity of a hash map with size entries inside a running event loop, once by calling resize_table() of the map directly and once through AsyncHashMap.resize_table(), and prints the resize time and the longest event loop stall.
+    """
+    keys = make_keys(size)
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    print("\nEvent loop stall during a resize (" + str(size) + " entries)")
+    print("--------------------------------------------------")
+    print(f"{'map':>16} {'mode':>6} {'resize s':>9} {'max stall ms':>13}")
+    makers = (
+        ('chaining', lambda: hash_map_chaining.HashMap(size, hash)),
+        ('open_addressing', lambda: hash_map_open_addressing.HashMap(2 * size + 1, hash)),
+    )
+
+    async def blocking(hash_map) -> None:
+        hash_map.resize_table(hash_map.capacity * 2)
+
+    for name, make in makers:
+        for mode in ('sync', 'async'):
+            m = make()
+            m.put_many(pairs)
+            # The wrapper is kept alive here, otherwise the resized map would be freed, all at once, as soon as the coroutine finished.
+            wrapper = hash_map_async.AsyncHashMap(m, step)
+            if mode == 'sync':
+                work = blocking(m)
+            else:
+                work = wrapper.resize_table(m.capacity * 2)
+            # Same as benchmark_incremental_resize(): full collections of the cyclic garbage collector stall the loop in either mode.
+            gc.disable()
+            try:
+                elapsed, stall = asyncio.run(measure_stall(work))
+            finally:
+                gc.enable()
+            print(f"{name:>16} {mode:>6} {elapsed:>9.2f} {stall * 1000:>13.2f}")
+
+
+def benchmark_mmap(size: int = 1000000, lookups: int = 200000) -> None:
+    """
+    This function compares starting up with a table of size keys by calling put() for every key with opening a table file written by hash_map_mmap.write_table(), and prints the lookup throughput of both.  fnv1a_hash() is used for both since the file needs a hash function that is stable across processes.
+    """
+    keys = make_keys(size)
+    pairs = [(key, i) for i, key in enumerate(keys)]
+    picks = random.Random(7).choices(keys, k=lookups)
+    path = os.path.join(tempfile.mkdtemp(), 'table.bin')
+
+    print("\nMemory-mapped table file (" + str(size) + " keys)")
+    print("-------------------------------------------")
+    m = hash_map_open_addressing.HashMap(50, hash_functions.fnv1a_hash)
+    load = time_call(bulk_load, m, keys)
+    get_map = time_call(lookup_all, m, picks)
+
+    write = time_call(hash_map_mmap.write_table, path, pairs)
+    start = time.perf_counter()
+    table = hash_map_mmap.MmapHashMap(path)
+    opened = time.perf_counter() - start
+    get_table = time_call(lookup_all, table, picks)
+    assert table.get_many(picks[:1000]) == m.get_many(picks[:1000])
+    table.close()
+    megabytes = os.path.getsize(path) / 2 ** 20
+    os.remove(path)
+
+    print(f"{'put() every key':>24} {load:>10.3f} s")
+    print(f"{'write_table()':>24} {write:>10.3f} s ({megabytes:.0f} MB)")
+    print(f"{'open MmapHashMap':>24} {opened * 1000:>10.3f} ms")
+    print(f"{'HashMap.get()':>24} {get_map / lookups * 1e6:>10.2f} us")
+    print(f"{'MmapHashMap.get()':>24} {get_table / lookups * 1e6:>10.2f} us")
+
+
+def benchmark_snapshot(size: int = 1000000) -> None:
+    """
+    This function saves and restores a hash map with size entries with dump()/load(), with and without stored hashes, and with pickle, and prints the times and sizes.  fnv1a_hash() is used since stored hashes are not reused for hash(), whose values change between processes.
+    """
+    print("\nSnapshot vs pickle (" + str(size) + " entries)")
+    print("---------------------------------------")
+    print(f"{'map':>16} {'format':>18} {'save s':>8} {'restore s':>10} {'MB':>7}")
+    pairs = [(key, i) for i, key in enumerate(make_keys(size))]
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        m = module.HashMap.from_items(pairs, hash_functions.fnv1a_hash)
+        name = module.__name__[9:]
+        for keep_hashes in (False, True):
+            file = io.BytesIO()
+            save = time_call(m.dump, file, keep_hashes)
+            file.seek(0)
+            restore = time_call(module.HashMap.load, file)
+            label = 'dump/load + hashes' if keep_hashes else 'dump/load'
+            print(f"{name:>16} {label:>18} {save:>8.2f} {restore:>10.2f} {len(file.getvalue()) / 2 ** 20:>7.1f}")
+
+        start = time.perf_counter()
+        data = pickle.dumps(m, pickle.HIGHEST_PROTOCOL)
+        save = time.perf_counter() - start
+        restore = time_call(pickle.loads, data)
+        print(f"{name:>16} {'pickle':>18} {save:>8.2f} {restore:>10.2f} {len(data) / 2 ** 20:>7.1f}")
+
+
+def durable_writes(hash_map, keys: list, threads: int) -> None:
+    """
+    This function puts the keys into a DurableHashMap, split between the given number of threads.
+    """
+    def put_all(part: list) -> None:
+        for key in part:
+            hash_map.put(key, 1)
+
+    workers = [threading.Thread(target=put_all, args=(keys[i::threads],)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+
+def benchmark_wal(writes: int = 20000, thread_counts=(1, 8)) -> None:
+    """
+    This function measures the sustained write throughput of a DurableHashMap under each fsync policy, compared to the chaining HashMap without a log.  Compaction is turned off so that only logging is measured.
+    """
+    print("\nWrite-ahead log throughput (" + str(writes) + " puts)")
+    print("--------------------------------------------")
+    print(f"{'fsync':>10} {'threads':>8} {'puts/s':>10} {'log MB':>8}")
+    keys = make_keys(writes)
+    seconds = time_call(durable_writes, hash_map_chaining.HashMap(writes, hash), keys, 1)
+    print(f"{'no log':>10} {1:>8} {writes / seconds:>10.0f} {0:>8.1f}")
+    for policy in hash_map_wal.FSYNC_POLICIES:
+        for threads in thread_counts:
+            directory = tempfile.mkdtemp()
+            m = hash_map_wal.DurableHashMap(directory, hash_map_chaining.HashMap(writes, hash), fsync=policy, compact_bytes=2 ** 62)
+            # The time includes close(), which makes the last writes durable.
+            start = time.perf_counter()
+            durable_writes(m, keys, threads)
+            m.close()
+            seconds = time.perf_counter() - start
+            log_bytes = os.path.getsize(m.path('wal', m.generation))
+            print(f"{policy:>10} {threads:>8} {writes / seconds:>10.0f} {log_bytes / 2 ** 20:>8.1f}")
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+
+def benchmark_stats(size: int = 200000) -> None:
+    """
+    This function measures the cost of the statistics of stats.py: put() and get() of size keys with statistics off and on, best of three runs, and the mean probe or chain length they report.
+    """
+    print("\nStatistics overhead (" + str(size) + " keys)")
+    print("--------------------------------------")
+    print(f"{'map':>16} {'stats':>6} {'put s':>7} {'get s':>7} {'mean hit':>9}")
+    keys = make_keys(size)
+    for module in (hash_map_chaining, hash_map_open_addressing):
+        name = module.__name__[9:]
+        for enabled in (False, True):
+            put_times, get_times = [], []
+            for _ in range(3):
+                m = module.HashMap(size, hash)
+                if enabled:
+                    m.enable_stats()
+                put_times.append(time_call(bulk_load, m, keys))
+                get_times.append(time_call(lookup_all, m, keys))
+            mean_hit = f"{m.stats.report()['hits']['mean']:.2f}" if enabled else '-'
+            print(f"{name:>16} {'on' if enabled else 'off':>6} {min(put_times):>7.3f} {min(get_times):>7.3f} {mean_hit:>9}")
+
+
+class OrderedDictLRU:
+    """
+    LRU cache on collections.OrderedDict with a maximum number of entries, only kept here for comparison with hash_map_lru.LRUCache.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        """
+        Init a new empty cache.
+        """
+        self.data = collections.OrderedDict()
+        self.max_entries = max_entries
+
+    def get(self, key: str) -> object:
+        """
+        Returns the value of the key, which becomes the most recently used, or None.
+        """
+        value = self.data.get(key)
+        if value is not None:
+            self.data.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Stores the value as the most recently used entry and evicts the least recently used one if the cache is full.
+        """
+        self.data[key] = value
+        self.data.move_to_end(key)
+        if len(self.data) > self.max_entries:
+            self.data.popitem(last=False)
+
+
+def cache_lookups(cache, keys: list) -> int:
+    """
+    This function looks up every key of keys in cache and puts the missing ones into it, like a read-through cache, and returns the number of hits.
+    """
+    hits = 0
+    for key in keys:
+        if cache.get(key) is None:
+            cache.put(key, key)
+        else:
+            hits += 1
+    return hits
+
+
+def benchmark_lru(max_entries: int = 10000, lookups: int = 500000, key_space: int = 100000) -> None:
+    """
+    This function runs a read-through workload of Zipf-distributed keys on an LRUCache and on an OrderedDict based LRU cache of max_entries entries, and prints the throughput and hit rate of each, and the memory per entry of the full caches.
+    """
+    print("\nLRU cache (" + str(max_entries) + " entries, " + str(lookups) + " lookups)")
+    print("-----------------------------------------------")
+    print(f"{'cache':>16} {'lookups/s':>10} {'hit rate':>9} {'bytes/entry':>12}")
+    rng = random.Random(0)
+    names = make_keys(key_space)
+    weights = [1 / (rank + 1) for rank in range(key_space)]
+    keys = rng.choices(names, weights=weights, k=lookups)
+
+    for name, make in (('LRUCache', lambda: hash_map_lru.LRUCache(max_entries, hash, max_entries=max_entries)), ('OrderedDict', lambda: OrderedDictLRU(max_entries))):
+        cache = make()
+        start = time.perf_counter()
+        hits = cache_lookups(cache, keys)
+        seconds = time.perf_counter() - start
+
+        tracemalloc.start()
+        cache = make()
+        cache_lookups(cache, names[:max_entries])
+        allocated = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(f"{name:>16} {lookups / seconds:>10.0f} {hits / lookups:>9.2%} {allocated / max_entries:>12.1f}")
+
+
+class TickClock:
+    """
+    Clock for hash_map_ttl.TTLHashMap that only moves when now is set, so expiry does not depend on how fast the benchmark runs.
+    """
+
+    def __init__(self) -> None:
+        self.now = 0
+
+    def __call__(self) -> int:
+        return self.now
+
+
+def ttl_churn(sweep_step: int, incremental: int, live: int, puts: int, checkpoints: int, trace: bool) -> list:
+    """
+    This function puts puts new keys into a TTLHashMap, one per clock tick, each living for live ticks, and returns one row per checkpoint: puts so far, size, capacity, and either the allocated MB (if trace is True) or the put() latencies in microseconds since the previous checkpoint.
+    """
+    m = hash_map_ttl.TTLHashMap(64, hash, sweep_step=sweep_step, clock=TickClock(), incremental_resize=incremental)
+    keys = make_keys(puts, 'session')
+    window = puts // checkpoints
+    rows, latencies = [], []
+    if trace:
+        # Only the map is measured, so the latencies are not kept in this run.
+        tracemalloc.start()
+        for i, key in enumerate(keys, 1):
+            m.clock.now = i
+            m.put(key, i, ttl=live)
+            if i % window == 0:
+                rows.append((i, m.size, m.capacity, tracemalloc.get_traced_memory()[0] / 2 ** 20))
+        tracemalloc.stop()
+        return rows
+
+    timer = time.perf_counter
+    for i, key in enumerate(keys, 1):
+        m.clock.now = i
+        start = timer()
+        m.put(key, i, ttl=live)
+        latencies.append((timer() - start) * 1e6)
+        if i % window == 0:
+            rows.append((i, m.size, m.capacity, latencies))
+            latencies = []
+    return rows
+
+
+def benchmark_ttl(live: int = 100000, puts: int = 1000000, checkpoints: int = 5, modes=((0, 0), (4, 0), (4, 64))) -> None:
+    """
+    This function runs a constant insert/expire churn on a TTLHashMap, where about live entries are alive at any time, for each (sweep_step, incremental_resize) mode: lazy expiry only, the sweep, and the sweep with incremental resizing.  It prints the size, capacity and memory of the map at each checkpoint and the put() latency distribution since the previous one.
+    """
+    print("\nTTL churn (" + str(live) + " live entries, " + str(puts) + " puts, microseconds)")
+    print("---------------------------------------------------------")
+    print(f"{'mode':>16} {'puts':>9} {'size':>8} {'capacity':>9} {'MB':>7} {'p50':>7} {'p99':>7} {'p99.99':>8} {'max':>9}")
+    for step, incremental in modes:
+        # Memory is measured in a separate run since tracing slows down every allocation.
+        memory = ttl_churn(step, incremental, live, puts, checkpoints, True)
+        # As in benchmark_incremental_resize(), the cyclic garbage collector would add pauses of its own.
+        gc.disable()
+        try:
+            rows = ttl_churn(step, incremental, live, puts, checkpoints, False)
+        finally:
+            gc.enable()
+        mode = 'lazy' if step == 0 else 'sweep ' + str(step)
+        if incremental:
+            mode += ' inc ' + str(incremental)
+        for (count, size, capacity, allocated), (_, _, _, latencies) in zip(memory, rows):
+            print(f"{mode:>16} {count:>9} {size:>8} {capacity:>9} {allocated:>7.1f} {percentile(latencies, 0.5):>7.2f} "
+                  f"{percentile(latencies, 0.99):>7.2f} {percentile(latencies, 0.9999):>8.2f} {max(latencies):>9.0f}")
+
+
+def lookup_calls(function, arguments: list) -> None:
+    """
+    This function calls function with each argument of arguments.
+    """
+    for argument in arguments:
+        function(argument)
+
+
+def memo_arguments(workload: str, calls: int, distinct: int, seed: int = 7) -> list:
+    """
+    This function returns the arguments of calls calls to a memoized function: 'zipf' draws from distinct arguments with Zipf-distributed popularity (s = 1), 'loop' cycles through all of them in order.
+    """
+    if workload == 'loop':
+        return [i % distinct for i in range(calls)]
+    rng = random.Random(seed)
+    weights = [1 / rank for rank in range(1, distinct + 1)]
+    return rng.choices(range(distinct), weights=weights, k=calls)
+
+
+def benchmark_memoize(calls: int = 200000, distinct: int = 20000, max_entries: int = 2000) -> None:
+    """
+    This function calls a memoized function with the arguments of each workload and prints the hit rate and the time per call of memoize with each policy and backing HashMap, and of functools.lru_cache for comparison.  The zipf workload draws from distinct arguments, the loop workload cycles through a quarter more arguments than fit in the cache.  The function itself only adds 1, so the time is almost all cache overhead.
+    """
+    print("\nmemoize (" + str(calls) + " calls, " + str(max_entries) + " entries, microseconds)")
+    print("---------------------------------------------------")
+    print(f"{'workload':>9} {'cache':>9} {'backing':>16} {'hit rate':>9} {'us/call':>8}")
+    for workload, count in (('zipf', distinct), ('loop', max_entries * 5 // 4)):
+        arguments = memo_arguments(workload, calls, count)
+        caches = [('lru_cache', '-', functools.lru_cache(maxsize=max_entries)(lambda x: x + 1))]
+        for policy in memoize.POLICIES:
+            for backing in memoize.BACKINGS:
+                caches.append((policy, backing, memoize.memoize(max_entries=max_entries, policy=policy, backing=backing, seed=1)(lambda x: x + 1)))
+
+        for policy, backing, function in caches:
+            elapsed = time_call(lookup_calls, function, arguments)
+            if policy == 'lru_cache':
+                info = function.cache_info()
+                hit_rate = info.hits / (info.hits + info.misses)
+            else:
+                hit_rate = function.cache.hit_rate()
+            print(f"{workload:>9} {policy:>9} {backing:>16} {hit_rate:>9.1%} {elapsed / calls * 1e6:>8.2f}")
+
+
+if __name__ == "__main__":
+
+    benchmark_bulk_load()
+    benchmark_chaining_probes()
+    benchmark_hash_functions()
+    benchmark_resize()
+    benchmark_hash_cache()
+    benchmark_memory()
+    benchmark_flat_storage()
+    benchmark_tombstone_churn()
+    benchmark_probing()
+    benchmark_probing(2000, hash_map_open_addressing.hash_function_2)
+    benchmark_batch()
+    benchmark_vectorized_hashing()
+    benchmark_from_items()
+    benchmark_incremental_resize()
+    benchmark_concurrent()
+    # Pass 10000000 for the full-size run, which needs about 1.5 GB of shared memory.
+    benchmark_shared(1000000)
+    benchmark_async_resize()
+    benchmark_mmap()
+    benchmark_snapshot()
+    benchmark_wal()
+    benchmark_stats()
+    benchmark_lru()
+    benchmark_ttl()
+    benchmark_memoize()
@@ -0,0 +1,381 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Reproducible benchmark suite for hash_map_chaining.py and hash_map_open_addressing.py, with Python's dict as a baseline.  Every combination of map, size, key distribution and operation mix is run on a freshly loaded map, and the throughput, p50/p99 latency and peak memory are written to a JSON file.  "python benchmark_suite.py --compare old.json new.json" compares two such files, for example from two commits.
+#
+# The hash maps use Python's hash(), which is randomized per process.  Set PYTHONHASHSEED to get the same bucket layout in every run, for example "PYTHONHASHSEED=0 python benchmark_suite.py".
+
+import argparse
+import gc
+import itertools
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import zlib
+
+import hash_map_chaining
+import hash_map_open_addressing
+
+# Operation codes of a workload.
+GET = 0
+PUT = 1
+REMOVE = 2
+
+SIZES = (1000, 10000, 100000, 1000000, 10000000)
+DISTRIBUTIONS = ('uniform', 'zipf')
+WORKLOADS = ('read_heavy', 'write_heavy', 'churn')
+MAPS = ('chaining', 'open_addressing', 'dict')
+
+# Exponent of the Zipf distribution.  With 0.99 about a third of the operations go to the hottest 1% of a million keys.
+ZIPF_EXPONENT = 0.99
+
+
+class DictMap(dict):
+    """
+    Class giving Python's dict the get(), put() and remove() methods of the hash maps, so the same workload code runs on all three.  Each operation is a method call, just like on the hash maps.
+    """
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and stores them.
+        """
+        self[key] = value
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes it.  Keys that are not stored are ignored.
+        """
+        self.pop(key, None)
+
+
+def new_map(name: str):
+    """
+    This function returns an empty map of the given name.  All of them start small and grow as keys are added: the chaining map with a maximum load factor of 1 and the open addressing map with its fixed maximum of 0.5.
+    """
+    if name == 'chaining':
+        return hash_map_chaining.HashMap(16, hash, max_load_factor=1.0)
+    if name == 'open_addressing':
+        return hash_map_open_addressing.HashMap(16, hash)
+    if name == 'dict':
+        return DictMap()
+    raise ValueError("unknown map " + name)
+
+
+def load(target, keys: list) -> None:
+    """
+    This function puts every key into the map, with the key itself as the value so that no value objects are allocated.
+    """
+    if isinstance(target, DictMap):
+        target.update(zip(keys, keys))
+    else:
+        target.put_many(zip(keys, keys))
+
+
+class RankSampler:
+    """
+    Class drawing ranks 0 to size - 1 from the uniform or the Zipf distribution, where rank 0 is the hottest.
+    """
+
+    def __init__(self, distribution: str, size: int, rng: random.Random) -> None:
+        """
+        Init a new RankSampler.  For the Zipf distribution the cumulative weights of all ranks are computed once.
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError("unknown distribution " + distribution)
+        self.size = size
+        self.rng = rng
+        self.cumulative = None
+        if distribution == 'zipf':
+            self.cumulative = list(itertools.accumulate(1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(size)))
+
+    def sample(self, count: int) -> list:
+        """
+        This method returns a list of count ranks.
+        """
+        if self.cumulative is None:
+            randrange = self.rng.randrange
+            return [randrange(self.size) for _ in range(count)]
+        return self.rng.choices(range(self.size), cum_weights=self.cumulative, k=count)
+
+
+def make_operations(workload: str, keys: list, sampler: RankSampler, count: int, rng: random.Random) -> list:
+    """
+    This function returns a list of count (operation, key) pairs for a map preloaded with keys.  The mixes are:
+
+    read_heavy   90% get of a stored key, 5% get of a missing key, 5% put that replaces a stored key's value.
+    write_heavy  20% get of a stored key, 40% put that replaces a value, 40% put of a new key.
+    churn        20% get, 40% put of a new key, 40% remove of the oldest key, so the size stays the same.  Gets favor the newest keys.
+
+    Keys are picked by rank from sampler.  The new keys of write_heavy and churn are all distinct.
+    """
+    ranks = sampler.sample(count)
+    choices = [rng.random() for _ in range(count)]
+    fresh = ('new' + str(i) for i in itertools.count())
+    size = len(keys)
+    operations = []
+
+    if workload == 'read_heavy':
+        for rank, choice in zip(ranks, choices):
+            if choice < 0.9:
+                operations.append((GET, keys[rank]))
+            elif choice < 0.95:
+                operations.append((GET, 'missing' + str(rank)))
+            else:
+                operations.append((PUT, keys[rank]))
+
+    elif workload == 'write_heavy':
+        for rank, choice in zip(ranks, choices):
+            if choice < 0.2:
+                operations.append((GET, keys[rank]))
+            elif choice < 0.6:
+                operations.append((PUT, keys[rank]))
+            else:
+                operations.append((PUT, next(fresh)))
+
+    elif workload == 'churn':
+        # The stored keys are live[oldest:], which slides forward as keys are removed and added.
+        live = list(keys)
+        oldest = 0
+        for rank, choice in zip(ranks, choices):
+            if choice < 0.2:
+                operations.append((GET, live[len(live) - 1 - rank]))
+            elif choice < 0.6:
+                key = next(fresh)
+                live.append(key)
+                operations.append((PUT, key))
+                if len(live) - oldest > size:
+                    operations.append((REMOVE, live[oldest]))
+                    oldest += 1
+            else:
+                operations.append((REMOVE, live[oldest]))
+                oldest += 1
+                key = next(fresh)
+                live.append(key)
+                operations.append((PUT, key))
+        # Each churn choice above may add two operations.
+        operations = operations[:count]
+
+    else:
+        raise ValueError("unknown workload " + workload)
+
+    return operations
+
+
+def run_operations(target, operations: list) -> None:
+    """
+    This function applies the operations to the map.
+    """
+    get, put, remove = target.get, target.put, target.remove
+    for operation, key in operations:
+        if operation == GET:
+            get(key)
+        elif operation == PUT:
+            put(key, key)
+        else:
+            remove(key)
+
+
+def operation_latencies(target, operations: list) -> list:
+    """
+    This function applies the operations to the map one at a time and returns the latency of each in nanoseconds.
+    """
+    get, put, remove = target.get, target.put, target.remove
+    clock = time.perf_counter_ns
+    latencies = []
+    for operation, key in operations:
+        start = clock()
+        if operation == GET:
+            get(key)
+        elif operation == PUT:
+            put(key, key)
+        else:
+            remove(key)
+        latencies.append(clock() - start)
+    return latencies
+
+
+def percentile(values: list, fraction: float) -> float:
+    """
+    This function returns the given percentile (0 to 1) of an unsorted list of values.
+    """
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def peak_memory(name: str, keys: list) -> int:
+    """
+    This function loads the keys into a new map one put() at a time and returns the peak number of bytes allocated meanwhile, which includes the old and new tables of every resize.  The keys themselves are allocated beforehand and not counted.
+    """
+    tracemalloc.start()
+    target = new_map(name)
+    for key in keys:
+        target.put(key, key)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    del target
+    return peak
+
+
+def run_case(name: str, size: int, distribution: str, workload: str, operations: int, samples: int, seed: int, repeats: int = 3) -> dict:
+    """
+    This function runs one workload repeats times, each time on a freshly loaded map, and returns its result.  The first operations are timed as a whole for the throughput, and the following samples one at a time for the latencies.  The best throughput and the median of each latency percentile over the repeats are reported, which keeps the noise of single runs out of comparisons.
+    """
+    rng = random.Random(seed)
+    keys = ['key' + str(i) for i in range(size)]
+    rng.shuffle(keys)
+    sampler = RankSampler(distribution, size, rng)
+    stream = make_operations(workload, keys, sampler, operations + samples, rng)
+
+    throughputs, p50s, p99s = [], [], []
+    for _ in range(repeats):
+        target = new_map(name)
+        load(target, keys)
+
+        # The garbage collector is paused while timing, so its pauses, which depend on every object the process has allocated so far, do not make runs incomparable.
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            run_operations(target, stream[:operations])
+            seconds = time.perf_counter() - start
+            latencies = operation_latencies(target, stream[operations:])
+        finally:
+            gc.enable()
+
+        throughputs.append(operations / seconds)
+        p50s.append(percentile(latencies, 0.5))
+        p99s.append(percentile(latencies, 0.99))
+        del target
+
+    return {
+        'map': name,
+        'size': size,
+        'distribution': distribution,
+        'workload': workload,
+        'operations': operations,
+        'repeats': repeats,
+        'ops_per_sec': max(throughputs),
+        'p50_ns': percentile(p50s, 0.5),
+        'p99_ns': percentile(p99s, 0.5),
+    }
+
+
+def git_commit() -> str:
+    """
+    This function returns the current git commit of the repository, or None outside of a git checkout.
+    """
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def case_key(result: dict) -> tuple:
+    """
+    This function returns the size, distribution and workload of a result, which together identify the case apart from the map.
+    """
+    return result['size'], result['distribution'], result['workload']
+
+
+def run_suite(sizes=SIZES, maps=MAPS, distributions=DISTRIBUTIONS, workloads=WORKLOADS, operations: int = 200000, samples: int = 50000, seed: int = 0, repeats: int = 3, log=print) -> dict:
+    """
+    This function runs every combination of the given maps, sizes, distributions and workloads and returns the results with information about the run.  Each case gets its own seed derived from seed and the case, so a case gives every map the same operations, whatever else is run.  The peak memory is measured once per map and size.
+    """
+    results = []
+    for size in sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        for name in maps:
+            memory = peak_memory(name, keys)
+            for distribution, workload in itertools.product(distributions, workloads):
+                case_seed = zlib.crc32(f"{seed} {size} {distribution} {workload}".encode())
+                result = run_case(name, size, distribution, workload, operations, samples, case_seed, repeats)
+                result['peak_memory_bytes'] = memory
+                result['memory_bytes_per_key'] = memory / size
+                results.append(result)
+                log(f"{name:>16} {size:>9} {distribution:>8} {workload:>12} {result['ops_per_sec']:>11.0f} ops/s {result['p50_ns']:>7} {result['p99_ns']:>7} ns {memory / 2 ** 20:>9.1f} MB")
+
+    # Throughput relative to dict on the same case.  The speed of the machine cancels out, which makes runs on busy or different machines comparable.
+    baselines = {case_key(result): result['ops_per_sec'] for result in results if result['map'] == 'dict'}
+    for result in results:
+        baseline = baselines.get(case_key(result))
+        if baseline is not None:
+            result['relative_to_dict'] = result['ops_per_sec'] / baseline
+
+    return {
+        'commit': git_commit(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'hash_seed': os.environ.get('PYTHONHASHSEED'),
+        'seed': seed,
+        'operations': operations,
+        'samples': samples,
+        'repeats': repeats,
+        'zipf_exponent': ZIPF_EXPONENT,
+        'results': results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1, log=print) -> list:
+    """
+    This function compares the results of two runs case by case and returns the cases whose throughput dropped or whose p99 latency rose by more than threshold, as a list of (case, old ops/sec, new ops/sec, old p99, new p99).  Every case found in both runs is logged.  If both runs have the throughput relative to dict for a case, that is compared instead of the raw throughput, so that a slower or busier machine is not taken for a regression.
+    """
+    def case(result: dict) -> tuple:
+        return (result['map'],) + case_key(result)
+
+    old_results = {case(result): result for result in old['results']}
+    regressions = []
+    log(f"{'case':>52} {'ops/s':>8} {'p99':>8}")
+    for result in new['results']:
+        before = old_results.get(case(result))
+        if before is None:
+            continue
+        if 'relative_to_dict' in result and 'relative_to_dict' in before:
+            throughput = result['relative_to_dict'] / before['relative_to_dict']
+        else:
+            throughput = result['ops_per_sec'] / before['ops_per_sec']
+        p99 = result['p99_ns'] / before['p99_ns'] if before['p99_ns'] else 1.0
+        regressed = throughput < 1 - threshold or p99 > 1 + threshold
+        label = ' '.join(str(part) for part in case(result))
+        log(f"{label:>52} {throughput:>7.2f}x {p99:>7.2f}x" + ('  <-- regression' if regressed else ''))
+        if regressed:
+            regressions.append((case(result), before['ops_per_sec'], result['ops_per_sec'], before['p99_ns'], result['p99_ns']))
+    return regressions
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark suite for both hash maps and dict.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES))
+    parser.add_argument('--maps', nargs='+', choices=MAPS, default=list(MAPS))
+    parser.add_argument('--distributions', nargs='+', choices=DISTRIBUTIONS, default=list(DISTRIBUTIONS))
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--operations', type=int, default=200000, help="operations timed for the throughput")
+    parser.add_argument('--samples', type=int, default=50000, help="operations timed one at a time for the latencies")
+    parser.add_argument('--repeats', type=int, default=3, help="runs per case, each on a freshly loaded map")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help="compare two result files instead of running")
+    parser.add_argument('--threshold', type=float, default=0.1, help="relative change reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as file:
+            old = json.load(file)
+        with open(args.compare[1]) as file:
+            new = json.load(file)
+        regressions = compare(old, new, args.threshold)
+        print(f"\n{len(regressions)} regressions ({old['commit']} -> {new['commit']})")
+        sys.exit(1 if regressions else 0)
+
+    print(f"{'map':>16} {'size':>9} {'keys':>8} {'workload':>12} {'throughput':>17} {'p50':>7} {'p99':>7} {'peak':>12}")
+    report = run_suite(args.sizes, args.maps, args.distributions, args.workloads, args.operations, args.samples, args.seed, args.repeats)
+    with open(args.output, 'w') as file:
+        json.dump(report, file, indent=2)
+    print("\nResults written to " + args.output)
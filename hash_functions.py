@@ -0,0 +1,160 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Hash functions for the HashMap classes in hash_map_chaining.py and hash_map_open_addressing.py, and batch hashing for their bulk operations.  NumPy is optional; without it hash_batch() hashes one key at a time.
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# All hash values of the functions below, except the sample ones, are unsigned 64-bit integers.
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+FNV_OFFSET_BASIS_64 = 0xCBF29CE484222325
+FNV_PRIME_64 = 0x100000001B3
+
+
+def hash_function_1(key: str) -> int:
+    """
+    Sample Hash function.
+    """
+    hash = 0
+    for letter in key:
+        hash += ord(letter)
+    return hash
+
+def hash_function_2(key: str) -> int:
+    """
+    Another sample hash function.
+    """
+    hash, index = 0, 0
+    index = 0
+    for letter in key:
+        hash += (index + 1) * ord(letter)
+        index += 1
+    return hash
+
+
+def mix_64(value: int) -> int:
+    """
+    This function scrambles the bits of a 64-bit integer (the splitmix64 finalizer).  Plain FNV-1a leaves the low bits poorly mixed, which shows up as collisions once the hash is taken modulo the capacity, so it is applied to every FNV-1a result.  It is also used to turn a seed into an offset basis.
+    """
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK_64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK_64
+    return value ^ (value >> 31)
+
+
+def fnv1a_hash(key: str) -> int:
+    """
+    64-bit FNV-1a hash of the UTF-8 encoding of the key, followed by the mix_64() finalizer.  Unlike hash_function_1(), every byte changes the hash differently depending on its position, so anagrams like 'key12' and 'key21' do not collide.  The value does not depend on the process, so it can be used for data that is shared between processes or stored on disk.
+    """
+    hash = FNV_OFFSET_BASIS_64
+    for byte in key.encode('utf-8'):
+        hash = ((hash ^ byte) * FNV_PRIME_64) & MASK_64
+    return mix_64(hash)
+
+
+def builtin_hash(key: str) -> int:
+    """
+    Python's built-in hash() folded into an unsigned 64-bit integer.  This is by far the fastest choice since it is computed in C and cached on the string object, but string hashes are randomized per process (see PYTHONHASHSEED), so the values must not be stored or shared between processes.
+    """
+    return hash(key) & MASK_64
+
+
+def seeded_hash(seed: int):
+    """
+    This function takes a seed as parameter and returns a seeded 64-bit FNV-1a hash function.  Different seeds produce unrelated hash values, so keys that collide under one seed are unlikely to collide under another.  Like fnv1a_hash(), the values are stable across processes for a given seed.
+    """
+    basis = FNV_OFFSET_BASIS_64 ^ mix_64(seed & MASK_64)
+
+    def hash_function(key: str) -> int:
+        hash = basis
+        for byte in key.encode('utf-8'):
+            hash = ((hash ^ byte) * FNV_PRIME_64) & MASK_64
+        return mix_64(hash)
+
+    hash_function.__name__ = 'seeded_hash_' + str(seed)
+    return hash_function
+
+
+# Smaller batches are hashed one key at a time, since building the NumPy buffers costs more than it saves.
+MIN_VECTORIZED_BATCH = 64
+
+# Keys longer than this are hashed one key at a time: the position-weighted sums of hash_function_2() could overflow 64 bits and the fixed-width buffers would waste memory.
+MAX_VECTORIZED_KEY_LENGTH = 4096
+
+
+def code_point_matrix(keys: list):
+    """
+    This function returns a (number of keys, longest key) uint32 matrix holding the Unicode code points of each key, padded with zeros.
+    """
+    buffer = np.array(keys, dtype=str)
+    width = buffer.dtype.itemsize // 4
+    return buffer.view(np.uint32).reshape(len(keys), width)
+
+
+def vectorized_hash_function_1(keys: list):
+    """
+    Vectorized hash_function_1(): the sum of the code points of each key.  Padding zeros add nothing.
+    """
+    return code_point_matrix(keys).sum(axis=1, dtype=np.uint64)
+
+
+def vectorized_hash_function_2(keys: list):
+    """
+    Vectorized hash_function_2(): the sum of the code points of each key weighted by their 1-based position.  Padding zeros add nothing.
+    """
+    code_points = code_point_matrix(keys)
+    weights = np.arange(1, code_points.shape[1] + 1, dtype=np.uint64)
+    return code_points.astype(np.uint64) @ weights
+
+
+def vectorized_mix_64(values):
+    """
+    Vectorized mix_64().  uint64 arithmetic wraps around, which is the same as masking with MASK_64.
+    """
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return values ^ (values >> np.uint64(31))
+
+
+def vectorized_fnv1a_hash(keys: list):
+    """
+    Vectorized fnv1a_hash().  The UTF-8 encodings are packed into a fixed-width byte matrix and FNV-1a is applied one byte column at a time to every key that is long enough.
+    """
+    encoded = [key.encode('utf-8') for key in keys]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    width = int(lengths.max()) if len(encoded) else 0
+    hashes = np.full(len(encoded), FNV_OFFSET_BASIS_64, dtype=np.uint64)
+    if width == 0:
+        return vectorized_mix_64(hashes)
+
+    data = np.array(encoded, dtype='S' + str(width)).view(np.uint8).reshape(len(encoded), width)
+    prime = np.uint64(FNV_PRIME_64)
+    for column in range(width):
+        hashed = (hashes ^ data[:, column]) * prime
+        hashes = np.where(lengths > column, hashed, hashes)
+    return vectorized_mix_64(hashes)
+
+
+# Hash functions that have a vectorized version.
+VECTORIZED_HASHES = {
+    hash_function_1: vectorized_hash_function_1,
+    hash_function_2: vectorized_hash_function_2,
+    fnv1a_hash: vectorized_fnv1a_hash,
+}
+
+
+def hash_batch(keys: list, function, capacity: int) -> tuple:
+    """
+    This function takes a list of keys, a hash function, and a capacity, and returns two lists: the hash of every key and its bucket index (the hash modulo the capacity).  If NumPy is installed and the hash function has a vectorized version, the whole batch is hashed at once; the results are the same as calling the hash function on every key.
+    """
+    vectorized = VECTORIZED_HASHES.get(function) if np is not None else None
+    if (vectorized is not None and len(keys) >= MIN_VECTORIZED_BATCH
+            and all(type(key) is str for key in keys)
+            and max(map(len, keys)) <= MAX_VECTORIZED_KEY_LENGTH):
+        hashes = vectorized(keys)
+        return hashes.tolist(), (hashes % np.uint64(capacity)).tolist()
+
+    hashes = list(map(function, keys))
+    return hashes, [hashed % capacity for hashed in hashes]
@@ -0,0 +1,352 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: asyncio wrapper around the HashMap classes of hash_map_chaining.py and hash_map_open_addressing.py.  Bulk operations, resizing and clearing are split into steps of a bounded number of items or buckets, with the event loop running other tasks in between.
+
+import asyncio
+import copy
+
+from SLL_DA import *
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap, TOMBSTONE
+from hash_map_lru import LRUCache, LRUNode
+from hash_functions import hash_function_1, hash_function_2
+from probing import next_power_of_two
+
+class AsyncHashMap:
+    """
+    Class implementing an asyncio-friendly Hash Map around a chaining or open addressing HashMap.  get(), put(), remove(), and contains_key() are plain methods since they take O(1) time.  put_many(), get_many(), resize_table(), and clear() are coroutines that yield to the event loop every step items or buckets.
+
+    While resize_table() runs, the wrapped map is left untouched and a new map of the new capacity is filled from it.  Reads check the new map first and fall back to the wrapped map, and writes only go to the new map, with removed keys remembered so they are not read or copied from the wrapped map.  Once every bucket has been copied, the new map replaces the wrapped one.
+
+    resize_table() and clear() replace the map given to the constructor with a new one, which is then kept in self.map.  The caller's map is never modified by them; it keeps the entries it had at that point, and later writes only go to self.map.
+    """
+
+    def __init__(self, hash_map, step: int = 1000) -> None:
+        """
+        Init a new AsyncHashMap around the given hash map.  step is the number of items or buckets handled between two yields to the event loop.
+        """
+        if step < 1:
+            raise ValueError("step must be at least 1")
+
+        self.map = hash_map
+        self.step = step
+        # True once self.map is a map created by resize_table() or clear() rather than the caller's, so that it can be released when it is replaced.
+        self.owns_map = False
+        # Map being filled by resize_table(), and the keys removed since the resize started.
+        self.new_map = None
+        self.removed = set()
+        self.resize_lock = asyncio.Lock()
+
+    @property
+    def size(self) -> int:
+        """
+        Number of entries in the hash map.  During a resize the wrapped map still has entries that have not been copied yet, so the result is exact only when no resize is running.
+        """
+        return self.map.size if self.new_map is None else max(self.map.size, self.new_map.size)
+
+    @property
+    def capacity(self) -> int:
+        """
+        Capacity of the wrapped hash map.
+        """
+        return self.map.capacity
+
+    def table_load(self) -> float:
+        """
+        This method returns the load factor of the wrapped hash map.
+        """
+        return self.map.table_load()
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value, or None if the key is not in the hash map.
+        """
+        if self.new_map is None:
+            return self.map.get(key)
+
+        if self.new_map.contains_key(key):
+            return self.new_map.get(key)
+        if key in self.removed:
+            return None
+        return self.map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.
+        """
+        if self.new_map is None:
+            return self.map.contains_key(key)
+
+        if self.new_map.contains_key(key):
+            return True
+        return key not in self.removed and self.map.contains_key(key)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and updates the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.
+        """
+        if self.new_map is None:
+            self.map.put(key, value)
+            return
+
+        self.new_map.put(key, value)
+        self.removed.discard(key)
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its associated value from the hash map.  If the key is not in the hash map, the method does nothing.
+        """
+        if self.new_map is None:
+            self.map.remove(key)
+            return
+
+        self.new_map.remove(key)
+        self.removed.add(key)
+
+    async def put_many(self, pairs) -> None:
+        """
+        This coroutine takes an iterable of (key, value) pairs and puts all of them into the hash map, step pairs at a time.  Without a running resize every chunk goes through the put_many() of the wrapped map.
+        """
+        pairs = list(pairs)
+        for start in range(0, len(pairs), self.step):
+            chunk = pairs[start:start + self.step]
+            if self.new_map is None:
+                self.map.put_many(chunk)
+            else:
+                for key, value in chunk:
+                    self.put(key, value)
+            await asyncio.sleep(0)
+
+    async def get_many(self, keys) -> list:
+        """
+        This coroutine takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the hash map, looking up step keys at a time.
+        """
+        keys = list(keys)
+        values = []
+        for start in range(0, len(keys), self.step):
+            chunk = keys[start:start + self.step]
+            if self.new_map is None:
+                values.extend(self.map.get_many(chunk))
+            else:
+                values.extend(self.get(key) for key in chunk)
+            await asyncio.sleep(0)
+        return values
+
+    async def resize_table(self, new_capacity: int) -> None:
+        """
+        This coroutine takes a new capacity as parameter and changes the capacity of the wrapped hash map.  The new bucket array is allocated and filled step buckets at a time, and the old one is released the same way.  The hash map stays usable while it runs.
+        """
+        if new_capacity < 1:
+            return
+
+        async with self.resize_lock:
+            old_map = self.map
+
+            # Same final capacity as the resize_table() of the wrapped map.
+            if isinstance(old_map, OpenAddressingHashMap):
+                while old_map.size > 0 and 2 * (old_map.size - 1) >= new_capacity:
+                    new_capacity *= 2
+                if old_map.probing.power_of_two:
+                    new_capacity = next_power_of_two(new_capacity)
+
+            self.new_map = await self.empty_copy(old_map, new_capacity)
+            self.removed = set()
+
+            # Writes made while the new map was allocated went to the old map and may have started an incremental resize of it.  It is finished here so that all of its entries are in the one table copied below.  From now on writes only go to the new map, so no migration can start again, and reads of the old map cannot move the buckets being copied.
+            if getattr(old_map, 'old_buckets', None) is not None:
+                old_map.finish_migration()
+
+            # Copy the entries bucket by bucket.  Keys written or removed since the resize started are newer than the copy in the old map.
+            buckets = old_map.buckets.data
+            for start in range(0, len(buckets), self.step):
+                for key, value in bucket_items(buckets, start, start + self.step):
+                    if key not in self.removed and not self.new_map.contains_key(key):
+                        self.new_map.put(key, value)
+                await asyncio.sleep(0)
+
+            self.map, self.new_map, self.removed = self.new_map, None, set()
+            await self.replaced(old_map)
+
+    async def clear(self) -> None:
+        """
+        This coroutine clears the contents of the hash map without changing its capacity.  The empty bucket array is allocated step buckets at a time and replaces the current one in a single step, so writes made while it is being allocated are cleared as well.  The old entries are then released step buckets at a time.
+        """
+        async with self.resize_lock:
+            old_map = self.map
+            self.map = await self.empty_copy(old_map, old_map.capacity)
+            await self.replaced(old_map)
+
+    async def empty_copy(self, hash_map, capacity: int):
+        """
+        This is a helper coroutine that returns an empty hash map of the same kind and settings as the given one with the given capacity.  The buckets are appended step at a time.  Statistics are copied, and the recency list of an LRUCache starts out empty, so that the two maps share no state.
+        """
+        new_map = copy.copy(hash_map)
+        empty = LinkedList if isinstance(hash_map, ChainingHashMap) else None
+
+        buckets = DynamicArray()
+        for start in range(0, capacity, self.step):
+            if empty is None:
+                buckets.data.extend([None] * min(self.step, capacity - start))
+            else:
+                buckets.data.extend(empty() for _ in range(min(self.step, capacity - start)))
+            await asyncio.sleep(0)
+
+        new_map.buckets = buckets
+        new_map.capacity = capacity
+        new_map.size = 0
+        # Counters of the open addressing map.
+        if isinstance(hash_map, OpenAddressingHashMap):
+            new_map.tombstones = 0
+            new_map.old_buckets = None
+            new_map.old_capacity = 0
+            new_map.migrate_index = 0
+            new_map.max_probe = 0
+            new_map.old_max_probe = 0
+        if hash_map.stats is not None:
+            new_map.stats = copy.deepcopy(hash_map.stats)
+        # The entries are put into the new map again, which links them into its own recency list.
+        if isinstance(hash_map, LRUCache):
+            new_map.recent = LRUNode(None, None)
+            new_map.recent.older = new_map.recent
+            new_map.recent.newer = new_map.recent
+            new_map.bytes = 0
+        return new_map
+
+    async def replaced(self, old_map) -> None:
+        """
+        This is a helper coroutine called once self.map has replaced old_map.  A map created by resize_table() or clear() is released; the caller's map is left as it is.
+        """
+        if self.owns_map:
+            await self.release(old_map)
+        self.owns_map = True
+
+    async def release(self, hash_map) -> None:
+        """
+        This is a helper coroutine that empties the buckets of a hash map that is no longer used, step at a time, and leaves it as an empty map of capacity 0.  Dropping a large map at once would free all of its entries in one go and block the event loop just like rehashing it.
+        """
+        buckets = hash_map.buckets.data
+        for start in range(0, len(buckets), self.step):
+            buckets[start:start + self.step] = [None] * len(buckets[start:start + self.step])
+            await asyncio.sleep(0)
+        hash_map.buckets = DynamicArray()
+        hash_map.capacity = 0
+        hash_map.size = 0
+
+
+def bucket_items(buckets: list, start: int, end: int):
+    """
+    This function is a generator that yields the (key, value) pairs stored in buckets[start:end] of either kind of hash map.
+    """
+    for bucket in buckets[start:end]:
+        if bucket is None or bucket is TOMBSTONE:
+            continue
+        if isinstance(bucket, LinkedList):
+            for node in bucket:
+                yield node.key, node.value
+        else:
+            yield bucket.key, bucket.value
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    # Resize example 1
+    # ----------------------
+    # 100 50
+    # True 49
+    # 0 None True
+    # 150 600 True
+
+    async def resize_example(hash_map) -> None:
+        m = AsyncHashMap(hash_map, step=8)
+        await m.put_many(('key' + str(i), i) for i in range(100))
+        print(m.size, m.capacity)
+
+        # Reads and writes keep working while the resize runs.
+        resize = asyncio.ensure_future(m.resize_table(600))
+        while m.new_map is None:
+            await asyncio.sleep(0)
+        m.put('key0', 0)
+        m.remove('key50')
+        for i in range(100, 150):
+            m.put('key' + str(i), i)
+        print(m.new_map is not None, m.get('key49'))
+        await resize
+
+        values = await m.get_many(['key0', 'key50', 'key149'])
+        print(values[0], values[1], values[2] == 149)
+        m.put('key50', 50)
+        print(m.size, m.capacity, m.contains_key('key50'))
+
+    print("\nResize example 1")
+    print("----------------------")
+    asyncio.run(resize_example(ChainingHashMap(50, hash_function_1)))
+
+    # Resize example 2
+    # ----------------------
+    # 100 200
+    # True 49
+    # 0 None True
+    # 150 600 True
+
+    print("\nResize example 2")
+    print("----------------------")
+    asyncio.run(resize_example(OpenAddressingHashMap(50, hash_function_2)))
+
+    # Resize example 3
+    # ----------------------
+    # 3 10 8
+    # 3 10 64
+
+    async def caller_map_example() -> None:
+        hash_map = ChainingHashMap(8, hash_function_1)
+        for i in range(10):
+            hash_map.put('k' + str(i), i)
+        m = AsyncHashMap(hash_map, step=4)
+        await m.resize_table(64)
+        # The map given to AsyncHashMap keeps its entries.
+        print(hash_map.get('k3'), hash_map.size, hash_map.capacity)
+        print(m.get('k3'), m.size, m.capacity)
+
+    print("\nResize example 3")
+    print("----------------------")
+    asyncio.run(caller_map_example())
+
+    # Resize example 4
+    # ----------------------
+    # 40 True 128
+    # 40 True 128
+
+    async def incremental_example(hash_map) -> None:
+        m = AsyncHashMap(hash_map, step=2)
+        for i in range(10):
+            m.put('key' + str(i), i)
+
+        # Puts made while the new map is allocated start an incremental resize of the wrapped map.
+        resize = asyncio.ensure_future(m.resize_table(64))
+        for i in range(10, 40):
+            m.put('key' + str(i), i)
+            await asyncio.sleep(0)
+        await resize
+        print(m.size, all(m.get('key' + str(i)) == i for i in range(40)), m.capacity)
+
+    print("\nResize example 4")
+    print("----------------------")
+    asyncio.run(incremental_example(OpenAddressingHashMap(16, hash_function_2, incremental_resize=1)))
+    asyncio.run(incremental_example(OpenAddressingHashMap(16, hash_function_1, incremental_resize=2)))
+
+    # Clear example 1
+    # ---------------------
+    # 0 50 None
+
+    async def clear_example() -> None:
+        m = AsyncHashMap(ChainingHashMap(50, hash_function_1), step=8)
+        await m.put_many(('key' + str(i), i) for i in range(100))
+        await m.clear()
+        print(m.size, m.capacity, m.get('key1'))
+
+    print("\nClear example 1")
+    print("---------------------")
+    asyncio.run(clear_example())
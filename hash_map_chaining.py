@@ -2,37 +2,32 @@
 # Date: 3/18/2022
 # Description: Hash Map implementation in Python.  Dynamic Array is used to store the hash table and singly linked list is used to resolve collision (chaining).
 
-from SLL_DA import *
-
-def hash_function_1(key: str) -> int:
-    """
-    Sample Hash function.
-    """
-    hash = 0
-    for letter in key:
-        hash += ord(letter)
-    return hash
+import time
 
-def hash_function_2(key: str) -> int:
-    """
-    Another sample hash function.
-    """
-    hash, index = 0, 0
-    index = 0
-    for letter in key:
-        hash += (index + 1) * ord(letter)
-        index += 1
-    return hash
+from SLL_DA import *
+from stats import HashMapStats, chain_length
+from hash_functions import hash_function_1, hash_function_2, hash_batch
+from snapshot import write_snapshot, load_arguments
 
 class HashMap:
     """
-    Class implementing a Hash Map Table.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), and get_keys().
+    Class implementing a Hash Map Table.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), get_keys(), items(), put_many(), get_many(), remove_many(), dump(), enable_stats(), and disable_stats().  from_items() builds a presized hash map from existing items and load() restores one written by dump().
     """
 
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, max_load_factor: float = None, min_load_factor: float = None, growth_factor: float = 2) -> None:
         """
         Init a new HashMap based on Dynamic Array with Singly Linked List for collision resolution.
+
+        The resize policy is optional.  If max_load_factor is given, the table grows by growth_factor whenever put() pushes the load factor above it.  If min_load_factor is given, the table shrinks by growth_factor whenever remove() pulls the load factor below it, but never below the initial capacity.  Without them the table is only resized by resize_table().
         """
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if min_load_factor is not None and max_load_factor is None:
+            raise ValueError("min_load_factor requires max_load_factor")
+        # Shrinking must leave the load factor below max_load_factor, otherwise the next put() would grow the table right back.
+        if min_load_factor is not None and min_load_factor * growth_factor >= max_load_factor:
+            raise ValueError("min_load_factor * growth_factor must be less than max_load_factor")
+
         # Fill each bucket with a LinkedList() class.
         self.buckets = DynamicArray()
         
@@ -43,6 +38,15 @@ class HashMap:
         self.hash_function = function
         self.size = 0
 
+        # Resize policy.
+        self.max_load_factor = max_load_factor
+        self.min_load_factor = min_load_factor
+        self.growth_factor = growth_factor
+        self.min_capacity = capacity
+
+        # HashMapStats of the hash map, or None while statistics are turned off.
+        self.stats = None
+
     def __str__(self) -> str:
         """
         Overrides object's string method and returns the contents of the hash map in a human-readable form.
@@ -53,6 +57,23 @@ class HashMap:
             out += str(i) + ': ' + str(list) + '\n'
         return out
 
+    @classmethod
+    def from_items(cls, items, function, load_factor: float = 1.0, **options) -> 'HashMap':
+        """
+        This method builds a new hash map from a dict, an iterable of (key, value) pairs, or another hash map of either kind.  The capacity is chosen from the number of items so that the load factor ends up at most load_factor, and the table is filled in a single pass without any resize.  Other keyword arguments, like the resize policy, are passed on to HashMap().
+        """
+        pairs = list(items.items() if hasattr(items, 'items') else items)
+
+        max_load_factor = options.get('max_load_factor')
+        if max_load_factor is not None:
+            load_factor = min(load_factor, max_load_factor)
+
+        # -(-a // b) rounds the division up.
+        capacity = max(1, -(-len(pairs) // load_factor))
+        hash_map = cls(int(capacity), function, **options)
+        hash_map.put_many(pairs)
+        return hash_map
+
     def clear(self) -> None:
         """
         This method clears the contents of the hash map without changing the underlying hash table capacity.
@@ -73,20 +94,21 @@ class HashMap:
         """
         This method receives a key as parameter and returns the value associated with the key.  If the key is not in the hash map, it returns None.
         """
-        # If the key is not in the hash map.
-        if self.contains_key(key) is False:
-            return None
-        
         # Hash the key and locate the bucket that matches the hashed key.
         hashed_val = self.hash_function(key)
         hashed_index = hashed_val % self.buckets.length()
         bucket = self.buckets.get_at_index(hashed_index)
-        
-        # Find the node that matches the key.
-        node = bucket.contains(key)
 
-        return node.value
+        # Find the node that matches the key.  The chain is walked only once and the stored hashes are compared before the keys.
+        node = bucket.contains(key, hashed_val)
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
 
+        # If the key is not in the hash map.
+        if node is None:
+            return None
+
+        return node.value
 
     def put(self, key: str, value: object) -> None:
         """
@@ -97,24 +119,26 @@ class HashMap:
         hashed_index = hashed_val % self.buckets.length()
         bucket = self.buckets.get_at_index(hashed_index)
 
-        # If the bucket is empty, add the kay/value pair.
-        if bucket.length() == 0:
-            bucket.insert(key, value)
-            self.size += 1
+        # Walk the chain once to look for the same key.
+        node = bucket.contains(key, hashed_val)
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+            if node is None:
+                self.stats.record_insert(bucket.head is not None)
 
-        # If the bucket is already occupied but it is not the same key, insert the node at the beginning of the linked list.
-        elif bucket.length() != 0 and bucket.contains(key) is None:
-            bucket.insert(key, value)
+        # If the key is not in the bucket, insert the node at the beginning of the linked list.  The hash is stored with the node.
+        if node is None:
+            bucket.insert(key, value, hashed_val)
             self.size += 1
 
-        # If the bucket is already occupied and the key is the same, replace the value.
-        elif bucket.length() != 0 and bucket.contains(key) is not None:
-            bucket.remove(key)
-            bucket.insert(key, value)
-            # No need to update self.size.
-        
+            # Grow the table geometrically so that put() stays O(1) amortized.
+            if self.max_load_factor is not None and self.size > self.max_load_factor * self.capacity:
+                self.resize_table(max(self.capacity + 1, int(self.capacity * self.growth_factor)))
+
+        # If the key is already in the bucket, replace the value in place.
         else:
-            return
+            node.value = value
+            # No need to update self.size.
 
     def remove(self, key: str) -> None:
         """
@@ -129,12 +153,18 @@ class HashMap:
         hashed_index = hashed_val % self.buckets.length()
         bucket = self.buckets.get_at_index(hashed_index)
 
-        # If the bucket is occupied.
-        if bucket.length != 0:
-            # If the key is found in the bucket, remove the node.
-            if bucket.contains(key) is not None:
-                bucket.remove(key)
-                self.size -= 1
+        # The chain is walked a second time for the statistics only.
+        if self.stats is not None:
+            node = bucket.contains(key, hashed_val)
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+
+        # If the key is found in the bucket, remove the node.  LinkedList.remove() walks the chain only once.
+        if bucket.remove(key, hashed_val):
+            self.size -= 1
+
+            # Shrink the table after mass deletes, but never below the initial capacity.
+            if self.min_load_factor is not None and self.capacity > self.min_capacity and self.size < self.min_load_factor * self.capacity:
+                self.resize_table(max(self.min_capacity, int(self.capacity / self.growth_factor)))
 
         return
 
@@ -151,8 +181,12 @@ class HashMap:
         hashed_index = hashed_val % self.buckets.length()
         bucket = self.buckets.get_at_index(hashed_index)
 
+        node = bucket.contains(key, hashed_val)
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+
         # If the key is found in the bucket.
-        if bucket.contains(key) is not None:
+        if node is not None:
             return True
         
         else:
@@ -183,39 +217,60 @@ class HashMap:
 
     def resize_table(self, new_capacity: int) -> None:
         """
-        This method takes new capacity as parameter and changes the capacity of the internal hash table.  All elements of the hash map will be rehashed.
+        This method takes new capacity as parameter and changes the capacity of the internal hash table.  All elements of the hash map will be rehashed and their nodes moved into the new table.
         """
         # If the new capacity is less than one, return.
         if new_capacity < 1:
             return
-    
-        # Create a linked list where key/value pairs will be stored temporarily.
-        temp_arr = LinkedList()
+        if self.stats is not None:
+            started = time.perf_counter()
 
-        # Go through the hash map and copy all the key/value pairs to temp_arr.
-        for i in range(self.capacity):
-            bucket = self.buckets.get_at_index(i)
+        old_buckets = self.buckets
+        old_capacity = self.capacity
+
+        # Reset self.buckets to an empty array of linked lists.  This is the only allocation; the existing nodes are moved, not copied.
+        self.buckets = DynamicArray()
+        for i in range(new_capacity):
+            self.buckets.append(LinkedList())
+        self.capacity = new_capacity
+
+        # Nodes are moved in the reverse of their traversal order and inserted at the beginning of their new bucket, so nodes that end up in the same bucket keep their relative order.
+        for i in range(old_capacity - 1, -1, -1):
+            bucket = old_buckets.get_at_index(i)
             # If the bucket is empty.
             if bucket.length() == 0:
                 continue
-            # Go through the bucket and copy all the nodes to temp_arr.
-            else:
-                for node in bucket:
-                    temp_arr.insert(node.key,node.value)
-        
-        # Reset self.size and self.capacity.
-        self.size = 0
-        self.capacity = new_capacity
 
-        # Reset self.buckets to an empty array of linked lists.
-        self.buckets = DynamicArray()        
-        for i in range(new_capacity):
-            self.buckets.append(LinkedList())
+            # Reverse the chain in place so that it can be walked from its last node.
+            prev, cur = None, bucket.head
+            while cur is not None:
+                cur.next, prev, cur = prev, cur, cur.next
+
+            # Place each node in self.buckets using its stored hash, so hash_function is not called again.  self.size does not change.
+            cur = prev
+            while cur is not None:
+                next_node = cur.next
+                hashed_index = cur.hash % new_capacity
+                self.buckets.get_at_index(hashed_index).insert_node(cur)
+                cur = next_node
+
+        if self.stats is not None:
+            self.stats.record_resize(time.perf_counter() - started, old_capacity, new_capacity)
+
+    def enable_stats(self) -> HashMapStats:
+        """
+        This method turns on statistics (see stats.py) and returns the HashMapStats object, which is kept in self.stats.  From then on every key operation records its chain length, and every resize its time.  Statistics that are already on are kept.
+        """
+        if self.stats is None:
+            self.stats = HashMapStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """
+        This method turns statistics off and drops them.
+        """
+        self.stats = None
 
-        # Go through the temp_arr (linked list) and rehash/place each node in self.buckets.
-        for node in temp_arr:
-            self.put(node.key,node.value)
-        
     def get_keys(self) -> DynamicArray:
         """
         This method returns a DynamicArray that contains all the keys stored in the hash map.  
@@ -234,6 +289,133 @@ class HashMap:
 
         return return_arr
 
+    def items(self):
+        """
+        This method is a generator that yields every (key, value) pair stored in the hash map.
+        """
+        for i in range(self.capacity):
+            for node in self.buckets.get_at_index(i):
+                yield node.key, node.value
+
+    def dump(self, file, keep_hashes: bool = False) -> None:
+        """
+        This method writes the hash map to a binary file object as a compact snapshot: the capacity, the name of the hash function, and a length-prefixed record per entry with the key and the pickled value.  If keep_hashes is True, the stored hash of every entry is written too, so that load() does not have to hash the keys again.
+        """
+        entries = ((node.key, node.value, node.hash) for bucket in self.buckets.data for node in bucket)
+        write_snapshot(file, self.capacity, self.hash_function, self.size, entries, keep_hashes)
+
+    @classmethod
+    def load(cls, file, function=None, **options) -> 'HashMap':
+        """
+        This method reads a snapshot written by dump() from a binary file object and returns a new hash map with the snapshot's capacity, filled in a single pass.  If function is None, the hash function is found by its name (Python's hash() or a function of hash_functions.py).  Stored hashes are used if the snapshot has them and was made with the same hash function, except for hash() and builtin_hash() whose values change between processes.  Other keyword arguments are passed on to HashMap().
+        """
+        capacity, function, pairs, hashes = load_arguments(file, function)
+        hash_map = cls(capacity, function, **options)
+        hash_map.put_many(pairs, hashes)
+        return hash_map
+
+    def put_many(self, pairs, hashes: list = None) -> None:
+        """
+        This method takes an iterable of (key, value) pairs and puts all of them into the hash map.  If the hash map has a resize policy, the table is grown at most once up front for the whole batch.  All keys are hashed in one pass.  The result is the same as calling put() for each pair in order.  If hashes is given, it holds the hash value of every key, such as the hashes stored by dump(), and the keys are not hashed again.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return
+
+        # Presize the table as if every key were new, growing by growth_factor like put() does.
+        if self.max_load_factor is not None:
+            new_capacity = self.capacity
+            while self.size + len(pairs) > self.max_load_factor * new_capacity:
+                new_capacity = max(new_capacity + 1, int(new_capacity * self.growth_factor))
+            if new_capacity != self.capacity:
+                self.resize_table(new_capacity)
+
+        # Hash all keys in one pass, vectorized if possible.
+        if hashes is None:
+            hashes, indices = hash_batch([key for key, _ in pairs], self.hash_function, self.capacity)
+        else:
+            indices = [hashed % self.capacity for hashed in hashes]
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        capacity = self.capacity
+        stats = self.stats
+        added = 0
+
+        for (key, value), hashed_val, hashed_index in zip(pairs, hashes, indices):
+            bucket = data[hashed_index]
+
+            # Walk the chain once, comparing the stored hashes first.
+            node = bucket.head
+            while node is not None and (node.hash != hashed_val or node.key != key):
+                node = node.next
+
+            if stats is not None:
+                stats.record_lookup(chain_length(bucket, node), node is not None)
+                if node is None:
+                    stats.record_insert(bucket.head is not None)
+
+            if node is None:
+                bucket.insert(key, value, hashed_val)
+                added += 1
+            else:
+                node.value = value
+
+        self.size += added
+
+    def get_many(self, keys) -> list:
+        """
+        This method takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the hash map.  All keys are hashed in one pass (see hash_functions.hash_batch()).  It mostly saves the method call per key, so it is only slightly faster than calling get() for each key (see benchmark_batch() in benchmark.py).
+        """
+        # Hash all keys in one pass, vectorized if possible.
+        keys = list(keys)
+        hashes, indices = hash_batch(keys, self.hash_function, self.capacity)
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        stats = self.stats
+        values = []
+
+        for key, hashed_val, hashed_index in zip(keys, hashes, indices):
+            node = data[hashed_index].head
+            while node is not None and (node.hash != hashed_val or node.key != key):
+                node = node.next
+            if stats is not None:
+                stats.record_lookup(chain_length(data[hashed_index], node), node is not None)
+            values.append(None if node is None else node.value)
+
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        This method takes an iterable of keys and removes each of them from the hash map.  Keys that are not in the hash map are ignored.  All keys are hashed in one pass, and if the hash map has a resize policy, the table is shrunk at most once at the end of the batch.
+        """
+        # Hash all keys in one pass, vectorized if possible.
+        keys = list(keys)
+        hashes, indices = hash_batch(keys, self.hash_function, self.capacity)
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        stats = self.stats
+        removed = 0
+
+        for key, hashed_val, hashed_index in zip(keys, hashes, indices):
+            if stats is not None:
+                node = data[hashed_index].contains(key, hashed_val)
+                stats.record_lookup(chain_length(data[hashed_index], node), node is not None)
+            if data[hashed_index].remove(key, hashed_val):
+                removed += 1
+
+        self.size -= removed
+
+        # Shrink once, as far as remove() would have shrunk it one step at a time.
+        if self.min_load_factor is not None:
+            new_capacity = self.capacity
+            while new_capacity > self.min_capacity and self.size < self.min_load_factor * new_capacity:
+                new_capacity = max(self.min_capacity, int(new_capacity / self.growth_factor))
+            if new_capacity != self.capacity:
+                self.resize_table(new_capacity)
+
 #--------
 # Tests 
 #--------
@@ -542,3 +724,84 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    # Resize policy example 1
+    # ------------------------------
+    # 0.75 150 200
+    # 150 True
+    # 0.25 25 100
+    # 0.48 24 50
+
+    print("\nResize policy example 1")
+    print("------------------------------")
+    m = HashMap(50, hash_function_1, max_load_factor=1.0, min_load_factor=0.25)
+    for i in range(150):
+        m.put('str' + str(i), i * 100)
+    print(m.table_load(), m.size, m.capacity)
+    result = True
+    for i in range(150):
+        result &= m.get('str' + str(i)) == i * 100
+    print(m.size, result)
+    for i in range(125):
+        m.remove('str' + str(i))
+    print(m.table_load(), m.size, m.capacity)
+    m.remove('str125')
+    print(m.table_load(), m.size, m.capacity)
+
+    # From_items example 1
+    # --------------------------
+    # 100 100 1.0
+    # 100 200 42
+    # [('a', 1), ('b', 2)]
+
+    print("\nFrom_items example 1")
+    print("--------------------------")
+    m = HashMap.from_items({'key' + str(i): i for i in range(100)}, hash_function_2)
+    print(m.size, m.capacity, m.table_load())
+    m = HashMap.from_items(m, hash_function_1, load_factor=0.5)
+    print(m.size, m.capacity, m.get('key42'))
+    m = HashMap.from_items([('a', 1), ('b', 2)], hash_function_1)
+    print(sorted(m.items()))
+
+    # Dump example 1
+    # --------------------
+    # True 100 50 hash_function_2
+    # [1, 2] None
+
+    print("\nDump example 1")
+    print("--------------------")
+    import io
+    m = HashMap(50, hash_function_2)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.put('key1', [1, 2])
+    file = io.BytesIO()
+    m.dump(file, keep_hashes=True)
+    file.seek(0)
+    loaded = HashMap.load(file)
+    print(sorted(loaded.items()) == sorted(m.items()), loaded.size, loaded.capacity, loaded.hash_function.__name__)
+    print(loaded.get('key1'), loaded.get('key100'))
+
+    # Stats example 1
+    # ---------------------
+    # hash_function_1 1000 1.0 0.94 20 70 True
+    # hash_function_2 1000 1.0 0.8 4 14 False
+    # 1 30 0
+
+    print("\nStats example 1")
+    print("---------------------")
+    # hash_function_1() adds up the characters, so keys made of the same digits share a chain.
+    for function in (hash_function_1, hash_function_2):
+        m = HashMap(1000, function)
+        stats = m.enable_stats()
+        for i in range(1000):
+            m.put('key' + str(i), i)
+        for i in range(1000):
+            m.get('key' + str(i))
+        report = stats.report(m)
+        print(function.__name__, report['size'], report['load_factor'], round(report['collision_rate'], 2), report['hits']['p50'], report['hits']['max'], stats.is_degenerate())
+    # Batch methods are counted too, including the resize that put_many() makes up front.
+    m = HashMap(10, hash_function_2, max_load_factor=1.0)
+    stats = m.enable_stats()
+    m.put_many(('key' + str(i), i) for i in range(30))
+    print(stats.resizes, stats.inserts, stats.report()['hits']['count'])
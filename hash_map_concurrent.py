@@ -0,0 +1,334 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Thread-safe Hash Map in Python.  The chaining buckets of hash_map_chaining.py are guarded by a fixed set of striped locks, so threads that work on different stripes never wait for each other.  All stripes are only taken together to resize the table.
+
+import threading
+
+from SLL_DA import *
+from hash_functions import hash_function_1
+
+class ConcurrentHashMap:
+    """
+    Class implementing a thread-safe Hash Map Table with lock striping.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), get_keys(), and items().
+
+    Bucket i is guarded by locks[i % stripes].  The capacity is always a multiple of the number of stripes, so every stripe guards the same number of buckets.  Each stripe also keeps its own entry count, so put() and remove() never write to memory that is shared by all threads.
+    """
+
+    def __init__(self, capacity: int, function, stripes: int = 16, max_load_factor: float = 1.0, growth_factor: float = 2) -> None:
+        """
+        Init a new ConcurrentHashMap based on Dynamic Array with Singly Linked List for collision resolution, split into the given number of independently locked stripes.  The table grows by growth_factor once a stripe holds more than max_load_factor entries per bucket.
+        """
+        if stripes < 1:
+            raise ValueError("stripes must be at least 1")
+        if max_load_factor <= 0:
+            raise ValueError("max_load_factor must be greater than 0")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+
+        self.stripes = stripes
+        self.locks = [threading.Lock() for _ in range(stripes)]
+        self.counts = [0] * stripes
+        self.hash_function = function
+        self.max_load_factor = max_load_factor
+        self.growth_factor = growth_factor
+
+        # Round the capacity up to a multiple of the number of stripes.
+        self.capacity = self.stripe_capacity(capacity)
+        self.buckets = DynamicArray()
+        for _ in range(self.capacity):
+            self.buckets.append(LinkedList())
+
+    def __str__(self) -> str:
+        """
+        Overrides object's string method and returns the contents of the hash map in a human-readable form.
+        """
+        with self.all_locks():
+            out = ''
+            for i in range(self.buckets.length()):
+                out += str(i) + ': ' + str(self.buckets.get_at_index(i)) + '\n'
+            return out
+
+    @property
+    def size(self) -> int:
+        """
+        Number of entries in the hash map.  The per-stripe counts are read without locking, so while other threads are writing the result is only a snapshot.
+        """
+        return sum(self.counts)
+
+    def stripe_capacity(self, capacity: int) -> int:
+        """
+        This is a helper method that rounds the given capacity up to a positive multiple of the number of stripes.
+        """
+        return max(1, -(-capacity // self.stripes)) * self.stripes
+
+    def all_locks(self) -> 'AllLocks':
+        """
+        This is a helper method that returns a context manager holding every stripe lock.  The locks are always taken in the same order, so two threads taking all of them cannot deadlock.
+        """
+        return AllLocks(self.locks)
+
+    def locate(self, hashed_val: int):
+        """
+        This is a helper method that takes a hash value, acquires the lock of its stripe, and returns (bucket, stripe).  The caller must release self.locks[stripe].  If the table is resized while waiting for the lock, the bucket is looked up again in the new table.
+        """
+        while True:
+            buckets = self.buckets
+            hashed_index = hashed_val % buckets.length()
+            stripe = hashed_index % self.stripes
+            self.locks[stripe].acquire()
+            # resize_table() holds every lock while it swaps the tables, so once the lock is held the table can no longer change.
+            if self.buckets is buckets:
+                return buckets.get_at_index(hashed_index), stripe
+            self.locks[stripe].release()
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map without changing the underlying hash table capacity.
+        """
+        with self.all_locks():
+            for i in range(self.capacity):
+                if self.buckets.get_at_index(i).length() != 0:
+                    self.buckets.set_at_index(i, LinkedList())
+            self.counts = [0] * self.stripes
+
+    def get(self, key: str) -> object:
+        """
+        This method receives a key as parameter and returns the value associated with the key.  If the key is not in the hash map, it returns None.  Only the lock of the key's stripe is held.
+        """
+        hashed_val = self.hash_function(key)
+        bucket, stripe = self.locate(hashed_val)
+        try:
+            node = bucket.contains(key, hashed_val)
+            return None if node is None else node.value
+        finally:
+            self.locks[stripe].release()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and adds the node to the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.  Only the lock of the key's stripe is held, except when the put makes the table grow.
+        """
+        hashed_val = self.hash_function(key)
+        bucket, stripe = self.locate(hashed_val)
+        try:
+            node = bucket.contains(key, hashed_val)
+            if node is not None:
+                node.value = value
+                return
+            bucket.insert(key, value, hashed_val)
+            self.counts[stripe] += 1
+            # Each stripe guards capacity / stripes buckets, so its own count tells when the whole table is too loaded.
+            capacity = self.capacity
+            grow = self.counts[stripe] > self.max_load_factor * capacity / self.stripes
+        finally:
+            self.locks[stripe].release()
+
+        # The stripe lock has to be released first, since resizing takes every lock.
+        if grow:
+            self.grow(capacity)
+
+    def grow(self, capacity: int) -> None:
+        """
+        This is a helper method that grows the table by growth_factor, unless another thread has already resized it since its capacity was observed.
+        """
+        with self.all_locks():
+            if self.capacity == capacity:
+                self.move_buckets(max(capacity + 1, int(capacity * self.growth_factor)))
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its associated value from the hash map.  If the key is not in the hash map, the method does nothing.  Only the lock of the key's stripe is held.
+        """
+        hashed_val = self.hash_function(key)
+        bucket, stripe = self.locate(hashed_val)
+        try:
+            if bucket.remove(key, hashed_val):
+                self.counts[stripe] -= 1
+        finally:
+            self.locks[stripe].release()
+
+    def contains_key(self, key: str) -> bool:
+        """
+        This method takes a key as parameter and searches it in the hash map.  If the given key is in the hash map, it returns True.  Otherwise, it returns False.  Only the lock of the key's stripe is held.
+        """
+        hashed_val = self.hash_function(key)
+        bucket, stripe = self.locate(hashed_val)
+        try:
+            return bucket.contains(key, hashed_val) is not None
+        finally:
+            self.locks[stripe].release()
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table.
+        """
+        with self.all_locks():
+            empty_bucket_num = 0
+            for i in range(self.capacity):
+                if self.buckets.get_at_index(i).length() == 0:
+                    empty_bucket_num += 1
+            return empty_bucket_num
+
+    def table_load(self) -> float:
+        """
+        This method calculates and returns the current hash table load factor.
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes new capacity as parameter and changes the capacity of the internal hash table.  The capacity is rounded up to a multiple of the number of stripes.  Every stripe lock is held while the nodes are moved.
+        """
+        if new_capacity < 1:
+            return
+
+        with self.all_locks():
+            self.move_buckets(new_capacity)
+
+    def move_buckets(self, new_capacity: int) -> None:
+        """
+        This is a helper method for resize_table() and grow() that moves every node into a new table of the given capacity, using the stored hashes.  The caller must hold every stripe lock.  The nodes are moved the same way as in HashMap.resize_table(), and the per-stripe counts are recomputed since entries change stripes.
+        """
+        new_capacity = self.stripe_capacity(new_capacity)
+        old_buckets = self.buckets
+        new_buckets = DynamicArray()
+        for _ in range(new_capacity):
+            new_buckets.append(LinkedList())
+
+        counts = [0] * self.stripes
+        for i in range(old_buckets.length() - 1, -1, -1):
+            bucket = old_buckets.get_at_index(i)
+            if bucket.length() == 0:
+                continue
+
+            # Reverse the chain in place so that nodes that end up in the same bucket keep their relative order.
+            prev, cur = None, bucket.head
+            while cur is not None:
+                cur.next, prev, cur = prev, cur, cur.next
+
+            cur = prev
+            while cur is not None:
+                next_node = cur.next
+                hashed_index = cur.hash % new_capacity
+                new_buckets.get_at_index(hashed_index).insert_node(cur)
+                counts[hashed_index % self.stripes] += 1
+                cur = next_node
+
+        # Threads waiting in locate() notice the new table once they get their lock.
+        self.counts = counts
+        self.capacity = new_capacity
+        self.buckets = new_buckets
+
+    def get_keys(self) -> DynamicArray:
+        """
+        This method returns a DynamicArray that contains all the keys stored in the hash map.  It is a consistent snapshot taken while holding every stripe lock.
+        """
+        return_arr = DynamicArray()
+        for key, _ in self.items():
+            return_arr.append(key)
+        return return_arr
+
+    def items(self) -> list:
+        """
+        This method returns a list of every (key, value) pair stored in the hash map.  Unlike HashMap.items() it is not a generator: the pairs are a consistent snapshot taken while holding every stripe lock.
+        """
+        with self.all_locks():
+            pairs = []
+            for i in range(self.capacity):
+                for node in self.buckets.get_at_index(i):
+                    pairs.append((node.key, node.value))
+            return pairs
+
+
+class AllLocks:
+    """
+    Context manager that acquires a list of locks in order and releases them in reverse order.
+    """
+
+    def __init__(self, locks: list) -> None:
+        self.locks = locks
+
+    def __enter__(self) -> None:
+        for lock in self.locks:
+            lock.acquire()
+
+    def __exit__(self, *exc_info) -> None:
+        for lock in reversed(self.locks):
+            lock.release()
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    # Put example 1
+    # -------------------
+    # 12
+    # 10 12
+    # 20 24
+    # 30 48
+    # 29 5 None True
+
+    print("\nPut example 1")
+    print("-------------------")
+    # The capacity is rounded up to a multiple of the number of stripes.
+    m = ConcurrentHashMap(10, hash_function_1, stripes=4)
+    print(m.capacity)
+    for i in range(30):
+        m.put('key' + str(i), i)
+        if i % 10 == 9:
+            print(m.size, m.capacity)
+    m.remove('key1')
+    print(m.size, m.get('key5'), m.get('key1'), m.contains_key('key29'))
+
+    # Stress example 1
+    # ----------------------
+    # True True True
+    # True True
+
+    print("\nStress example 1")
+    print("----------------------")
+    import random
+
+    # Each thread runs mixed put()/get()/remove() on its own keys and checks every get() against its own reference dict.  All threads also write to the same shared keys, so the stripes are contended and the table grows while every thread is running.
+    m = ConcurrentHashMap(8, hash, stripes=8)
+    thread_count, operations, shared_keys = 8, 20000, 64
+    references = [{} for _ in range(thread_count)]
+    failures = []
+    start = threading.Barrier(thread_count)
+
+    def worker(number: int) -> None:
+        rng = random.Random(number)
+        reference = references[number]
+        start.wait()
+        for i in range(operations):
+            key = 't' + str(number) + '_' + str(rng.randrange(2000))
+            choice = rng.random()
+            if choice < 0.5:
+                m.put(key, i)
+                reference[key] = i
+            elif choice < 0.7:
+                m.remove(key)
+                reference.pop(key, None)
+            elif choice < 0.9:
+                if m.get(key) != reference.get(key) or m.contains_key(key) != (key in reference):
+                    failures.append(key)
+            else:
+                m.put('shared' + str(rng.randrange(shared_keys)), (number, i))
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(thread_count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    expected = {}
+    for reference in references:
+        expected.update(reference)
+    result = dict(m.items())
+    shared = {key: result.pop(key) for key in list(result) if key.startswith('shared')}
+
+    # Every get() matched, the private keys match the merged reference dicts, and the size matches the entries.
+    print(not failures, result == expected, m.size == len(expected) + len(shared))
+    # Every shared key holds a value that some thread wrote, and the table grew past its initial capacity.
+    print(len(shared) == shared_keys and all(0 <= number < thread_count for number, _ in shared.values()), m.capacity > 8)
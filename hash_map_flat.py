@@ -0,0 +1,369 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Open addressing Hash Map that keeps the hashes, keys, values and slot states in separate flat arrays instead of one HashEntry per slot.  It has the core methods and the quadratic probing of hash_map_open_addressing.py, but not its batch methods, items(), from_items(), dump()/load(), statistics, or other probing strategies.
+
+from array import array
+
+from SLL_DA import DynamicArray
+from hash_map_open_addressing import hash_function_1, hash_function_2
+
+# Hashes are stored as unsigned 64-bit integers.
+MASK_64 = 0xFFFFFFFFFFFFFFFF
+
+# Slot states.
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+
+class FlatHashMap:
+    """
+    Class implementing a Hash Map Table with struct-of-arrays storage.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), and get_keys().
+
+    Slot i is described by states[i], hashes[i], keys[i] and values[i].  The states and hashes are array-module buffers, so a slot costs no object allocation and a probe reads plain machine integers.
+    """
+
+    def __init__(self, capacity: int, function, max_tombstone_ratio: float = 0.25) -> None:
+        """
+        Init a new FlatHashMap that uses Quadratic Probing for collision resolution.  Like HashMap, a probe gives up after capacity slots since quadratic probing may not reach every slot: lookups then miss and inserts grow the table.  Once remove() leaves more than max_tombstone_ratio * capacity tombstones, the table is compacted by rehashing it at the same capacity.
+        """
+        # Same limits as HashMap: empty slots must remain to end a probe.
+        if not 0 < max_tombstone_ratio < 0.5:
+            raise ValueError("max_tombstone_ratio must be greater than 0 and less than 0.5")
+
+        self.capacity = capacity
+        self.hash_function = function
+        self.size = 0
+        self.tombstones = 0
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.allocate(capacity)
+
+    def allocate(self, capacity: int) -> None:
+        """
+        This is a helper method that replaces the four arrays with empty ones of the given capacity.
+        """
+        self.states = array('B', bytes(capacity))
+        self.hashes = array('Q', bytes(8 * capacity))
+        self.keys = [None] * capacity
+        self.values = [None] * capacity
+
+    def __str__(self) -> str:
+        """
+        Overrides object's string method returns the contents of the hash map in a human-readable form.
+        """
+        out = ''
+        for i in range(self.capacity):
+            if self.states[i] == LIVE:
+                content = f"K: {self.keys[i]} V: {self.values[i]} TS: False"
+            elif self.states[i] == TOMBSTONE:
+                content = 'TOMBSTONE'
+            else:
+                content = 'None'
+            out += str(i) + ': ' + content + '\n'
+        return out
+
+    def find_slot(self, key: str, hashed_key: int) -> int:
+        """
+        This is a helper method that returns the index of the live slot holding the key, or -1 if the key is not in the hash map.  Quadratic probing is used.
+        """
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        initial_index = hashed_key % capacity
+        index = initial_index
+        iteration = 1
+
+        # Loop until either the key is found or we find an empty slot.  Tombstones never match since only live slots are compared.
+        state = states[index]
+        while state != EMPTY:
+            if state == LIVE and hashes[index] == hashed_key and keys[index] == key:
+                return index
+            # Quadratic probing may not reach every slot, so the probe gives up once it has visited capacity slots.
+            if iteration == capacity:
+                break
+            index = (initial_index + iteration * iteration) % capacity
+            iteration += 1
+            state = states[index]
+
+        return -1
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map without changing its underlying capacity.
+        """
+        self.allocate(self.capacity)
+        self.size = 0
+        self.tombstones = 0
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value.  If the key is not in the hash table, the method returns None.
+        """
+        # find_slot() is inlined here since get() is the hottest path.
+        hashed_key = self.hash_function(key) & MASK_64
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        initial_index = hashed_key % capacity
+        index = initial_index
+        iteration = 1
+
+        state = states[index]
+        while state != EMPTY:
+            if state == LIVE and hashes[index] == hashed_key and keys[index] == key:
+                return self.values[index]
+            if iteration == capacity:
+                break
+            index = (initial_index + iteration * iteration) % capacity
+            iteration += 1
+            state = states[index]
+
+        # The key is not in the hash map.
+        return None
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and updates the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.  Otherwise the new entry takes the first tombstone found while probing, if any.  The table is resized to double its current capacity when the current load factor is greater than or equal to 0.5.
+        """
+        # Check if resize_table() needs to be called.
+        if self.size / self.capacity >= 0.5:
+            self.resize_table(self.capacity * 2)
+
+        hashed_key = self.hash_function(key) & MASK_64
+        states, hashes, keys = self.states, self.hashes, self.keys
+        capacity = self.capacity
+        initial_index = hashed_key % capacity
+        index = initial_index
+        iteration = 1
+        # Index of the first tombstone on the probe sequence, if any.
+        tombstone_index = -1
+
+        # Continue probing until either an empty slot or the same key is found.
+        state = states[index]
+        while state != EMPTY:
+            if state == LIVE:
+                if hashes[index] == hashed_key and keys[index] == key:
+                    # The key already exists in the hash map, replace its value.
+                    self.values[index] = value
+                    return
+            elif tombstone_index < 0:
+                tombstone_index = index
+            # Every slot the probe sequence can reach has been visited.  The key is not in the table; it takes the first tombstone, or the table grows if there is none.
+            if iteration == capacity:
+                if tombstone_index < 0:
+                    self.resize_table(capacity * 2)
+                    self.put(key, value)
+                    return
+                break
+            index = (initial_index + iteration * iteration) % capacity
+            iteration += 1
+            state = states[index]
+
+        # Reuse the first tombstone on the probe sequence.
+        if tombstone_index >= 0:
+            index = tombstone_index
+            self.tombstones -= 1
+
+        states[index] = LIVE
+        hashes[index] = hashed_key
+        keys[index] = key
+        self.values[index] = value
+        self.size += 1
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its associated value from the hash map by marking its slot as a tombstone.
+        """
+        index = self.find_slot(key, self.hash_function(key) & MASK_64)
+        if index < 0:
+            return
+
+        # Drop the references so that the key and value can be freed.
+        self.states[index] = TOMBSTONE
+        self.keys[index] = None
+        self.values[index] = None
+        self.size -= 1
+        self.tombstones += 1
+
+        # Compact the table once there are too many tombstones.
+        if self.tombstones > self.max_tombstone_ratio * self.capacity:
+            self.resize_table(self.capacity)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.
+        """
+        # Empty hash map.
+        if self.size == 0:
+            return False
+
+        return self.find_slot(key, self.hash_function(key) & MASK_64) >= 0
+
+    def empty_buckets(self) -> int:
+        """
+        This method returns the number of empty buckets in the hash table.
+        """
+        return self.states.count(EMPTY)
+
+    def table_load(self) -> float:
+        """
+        This method calculates and returns the current hash table load factor.
+        """
+        return self.size / self.capacity
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as parameter and changes the capacity of the internal hash map.  All live slots are moved into the new arrays using their stored hashes and tombstones are dropped.
+        """
+        if new_capacity < 1 or new_capacity < self.size:
+            return
+
+        # Choose the final capacity up front, the same way HashMap.resize_table() does.
+        while self.size > 0 and 2 * (self.size - 1) >= new_capacity:
+            new_capacity *= 2
+
+        old_states, old_hashes, old_keys, old_values = self.states, self.hashes, self.keys, self.values
+        old_capacity, old_tombstones = self.capacity, self.tombstones
+        self.allocate(new_capacity)
+        self.capacity = new_capacity
+        self.tombstones = 0
+
+        states, hashes, keys, values = self.states, self.hashes, self.keys, self.values
+        for i in range(len(old_states)):
+            if old_states[i] != LIVE:
+                continue
+
+            hashed_key = old_hashes[i]
+            initial_index = hashed_key % new_capacity
+            index = initial_index
+            iteration = 1
+            # The keys are known to be distinct, so probing only needs to find an empty slot.
+            while states[index] != EMPTY:
+                # The probe sequence reaches no empty slot.  The old arrays are still intact, so the resize starts over at twice the capacity.
+                if iteration == new_capacity:
+                    self.states, self.hashes, self.keys, self.values = old_states, old_hashes, old_keys, old_values
+                    self.capacity, self.tombstones = old_capacity, old_tombstones
+                    self.resize_table(new_capacity * 2)
+                    return
+                index = (initial_index + iteration * iteration) % new_capacity
+                iteration += 1
+
+            states[index] = LIVE
+            hashes[index] = hashed_key
+            keys[index] = old_keys[i]
+            values[index] = old_values[i]
+
+    def get_keys(self) -> DynamicArray:
+        """
+        This method returns a Dynamic Array with all the keys from the hash map in it.
+        """
+        return_arr = DynamicArray()
+        for i in range(self.capacity):
+            if self.states[i] == LIVE:
+                return_arr.append(self.keys[i])
+        return return_arr
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    # Empty_buckets example 2
+    # -----------------------------
+    # 49 1 50
+    # 69 31 100
+    # 139 61 200
+    # 109 91 200
+    # 279 121 400
+
+    print("\nEmpty_buckets example 2")
+    print("-----------------------------")
+    m = FlatHashMap(50, hash_function_1)
+    for i in range(150):
+        m.put('key' + str(i), i * 100)
+        if i % 30 == 0:
+            print(m.empty_buckets(), m.size, m.capacity)
+
+    # Put example 2
+    # -------------------
+    # 36 0.1 4 40
+    # 33 0.175 7 40
+    # 30 0.25 10 40
+    # 26 0.35 14 40
+    # 23 0.425 17 40
+
+    print("\nPut example 2")
+    print("-------------------")
+    m = FlatHashMap(40, hash_function_2)
+    for i in range(50):
+        m.put('str' + str(i // 3), i * 100)
+        if i % 10 == 9:
+            print(m.empty_buckets(), m.table_load(), m.size, m.capacity)
+
+    # Remove example 1
+    # ----------------------
+    # None
+    # 10
+    # None
+
+    print("\nRemove example 1")
+    print("----------------------")
+    m = FlatHashMap(50, hash_function_1)
+    print(m.get('key1'))
+    m.put('key1', 10)
+    print(m.get('key1'))
+    m.remove('key1')
+    print(m.get('key1'))
+    m.remove('key4')
+
+    # Resize example 2
+    # ----------------------
+    # 77 300
+    # 111 True 77 222 0.35
+    # 228 True 77 228 0.34
+    # 345 True 77 345 0.22
+    # 462 True 77 462 0.17
+    # 579 True 77 579 0.13
+    # 696 True 77 696 0.11
+    # 813 True 77 813 0.09
+    # 930 True 77 930 0.08
+
+    print("\nResize example 2")
+    print("----------------------")
+    m = FlatHashMap(75, hash_function_2)
+    keys = [i for i in range(1, 1000, 13)]
+    for key in keys:
+        m.put(str(key), key * 42)
+    print(m.size, m.capacity)
+
+    for capacity in range(111, 1000, 117):
+        m.resize_table(capacity)
+
+        m.put('some key', 'some value')
+        result = m.contains_key('some key')
+        m.remove('some key')
+
+        for key in keys:
+            result &= m.contains_key(str(key))
+            result &= not m.contains_key(str(key + 1))
+        print(capacity, result, m.size, m.capacity, round(m.table_load(), 2))
+
+    # Get_keys example 1
+    # ------------------------
+    # ['160', '170', '180', '190', '100', '110', '120', '130', '140', '150']
+    # ['160', '170', '180', '190', '100', '110', '120', '130', '140', '150']
+    # ['200', '110', '120', '130', '140', '150', '160', '170', '180', '190']
+
+    print("\nGet_keys example 1")
+    print("------------------------")
+    m = FlatHashMap(10, hash_function_2)
+    for i in range(100, 200, 10):
+        m.put(str(i), str(i * 10))
+    print(m.get_keys())
+
+    m.resize_table(1)
+    print(m.get_keys())
+
+    m.put('200', '2000')
+    m.remove('100')
+    m.resize_table(2)
+    print(m.get_keys())
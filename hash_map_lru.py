@@ -0,0 +1,286 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Bounded LRU cache built on the chaining HashMap of hash_map_chaining.py.  Every node of the hash map is also linked into a doubly linked list ordered by recency, so get(), put(), and evicting the least recently used entry all take O(1) time.
+
+import sys
+
+from SLL_DA import *
+from hash_map_chaining import HashMap
+from hash_functions import hash_function_1, hash_function_2
+from stats import chain_length
+
+
+class LRUNode(SLNode):
+    """
+    Node of an LRUCache.  next links the node into its bucket's chain like any SLNode, older and newer link it into the recency list, and size is the number of bytes it is counted as.
+    """
+
+    __slots__ = ('older', 'newer', 'size')
+
+    def __init__(self, key: str, value: object, hash: int = None, size: int = 0) -> None:
+        """
+        Init a new node that is not linked into any list yet.
+        """
+        super().__init__(key, value, hash)
+        self.older = None
+        self.newer = None
+        self.size = size
+
+
+def entry_size(key: str, value: object) -> int:
+    """
+    This function returns the default size of a cache entry in bytes: the node plus the shallow sizes of the key and the value.  Objects that the value refers to are not counted.
+    """
+    return NODE_BYTES + sys.getsizeof(key) + sys.getsizeof(value)
+
+
+NODE_BYTES = sys.getsizeof(LRUNode(None, None))
+
+
+class LRUCache(HashMap):
+    """
+    Class implementing a bounded cache that evicts the least recently used entries.  It supports the methods of the chaining HashMap, and evict() and hit_rate().  get() and put() make an entry the most recently used; contains_key() does not.
+
+    The cache holds at most max_entries entries and max_bytes bytes, as measured by sizeof(key, value), whichever limit is given.  hits, misses, and evictions count the get() calls that found their key, those that did not, and the entries evicted to stay within the limits.
+    """
+
+    def __init__(self, capacity: int, function, max_entries: int = None, max_bytes: int = None, sizeof=entry_size, **options) -> None:
+        """
+        Init a new empty LRUCache.  At least one of max_entries and max_bytes must be given.  Other keyword arguments set the resize policy of the HashMap; by default the table grows once the load factor passes 1, so it never grows much beyond max_entries buckets.
+        """
+        if max_entries is None and max_bytes is None:
+            raise ValueError("an LRUCache needs max_entries or max_bytes")
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        options.setdefault('max_load_factor', 1.0)
+        super().__init__(capacity, function, **options)
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        # Sentinel of the circular recency list.  recent.newer is the least recently used node and recent.older the most recently used one.
+        self.recent = LRUNode(None, None)
+        self.recent.older = self.recent
+        self.recent.newer = self.recent
+
+    def unlink(self, node: LRUNode) -> None:
+        """
+        This is a helper method that takes a node out of the recency list.
+        """
+        node.older.newer = node.newer
+        node.newer.older = node.older
+
+    def link_newest(self, node: LRUNode) -> None:
+        """
+        This is a helper method that links a node into the recency list as the most recently used one.
+        """
+        newest = self.recent.older
+        node.older = newest
+        node.newer = self.recent
+        newest.newer = node
+        self.recent.older = node
+
+    def over_limit(self) -> bool:
+        """
+        This is a helper method that returns True if the cache holds more entries or bytes than allowed.
+        """
+        return (self.max_entries is not None and self.size > self.max_entries) or (self.max_bytes is not None and self.bytes > self.max_bytes)
+
+    def evict(self) -> None:
+        """
+        This method removes the least recently used entry.  If the cache is empty, the method does nothing.
+        """
+        node = self.recent.newer
+        if node is self.recent:
+            return
+        self.buckets.get_at_index(node.hash % self.capacity).remove(node.key, node.hash)
+        self.unlink(node)
+        self.size -= 1
+        self.bytes -= node.size
+        self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the cache without changing the underlying hash table capacity.  The counters are kept.
+        """
+        super().clear()
+        self.recent.older = self.recent
+        self.recent.newer = self.recent
+        self.bytes = 0
+
+    def get(self, key: str) -> object:
+        """
+        This method receives a key as parameter and returns the value associated with the key, which becomes the most recently used entry.  If the key is not in the cache, it returns None.
+        """
+        hashed_val = self.hash_function(key)
+        bucket = self.buckets.get_at_index(hashed_val % self.capacity)
+        node = bucket.contains(key, hashed_val)
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+
+        if node is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self.unlink(node)
+        self.link_newest(node)
+        return node.value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and adds them to the cache as the most recently used entry.  If the given key already exists in the cache, its associated value is replaced with the new value.  Least recently used entries are then evicted until the cache is within its limits, which evicts the new entry itself if it is larger than max_bytes.
+        """
+        hashed_val = self.hash_function(key)
+        bucket = self.buckets.get_at_index(hashed_val % self.capacity)
+        node = bucket.contains(key, hashed_val)
+        size = self.sizeof(key, value) if self.max_bytes is not None else 0
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+            if node is None:
+                self.stats.record_insert(bucket.head is not None)
+
+        if node is None:
+            node = LRUNode(key, value, hashed_val, size)
+            bucket.insert_node(node)
+            self.size += 1
+        else:
+            node.value = value
+            self.bytes -= node.size
+            node.size = size
+            self.unlink(node)
+        self.link_newest(node)
+        self.bytes += size
+
+        while self.over_limit():
+            self.evict()
+
+        # Grow the table like HashMap.put() once the evictions are done, so it does not grow for entries that were evicted right away.
+        if self.max_load_factor is not None and self.size > self.max_load_factor * self.capacity:
+            self.resize_table(max(self.capacity + 1, int(self.capacity * self.growth_factor)))
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its entry from the cache.  If the key is not in the cache, the method does nothing.
+        """
+        hashed_val = self.hash_function(key)
+        bucket = self.buckets.get_at_index(hashed_val % self.capacity)
+        node = bucket.contains(key, hashed_val)
+        if self.stats is not None:
+            self.stats.record_lookup(chain_length(bucket, node), node is not None)
+        if node is None:
+            return
+
+        bucket.remove(key, hashed_val)
+        self.unlink(node)
+        self.size -= 1
+        self.bytes -= node.size
+
+        # Shrink the table like HashMap.remove().
+        if self.min_load_factor is not None and self.capacity > self.min_capacity and self.size < self.min_load_factor * self.capacity:
+            self.resize_table(max(self.min_capacity, int(self.capacity / self.growth_factor)))
+
+    def put_many(self, pairs, hashes: list = None) -> None:
+        """
+        This method takes an iterable of (key, value) pairs and puts each of them into the cache in order, so later pairs are more recently used.  hashes is accepted for compatibility with HashMap.load() and not used.
+        """
+        for key, value in pairs:
+            self.put(key, value)
+
+    def get_many(self, keys) -> list:
+        """
+        This method takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the cache.  Each key is looked up with get(), in order.
+        """
+        return [self.get(key) for key in keys]
+
+    def remove_many(self, keys) -> None:
+        """
+        This method takes an iterable of keys and removes each of them from the cache.
+        """
+        for key in keys:
+            self.remove(key)
+
+    def items(self):
+        """
+        This method is a generator that yields every (key, value) pair stored in the cache, from the least to the most recently used.
+        """
+        node = self.recent.newer
+        while node is not self.recent:
+            yield node.key, node.value
+            node = node.newer
+
+    def hit_rate(self) -> float:
+        """
+        This method returns the fraction of get() calls that found their key, or 0 if get() has not been called.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    # Max_entries example 1
+    # ---------------------------
+    # 3 ['b', 'c', 'a']
+    # 3 ['c', 'a', 'd'] None
+    # 2 1 1 0.67
+
+    print("\nMax_entries example 1")
+    print("---------------------------")
+    m = LRUCache(10, hash_function_1, max_entries=3)
+    m.put('a', 1)
+    m.put('b', 2)
+    m.put('c', 3)
+    m.get('a')
+    print(m.size, [key for key, _ in m.items()])
+    # 'b' is the least recently used entry, so it is evicted.
+    m.put('d', 4)
+    print(m.size, [key for key, _ in m.items()], m.get('b'))
+    m.get('d')
+    print(m.hits, m.misses, m.evictions, round(m.hit_rate(), 2))
+
+    # Max_bytes example 1
+    # -------------------------
+    # 10 1000 True
+    # 2 9 True
+    # 0 12 0
+
+    print("\nMax_bytes example 1")
+    print("-------------------------")
+    m = LRUCache(10, hash_function_2, max_bytes=1000, sizeof=lambda key, value: len(value))
+    for i in range(10):
+        m.put('key' + str(i), b'x' * 100)
+    print(m.size, m.bytes, m.get('key0') is not None)
+    # A large value pushes out the least recently used entries until the bytes fit.  'key0' was just read, so it stays.
+    m.put('big', b'x' * 900)
+    print(m.size, m.evictions, m.contains_key('key0'))
+    m.put('huge', b'x' * 2000)
+    print(m.size, m.evictions, m.bytes)
+
+    # Resize example 1
+    # ----------------------
+    # 1000 1280 True
+    # 1000 key1000
+    # 0 [] 0
+
+    print("\nResize example 1")
+    print("----------------------")
+    # The table grows with the cache and the recency order survives the resizes.
+    m = LRUCache(10, hash_function_2, max_entries=1000)
+    for i in range(2000):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity, [key for key, _ in m.items()] == ['key' + str(i) for i in range(1000, 2000)])
+    # After a removal there is room for a new entry without evicting.
+    m.remove('key1500')
+    m.put('key0', 0)
+    print(m.size, next(m.items())[0])
+    m.clear()
+    print(m.size, list(m.items()), m.bytes)
@@ -0,0 +1,255 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Read-only open addressing Hash Map stored in a file.  write_table() writes the whole table in one bulk pass and MmapHashMap maps the file with mmap, so opening it takes no time regardless of its size and lookups probe the mapped pages directly.  Processes that open the same file share its pages through the page cache.
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+
+from SLL_DA import DynamicArray
+from hash_functions import fnv1a_hash, hash_function_2, hash_batch
+from probing import next_power_of_two
+
+# Header: magic, number of slots, number of entries, file offset of the data region, value encoding, and the name of the hash function.
+HEADER = struct.Struct('<8sQQQQ32s')
+MAGIC = b'MMHMAP01'
+
+# Slot: full hash value and 1 + the offset of the entry's record in the data region, so that 0 marks an empty slot.
+SLOT = struct.Struct('<QQ')
+
+# Data record: key length and value length, followed by the UTF-8 key and the value.
+RECORD = struct.Struct('<II')
+
+# Value encodings.  Raw values must be bytes and are returned as bytes.
+PICKLED = 0
+RAW = 1
+
+# Load factor of the written table.  Linear probing is used, which reads neighboring slots of the same pages.
+MAX_LOAD = 0.5
+
+
+def write_table(path: str, items, function=fnv1a_hash, raw: bool = False) -> None:
+    """
+    This function writes a table file for MmapHashMap from a dict, an iterable of (key, value) pairs, or a hash map of either kind.  Keys must be strings.  Values are pickled, or written as they are if raw is True, in which case they must be bytes.  The hash function has to give the same value in every process, so Python's built-in hash() can not be used.  The file is written next to path and renamed over it once complete, so readers never see a partial table.
+    """
+    # Like put(), a repeated key keeps its last value.
+    pairs = dict(items.items() if hasattr(items, 'items') else items)
+    capacity = next_power_of_two(max(1, -(-len(pairs) // MAX_LOAD)))
+    mask = capacity - 1
+    data_offset = HEADER.size + capacity * SLOT.size
+
+    # Hash all keys in one pass, vectorized if possible.  Slot i is words 2i (hash) and 2i + 1 (1 + record offset) of the array.
+    hashes, _ = hash_batch(list(pairs), function, capacity)
+    slots = array('Q', bytes(capacity * SLOT.size))
+
+    temporary = path + '.tmp'
+    with open(temporary, 'wb') as file:
+        file.seek(data_offset)
+        offset = 0
+        chunk = []
+        for (key, value), hashed_key in zip(pairs.items(), hashes):
+            # The keys are distinct, so probing only needs to find an empty slot.
+            index = hashed_key & mask
+            while slots[2 * index + 1] != 0:
+                index = (index + 1) & mask
+            slots[2 * index] = hashed_key
+            slots[2 * index + 1] = offset + 1
+
+            encoded = key.encode('utf-8')
+            value = value if raw else pickle.dumps(value)
+            record = RECORD.pack(len(encoded), len(value)) + encoded + value
+            chunk.append(record)
+            offset += len(record)
+
+            # Write the records out in large chunks.
+            if len(chunk) >= 4096:
+                file.write(b''.join(chunk))
+                chunk = []
+        file.write(b''.join(chunk))
+
+        # The slot array is written in one call.  The file format is little-endian.
+        if sys.byteorder == 'big':
+            slots.byteswap()
+        file.seek(HEADER.size)
+        slots.tofile(file)
+        file.seek(0)
+        file.write(HEADER.pack(MAGIC, capacity, len(pairs), data_offset, RAW if raw else PICKLED, function.__name__.encode('utf-8')[:32]))
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temporary, path)
+
+
+class MmapHashMap:
+    """
+    Class implementing a read-only Hash Map over a table file written by write_table().  Supported methods are: get(), contains_key(), get_many(), table_load(), get_keys(), items(), and close().  It can also be used in a with statement.
+
+    Nothing is read when the table is opened: get() hashes the key and probes the slots of the mapped file, and only the record of a matching slot is decoded.
+    """
+
+    def __init__(self, path: str, function=fnv1a_hash) -> None:
+        """
+        Init a new MmapHashMap by mapping the table file at path.  function must be the hash function the file was written with.
+        """
+        with open(path, 'rb') as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, capacity, size, data_offset, encoding, name = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC:
+            self.mm.close()
+            raise ValueError("not a MmapHashMap table file")
+        if name.rstrip(b'\0') != function.__name__.encode('utf-8')[:32]:
+            self.mm.close()
+            raise ValueError("the table was written with hash function " + name.rstrip(b'\0').decode('utf-8'))
+
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.size = size
+        self.data_offset = data_offset
+        self.raw = encoding == RAW
+        self.hash_function = function
+
+    def __enter__(self) -> 'MmapHashMap':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        This method unmaps the file.  The hash map can not be used afterwards.
+        """
+        self.mm.close()
+
+    def find_record(self, key: str, hashed_key: int) -> int:
+        """
+        This is a helper method that returns the file offset of the key's record, or -1 if the key is not in the table.
+        """
+        mm = self.mm
+        encoded = key.encode('utf-8')
+        index = hashed_key & self.mask
+
+        # Linear probing until either the key or an empty slot is found.
+        while True:
+            slot_hash, offset = SLOT.unpack_from(mm, HEADER.size + index * SLOT.size)
+            if offset == 0:
+                return -1
+            if slot_hash == hashed_key:
+                start = self.data_offset + offset - 1
+                key_length = RECORD.unpack_from(mm, start)[0]
+                start += RECORD.size
+                if mm[start:start + key_length] == encoded:
+                    return start - RECORD.size
+            index = (index + 1) & self.mask
+
+    def read_value(self, start: int) -> object:
+        """
+        This is a helper method that returns the value of the record at the given file offset.
+        """
+        key_length, value_length = RECORD.unpack_from(self.mm, start)
+        start += RECORD.size + key_length
+        value = self.mm[start:start + value_length]
+        return value if self.raw else pickle.loads(value)
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value.  If the key is not in the table, the method returns None.
+        """
+        start = self.find_record(key, self.hash_function(key))
+        return None if start < 0 else self.read_value(start)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the table.  Otherwise, it returns False.
+        """
+        return self.find_record(key, self.hash_function(key)) >= 0
+
+    def get_many(self, keys) -> list:
+        """
+        This method takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the table.  All keys are hashed in one pass (see hash_functions.hash_batch()).
+        """
+        keys = list(keys)
+        hashes, _ = hash_batch(keys, self.hash_function, self.capacity)
+        values = []
+        for key, hashed_key in zip(keys, hashes):
+            start = self.find_record(key, hashed_key)
+            values.append(None if start < 0 else self.read_value(start))
+        return values
+
+    def table_load(self) -> float:
+        """
+        This method calculates and returns the load factor of the table.
+        """
+        return self.size / self.capacity
+
+    def items(self):
+        """
+        This method is a generator that yields every (key, value) pair stored in the table.
+        """
+        for index in range(self.capacity):
+            _, offset = SLOT.unpack_from(self.mm, HEADER.size + index * SLOT.size)
+            if offset == 0:
+                continue
+            start = self.data_offset + offset - 1
+            key_length = RECORD.unpack_from(self.mm, start)[0]
+            key = self.mm[start + RECORD.size:start + RECORD.size + key_length].decode('utf-8')
+            yield key, self.read_value(start)
+
+    def get_keys(self) -> DynamicArray:
+        """
+        This method returns a Dynamic Array with all the keys from the table in it.
+        """
+        return_arr = DynamicArray()
+        for key, _ in self.items():
+            return_arr.append(key)
+        return return_arr
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+    import tempfile
+    from hash_map_open_addressing import HashMap
+
+    # Write_table example 1
+    # ---------------------------
+    # 100 256 True
+    # 42 [1, 2] None True False
+    # True
+
+    print("\nWrite_table example 1")
+    print("---------------------------")
+    m = HashMap(50, fnv1a_hash)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.put('key1', [1, 2])
+    m.put('key100', 100)
+    m.remove('key100')
+
+    path = os.path.join(tempfile.mkdtemp(), 'table.bin')
+    write_table(path, m)
+    with MmapHashMap(path) as table:
+        print(table.size, table.capacity, table.table_load() < MAX_LOAD)
+        print(table.get('key42'), table.get('key1'), table.get('key100'), table.contains_key('key99'), table.contains_key('key100'))
+        print(dict(table.items()) == dict(m.items()))
+
+    # Write_table example 2
+    # ---------------------------
+    # [b'abc', None, b'']
+    # the table was written with hash function fnv1a_hash
+
+    print("\nWrite_table example 2")
+    print("---------------------------")
+    # Raw values are stored and returned as bytes, without pickling.
+    write_table(path, [('a', b'abc'), ('b', b'old'), ('b', b'')], raw=True)
+    with MmapHashMap(path) as table:
+        print(table.get_many(['a', 'c', 'b']))
+    try:
+        MmapHashMap(path, hash_function_2)
+    except ValueError as error:
+        print(error)
+    os.remove(path)
@@ -1,21 +1,33 @@
 # Author: Elliott Larsen
 # Date: 3/23/2022
-# Description: Hash Map implementation in Python.  Dynamic Array is used to store the hash table and quadratic probing is used to store values (open addressing).
+# Description: Hash Map implementation in Python.  Dynamic Array is used to store the hash table and quadratic probing is used to store values (open addressing).  Other probing strategies can be chosen from probing.py.
+
+import time
 
 from SLL_DA import *
+from stats import HashMapStats
+from hash_functions import hash_function_1, hash_function_2, hash_batch
+from snapshot import write_snapshot, load_arguments
+from probing import *
 
 class HashEntry:
     """
     Class implementing a Hash Entry.
     """
 
-    def __init__(self, key: str, value: object):
+    # Entries make up most of a hash map's memory, so they do not carry an instance __dict__.
+    __slots__ = ('key', 'value', 'hash')
+
+    # A HashEntry is always live.  Removed entries are replaced by the shared TOMBSTONE, so no per-entry flag is needed.
+    is_tombstone = False
+
+    def __init__(self, key: str, value: object, hash: int = None):
         """
-        Init an entry for use in a hash map.
+        Init an entry for use in a hash map.  The full hash value of the key is stored with the entry so that it does not have to be recomputed.
         """
         self.key = key
         self.value = value
-        self.is_tombstone = False
+        self.hash = hash
 
     def __str__(self):
         """
@@ -23,35 +35,50 @@ class HashEntry:
         """
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
 
-def hash_function_1(key: str) -> int:
+class Tombstone(HashEntry):
     """
-    Sample Hash function.
+    Class of the single shared TOMBSTONE that marks a removed entry.  Its key and hash are None, so it never matches a key while probing.
     """
-    hash = 0
-    for letter in key:
-        hash += ord(letter)
-    return hash
 
-def hash_function_2(key: str) -> int:
-    """
-    Another sample Hash function.
-    """
-    hash, index = 0, 0
-    index = 0
-    for letter in key:
-        hash += (index + 1) * ord(letter)
-        index += 1
-    return hash
+    __slots__ = ()
+
+    is_tombstone = True
+
+    def __str__(self):
+        """
+        Overrides object's string method and returns the content of the tombstone in a human-readable form.
+        """
+        return "TOMBSTONE"
+
+TOMBSTONE = Tombstone(None, None)
 
 class HashMap:
     """
-    Class implementing a Hash Map Table.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), and get_keys().
+    Class implementing a Hash Map Table.  Supported methods are: clear(), get(), put(), remove(), contains_key(), empty_buckets(), table_load(), resize_table(), get_keys(), items(), put_many(), get_many(), remove_many(), dump(), enable_stats(), and disable_stats().  from_items() builds a presized hash map from existing items and load() restores one written by dump().
     """
 
-    def __init__(self, capacity: int, function) -> None:
+    def __init__(self, capacity: int, function, max_tombstone_ratio: float = 0.25, probing: ProbingStrategy = None, incremental_resize: int = 0) -> None:
         """
-        Init a new HashMap that uses Quadratic Probing for collision resolution.
+        Init a new HashMap that uses Quadratic Probing for collision resolution, or the given probing strategy from probing.py.  Quadratic probing may not reach every bucket of the table, so a probe gives up after capacity buckets: lookups then miss and inserts grow the table.  TriangularProbing visits every bucket of its power-of-two capacity.  Once remove() leaves more than max_tombstone_ratio * capacity tombstones, the table is compacted by rehashing it at the same capacity.
+
+        If incremental_resize is a positive number, the table grows incrementally: put() only allocates the new table, and every following get(), put(), remove(), and contains_key() moves the next incremental_resize buckets of the old table into it.  Until the migration is done, keys are looked up in both tables.  With the default of 0, put() rehashes the whole table at once.
         """
+        if probing is None:
+            probing = QuadraticProbing()
+        # Some strategies only visit every bucket if the capacity is a power of two.
+        if probing.power_of_two:
+            capacity = next_power_of_two(capacity)
+
+        # Live entries stay below half of the capacity, so the ratio is kept below one half to always leave empty buckets that end a probe.
+        if not 0 < max_tombstone_ratio < 0.5:
+            raise ValueError("max_tombstone_ratio must be greater than 0 and less than 0.5")
+
+        if incremental_resize < 0:
+            raise ValueError("incremental_resize must not be negative")
+        # Robin Hood probing moves entries around on insert and remove, which the migration cursor cannot keep track of.
+        if incremental_resize and probing.robin_hood:
+            raise ValueError("incremental_resize is not supported with Robin Hood probing")
+
         # Create an empty dynamic array.
         self.buckets = DynamicArray()
 
@@ -60,155 +87,470 @@ class HashMap:
 
         self.capacity = capacity
         self.hash_function = function
+        # Number of live entries and tombstones.  Both are updated incrementally by put(), remove(), clear(), and resize_table().
         self.size = 0
+        self.tombstones = 0
+        self.max_tombstone_ratio = max_tombstone_ratio
+        self.probing = probing
+        # Table that is being migrated into self.buckets by incremental resizing, or None.  Buckets before migrate_index have already been moved.
+        self.incremental_resize = incremental_resize
+        self.old_buckets = None
+        self.old_capacity = 0
+        self.migrate_index = 0
+        # Highest probe number (0 for the initial index) at which an entry was placed since the table was allocated.  Migrated buckets of the old table become tombstones, so lookups in the old table stop after old_max_probe probes instead of searching for an empty bucket.
+        self.max_probe = 0
+        self.old_max_probe = 0
+        # HashMapStats of the hash map, or None while statistics are turned off.
+        self.stats = None
 
     def __str__(self) -> str:
         """
         Overrides object's string method returns the contents of the hash map in a human-readable form.
         """
+        self.finish_migration()
         out = ''
         for i in range(self.buckets.length()):
             out += str(i) + ': ' + str(self.buckets[i]) + '\n'
         return out
 
+    @classmethod
+    def from_items(cls, items, function, load_factor: float = 0.25, **options) -> 'HashMap':
+        """
+        This method builds a new hash map from a dict, an iterable of (key, value) pairs, or another hash map of either kind.  The capacity is chosen from the number of items so that the load factor ends up at most load_factor (which must be below 0.5), and the table is filled in a single pass without any resize.  Other keyword arguments, like probing, are passed on to HashMap().
+        """
+        if not 0 < load_factor < 0.5:
+            raise ValueError("load_factor must be greater than 0 and less than 0.5")
+
+        pairs = list(items.items() if hasattr(items, 'items') else items)
+
+        # -(-a // b) rounds the division up.
+        capacity = max(1, -(-len(pairs) // load_factor))
+        hash_map = cls(int(capacity), function, **options)
+        hash_map.put_many(pairs)
+        return hash_map
+
     def quad_prob(self, initial, iteration):
         """
-        This is a helper method for quadratic probing.  It takes an initial value and nth iteration as parameters and calculates/returns the rehashed index.
+        This is a helper method for quadratic probing.  It takes an initial value and nth iteration as parameters and calculates/returns the rehashed index.  The hash map itself probes through self.probing.
         """
         return (initial + (iteration * iteration)) % self.capacity
 
-    def calculate_size(self):
+    def robin_hood_find(self, key: str, hashed_key: int) -> int:
         """
-        This method calculates/updates the current size of the hash map.
+        This is a helper method for Robin Hood probing.  It returns the index of the bucket holding the key, or None if the key is not in the hash map.  The search stops as soon as it reaches an entry that is closer to its initial index than the key would be, since the key would have taken that bucket.
         """
-        counter = 0
+        capacity = self.capacity
+        index = hashed_key % capacity
+        distance = 0
+        bucket = self.buckets.get_at_index(index)
+
+        while bucket is not None:
+            if bucket.hash == hashed_key and bucket.key == key:
+                if self.stats is not None:
+                    self.stats.record_lookup(distance + 1, True)
+                return index
+            if (index - bucket.hash) % capacity < distance:
+                break
+            index = (index + 1) % capacity
+            distance += 1
+            bucket = self.buckets.get_at_index(index)
+
+        if self.stats is not None:
+            self.stats.record_lookup(distance + 1, False)
+        return None
+
+    def robin_hood_insert(self, entry: HashEntry) -> None:
+        """
+        This is a helper method for Robin Hood probing.  It places an entry whose key is not in the hash map yet.  Whenever the entry being placed is further from its initial index than the entry in the bucket, the two are swapped and the displaced entry is placed further on.
+        """
+        capacity = self.capacity
+        index = entry.hash % capacity
+        distance = 0
+        bucket = self.buckets.get_at_index(index)
+
+        while bucket is not None:
+            bucket_distance = (index - bucket.hash) % capacity
+            if bucket_distance < distance:
+                self.buckets.set_at_index(index, entry)
+                entry, distance = bucket, bucket_distance
+            index = (index + 1) % capacity
+            distance += 1
+            bucket = self.buckets.get_at_index(index)
+
+        self.buckets.set_at_index(index, entry)
+
+    def robin_hood_remove(self, index: int) -> None:
+        """
+        This is a helper method for Robin Hood probing.  It empties the bucket at the given index and shifts the entries that follow it back by one bucket until it reaches an empty bucket or an entry that is already at its initial index.  No tombstone is left behind.
+        """
+        capacity = self.capacity
+        next_index = (index + 1) % capacity
+        bucket = self.buckets.get_at_index(next_index)
+
+        while bucket is not None and bucket.hash % capacity != next_index:
+            self.buckets.set_at_index(index, bucket)
+            index = next_index
+            next_index = (index + 1) % capacity
+            bucket = self.buckets.get_at_index(next_index)
+
+        self.buckets.set_at_index(index, None)
+
+    def start_migration(self, new_capacity: int) -> None:
+        """
+        This is a helper method for incremental resizing.  It keeps the current table as the old table and replaces it with an empty one of the new capacity.  The entries are moved later by migrate().  A migration that is still running is finished first.
+        """
+        self.finish_migration()
+        if self.probing.power_of_two:
+            new_capacity = next_power_of_two(new_capacity)
+        if self.stats is not None:
+            started = time.perf_counter()
+
+        self.old_buckets = self.buckets
+        self.old_capacity = self.capacity
+        self.old_max_probe = self.max_probe
+        self.migrate_index = 0
+        self.max_probe = 0
+        # Allocating the list in one step keeps the pause at the start of the migration short.
+        self.buckets = DynamicArray()
+        self.buckets.data = [None] * new_capacity
+        self.capacity = new_capacity
+        # Tombstones of the old table are dropped as it is migrated, so only the new table's are counted.
+        self.tombstones = 0
+
+        # The time of the following migrate() calls is added to the resize time as well.
+        if self.stats is not None:
+            self.stats.record_resize(time.perf_counter() - started, self.old_capacity, new_capacity)
+
+    def migrate(self, count: int) -> None:
+        """
+        This is a helper method for incremental resizing.  It moves the live entries of the next count buckets of the old table into the new table, using their stored hashes.  Moved entries are replaced with the TOMBSTONE, so probes in the old table still continue past them.  The old table is released once every bucket has been moved.
+        """
+        if self.stats is not None:
+            started = time.perf_counter()
+        old = self.old_buckets.data
+        start = self.migrate_index
+        end = min(start + count, self.old_capacity)
+
+        data = self.buckets.data
+        capacity = self.capacity
+        probe = self.probing.probe
+
+        for i in range(start, end):
+            entry = old[i]
+            if entry is None or entry is TOMBSTONE:
+                continue
+
+            # The key is only ever stored in one of the two tables, so probing only needs to find an empty bucket or a tombstone.
+            initial_index = entry.hash % capacity
+            index = initial_index
+            iteration = 1
+            bucket = data[index]
+            while bucket is not None and bucket is not TOMBSTONE:
+                # With a strategy that does not visit every bucket, the probe sequence may reach no free bucket.  The rest of the migration is then done at once: the entries of both tables are rehashed into a table twice as large.
+                if iteration == capacity:
+                    self.buckets.data = data + old[i:]
+                    self.capacity = len(self.buckets.data)
+                    self.old_buckets = None
+                    self.old_capacity = 0
+                    self.migrate_index = 0
+                    self.resize_table(capacity * 2)
+                    return
+                index = probe(initial_index, iteration, entry.hash, capacity)
+                bucket = data[index]
+                iteration += 1
+
+            if bucket is TOMBSTONE:
+                self.tombstones -= 1
+            if iteration > self.max_probe + 1:
+                self.max_probe = iteration - 1
+            data[index] = entry
+            old[i] = TOMBSTONE
+
+        self.migrate_index = end
+        if end == self.old_capacity:
+            self.old_buckets = None
+            self.old_capacity = 0
+            self.migrate_index = 0
+
+        if self.stats is not None:
+            self.stats.add_resize_time(time.perf_counter() - started)
+
+    def finish_migration(self) -> None:
+        """
+        This is a helper method for incremental resizing.  It moves all remaining buckets of the old table, if there is one.  Methods that scan the whole table call it first, so they only have to look at one table.
+        """
+        if self.old_buckets is not None:
+            self.migrate(self.old_capacity)
+
+    def find_old_index(self, key: str, hashed_key: int) -> int:
+        """
+        This is a helper method for incremental resizing.  It returns the index of the bucket of the old table holding the key, or None if the key is not in the old table.
+        """
+        old = self.old_buckets.data
+        capacity = self.old_capacity
+        initial_index = hashed_key % capacity
+        index = initial_index
+        iteration = 1
+        bucket = old[index]
+
+        while bucket is not None:
+            if bucket.hash == hashed_key and bucket.key == key:
+                return index
+            # No entry of the old table lies further along the probe sequence.
+            if iteration > self.old_max_probe:
+                return None
+            index = self.probing.probe(initial_index, iteration, hashed_key, capacity)
+            bucket = old[index]
+            iteration += 1
+
+        return None
+
+    def calculate_size(self) -> bool:
+        """
+        This method recounts the live entries and tombstones by scanning the whole hash map and updates size and tombstones accordingly.  It returns True if the incrementally tracked counters were already correct.  The hash map does not call it itself; it is kept as an opt-in consistency check since it runs in O(capacity).
+        """
+        self.finish_migration()
+        counter, tombstones = 0, 0
         # Travers the hash map and count the number of elements.
         for i in range(self.capacity):
             bucket = self.buckets.get_at_index(i)
             if bucket is None:
                 continue
             # If the bucket is not empty and is not a tombstone.
-            elif bucket.is_tombstone == False:
+            elif bucket is not TOMBSTONE:
                 counter += 1
             
             else:
-                continue
+                tombstones += 1
 
+        consistent = counter == self.size and tombstones == self.tombstones
         self.size = counter
+        self.tombstones = tombstones
+
+        return consistent
 
     def clear(self) -> None:
         """
         This method clears the contents of the hash map without changing its underlying capacity.
         """
-        # Traverse the hash map and if the bucket has a value, set it to None and update the hash map's size.
+        # Traverse the hash map and if the bucket has a value (live entry or tombstone), set it to None.
         for i in range(self.capacity):
             bucket = self.buckets.get_at_index(i)
             if bucket is None:
                 continue
             else:
                 self.buckets.set_at_index(i, None)
-                self.size -= 1
+
+        # Drop the old table of a running migration.
+        self.old_buckets = None
+        self.old_capacity = 0
+        self.migrate_index = 0
+        self.max_probe = 0
+        self.size = 0
+        self.tombstones = 0
 
     def get(self, key: str) -> object:
         """
-        This method takes a key as parameter and returns its associated value.  If the key is not in the hash table, the method returns None.  Quadratic probing is used.
+        This method takes a key as parameter and returns its associated value.  If the key is not in the hash table, the method returns None.  The probing strategy of the hash map is used.
         """
         # Establish the hashed key and initial index.
         hashed_key = self.hash_function(key)
+
+        if self.probing.robin_hood:
+            index = self.robin_hood_find(key, hashed_key)
+            return None if index is None else self.buckets.get_at_index(index).value
+
+        if self.old_buckets is not None:
+            self.migrate(self.incremental_resize)
+
         initial_index = hashed_key % self.capacity
         bucket = self.buckets.get_at_index(initial_index)
 
         iteration = 1
-        rehash_index = self.quad_prob(initial_index, 0)
+        rehash_index = initial_index
 
         # Loop until either the value is found or we find an empty bucket.
         while bucket is not None:
-            # If the matching key is found and it is not a tombstone, return its value.
-            if bucket.key == key and bucket.is_tombstone is not True:
+            # If the matching key is found, return its value.  The TOMBSTONE never matches.
+            if bucket.hash == hashed_key and bucket.key == key:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
                 return bucket.value 
-            # Otherwise, keep on searching using quadratic probing.
+            # Every bucket the probe sequence can reach has been visited.
+            elif iteration == self.capacity:
+                break
+            # Otherwise, keep on searching.
             else:
-                rehash_index = self.quad_prob(initial_index, iteration)
+                rehash_index = self.probing.probe(initial_index, iteration, hashed_key, self.capacity)
                 bucket = self.buckets.get_at_index(rehash_index)
                 iteration += 1
-        
+
+        # During a migration the key may still be in the old table.  The statistics only count the probes of the new table.
+        if self.old_buckets is not None:
+            index = self.find_old_index(key, hashed_key)
+            if index is not None:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
+                return self.old_buckets.get_at_index(index).value
+
         # The key is not in the hash map.
+        if self.stats is not None:
+            self.stats.record_lookup(iteration, False)
         return None
 
     def put(self, key: str, value: object) -> None:
         """
-        This method takes a key and value as parameters and updates the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.  The table is resized to double its current capacity when the current load factor is greater than or equal to 0.5.  Quadratic probing is used.
+        This method takes a key and value as parameters and updates the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.  Otherwise the new entry takes the first tombstone found while probing, if any.  The table is resized to double its current capacity when the current load factor is greater than or equal to 0.5.  The probing strategy of the hash map is used.
         """
-        self.calculate_size()
-
-        # Check if resize_table() needs to be called.
+        # Check if resize_table() needs to be called.  In incremental mode only the new table is allocated here.
         if self.table_load() >= 0.5:
-            self.resize_table(self.capacity * 2)
+            if self.incremental_resize:
+                self.start_migration(self.capacity * 2)
+            else:
+                self.resize_table(self.capacity * 2)
 
         # Establish hashed key as well as initial index.
         hashed_key = self.hash_function(key)
-        initial_index = hashed_key % self.capacity
-        bucket = self.buckets.get_at_index(initial_index)
 
-        # If the bucket is not occupied.
-        if bucket is None:
-            self.buckets.set_at_index(initial_index, HashEntry(key, value))
-            self.size += 1
-        # If the bucket is already occupied.
-        else:
-            # If the key already exists in the hash map, replace its value.
-            if bucket.key == key:
-                self.buckets.set_at_index(initial_index, None)
-                self.buckets.set_at_index(initial_index, HashEntry(key, value))            
-            # Start quadratic probing.
+        if self.probing.robin_hood:
+            index = self.robin_hood_find(key, hashed_key)
+            if index is not None:
+                self.buckets.get_at_index(index).value = value
             else:
-                iteration = 1
-                rehash_index = self.quad_prob(initial_index, 0)
-                # Continue probing until an empty bucket is found.
-                while bucket is not None:
-                    if bucket.key == key:
-                        break
-                    # quad_prob() is a helper method for quadratic probing.
-                    rehash_index = self.quad_prob(initial_index, iteration)
-                    bucket = self.buckets.get_at_index(rehash_index)
-                    iteration += 1
-
-                self.buckets.set_at_index(rehash_index, HashEntry(key, value))
+                if self.stats is not None:
+                    self.stats.record_insert(self.buckets.get_at_index(hashed_key % self.capacity) is not None)
+                self.robin_hood_insert(HashEntry(key, value, hashed_key))
                 self.size += 1
-        
-        self.calculate_size()
+            return
+
+        if self.old_buckets is not None:
+            self.migrate(self.incremental_resize)
+
+        initial_index = hashed_key % self.capacity
+        bucket = self.buckets.get_at_index(initial_index)
+
+        iteration = 1
+        rehash_index = initial_index
+        # Index of the first tombstone on the probe sequence, if any.
+        tombstone_index = None
+
+        # Continue probing until either an empty bucket or the same key is found.  The TOMBSTONE never matches, so probing continues past it.
+        while bucket is not None:
+            # The stored hash is compared first, so the keys are only compared when the hashes match.
+            if bucket.hash == hashed_key and bucket.key == key:
+                break
+            if bucket is TOMBSTONE and tombstone_index is None:
+                tombstone_index = rehash_index
+            # Every bucket the probe sequence can reach has been visited, which only happens with strategies that do not visit every bucket.  The key is not in the table; it takes the first tombstone, or the table grows if there is none.
+            if iteration == self.capacity:
+                if tombstone_index is None:
+                    self.resize_table(self.capacity * 2)
+                    self.put(key, value)
+                    return
+                bucket = None
+                break
+            rehash_index = self.probing.probe(initial_index, iteration, hashed_key, self.capacity)
+            bucket = self.buckets.get_at_index(rehash_index)
+            iteration += 1
+
+        # If the key already exists in the hash map, replace its value.
+        if bucket is not None:
+            if self.stats is not None:
+                self.stats.record_lookup(iteration, True)
+            bucket.value = value
+            return
+
+        # During a migration the key may still be in the old table, where its value is replaced in place.
+        if self.old_buckets is not None:
+            index = self.find_old_index(key, hashed_key)
+            if index is not None:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
+                self.old_buckets.get_at_index(index).value = value
+                return
+
+        # The initial bucket held another key unless it is the reused tombstone.
+        if self.stats is not None:
+            self.stats.record_lookup(iteration, False)
+            self.stats.record_insert(iteration > 1 and tombstone_index != initial_index)
+            self.stats.record_tombstones(0, 0 if tombstone_index is None else 1)
+
+        # The empty bucket was probe number iteration - 1; a reused tombstone comes earlier on the sequence.
+        if iteration > self.max_probe + 1:
+            self.max_probe = iteration - 1
+
+        # Reuse the first tombstone on the probe sequence, so that later probes for this key stop earlier.
+        if tombstone_index is not None:
+            rehash_index = tombstone_index
+            self.tombstones -= 1
+
+        self.buckets.set_at_index(rehash_index, HashEntry(key, value, hashed_key))
+        self.size += 1
 
     def remove(self, key: str) -> None:
         """
-        This method takes a key as parameter and removes its associated value from the hash map by setting it to a tombstone. Quadratic probing is used.
+        This method takes a key as parameter and removes its associated value from the hash map by replacing its entry with the shared TOMBSTONE.  With Robin Hood probing the following entries are shifted back instead.  The probing strategy of the hash map is used.
         """
         # Establish hashed_key and initial index.
         hashed_key = self.hash_function(key)
+
+        if self.probing.robin_hood:
+            index = self.robin_hood_find(key, hashed_key)
+            if index is not None:
+                self.robin_hood_remove(index)
+                self.size -= 1
+            return
+
+        if self.old_buckets is not None:
+            self.migrate(self.incremental_resize)
+
         initial_index = hashed_key % self.capacity
         bucket = self.buckets.get_at_index(initial_index)
 
         iteration = 1
-        rehash_index = self.quad_prob(initial_index, 0)
+        rehash_index = initial_index
 
-        # Start quadratic probing.
+        # Start probing.
         while bucket is not None:
-            # If the key is found.
-            if bucket.key == key:
-                bucket.is_tombstone = True
-                break 
+            # If the key is found.  The TOMBSTONE never matches.
+            if bucket.hash == hashed_key and bucket.key == key:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
+                    self.stats.record_tombstones(1, 0)
+                self.buckets.set_at_index(rehash_index, TOMBSTONE)
+                self.size -= 1
+                self.tombstones += 1
+
+                # Compact the table once there are too many tombstones.  Rehashing at the same capacity drops all of them.
+                if self.tombstones > self.max_tombstone_ratio * self.capacity:
+                    self.resize_table(self.capacity)
+                return
+            # Every bucket the probe sequence can reach has been visited.
+            elif iteration == self.capacity:
+                break
             else:
-                # Continue with quadratic probing.
-                rehash_index = self.quad_prob(initial_index, iteration)
+                # Continue probing.
+                rehash_index = self.probing.probe(initial_index, iteration, hashed_key, self.capacity)
                 bucket = self.buckets.get_at_index(rehash_index)
                 iteration += 1
 
-        self.calculate_size()
+        # During a migration the key may still be in the old table.  Tombstones of the old table are not counted since it is dropped once migrated.
+        if self.old_buckets is not None:
+            index = self.find_old_index(key, hashed_key)
+            if index is not None:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
+                self.old_buckets.set_at_index(index, TOMBSTONE)
+                self.size -= 1
+                return
 
+        if self.stats is not None:
+            self.stats.record_lookup(iteration, False)
         return
 
     def contains_key(self, key: str) -> bool:
         """
-        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.  Quadratic probing is used.
+        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.  The probing strategy of the hash map is used.
         """
         # Empty hash map.
         if self.size == 0:
@@ -216,31 +558,49 @@ class HashMap:
 
         # Establish hashed key and initial index.
         hashed_key = self.hash_function(key)
+
+        if self.probing.robin_hood:
+            return self.robin_hood_find(key, hashed_key) is not None
+
+        if self.old_buckets is not None:
+            self.migrate(self.incremental_resize)
+
         initial_index = hashed_key % self.capacity
         bucket = self.buckets.get_at_index(initial_index)
 
         iteration = 1
-        rehash_index = self.quad_prob(initial_index, 0)
+        rehash_index = initial_index
 
         # Run the loop until either matching key value is found or an empty bucket is encountered.
         while bucket is not None:
             
-            # If the bucket's key matches the input key and it is not a tombstone.
-            if bucket.key == key and bucket.is_tombstone is not True:
+            # If the bucket's key matches the input key.  The TOMBSTONE never matches.
+            if bucket.hash == hashed_key and bucket.key == key:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
                 return True
-            # Continue with quadratic probing.
+            # Every bucket the probe sequence can reach has been visited.
+            elif iteration == self.capacity:
+                break
+            # Continue probing.
             else:
-                rehash_index = self.quad_prob(initial_index, iteration)
+                rehash_index = self.probing.probe(initial_index, iteration, hashed_key, self.capacity)
                 bucket = self.buckets.get_at_index(rehash_index)
                 iteration += 1
 
+        # During a migration the key may still be in the old table.
+        found = self.old_buckets is not None and self.find_old_index(key, hashed_key) is not None
+        if self.stats is not None:
+            self.stats.record_lookup(iteration, found)
+
         # Went through the entire hash map and did not find the key.
-        return False
+        return found
 
     def empty_buckets(self) -> int:
         """
         This method returns the number of empty buckets in the hash table.
         """
+        self.finish_migration()
         # Go through the hash map and increment the counter whenever an empty bucket is found.
         counter = 0
         for i in range(self.capacity):
@@ -263,45 +623,84 @@ class HashMap:
 
     def resize_table(self, new_capacity: int) -> None:
         """
-        Thie method takes a new capacity as parameter and changes the capacity of the internal hash map.  All existing key/value pairs are rehashed.
+        Thie method takes a new capacity as parameter and changes the capacity of the internal hash map.  All existing entries are rehashed and moved into the new table and tombstones are dropped.
         """
-        self.calculate_size()
-
         if new_capacity < 1 or new_capacity < self.size:
             return
-        
-        # Create a temporary list (linked list) to store values.
-        temp_list = LinkedList()
 
-        # Traverse the hash map backwards so that when temp_list is rehashed later, it is in the correct order (because insert() method puts the node at the beginning of the linked list).
-        for i in range(self.capacity - 1, -1, -1):
-            bucket = self.buckets.get_at_index(i)
-            if bucket is None:
-                continue
-            # If the bucket has the value and it is not a tombstone.
-            elif bucket is not None and bucket.is_tombstone is not True:
-                temp_list.insert(bucket.key, bucket.value)
-            # If the bucket has a value but it is a tombstone.
-            else:
-                continue
+        self.finish_migration()
+
+        # Choose the final capacity up front instead of checking the load factor for every entry.  Re-inserting the entries one by one would double the capacity whenever the load factor reached 0.5, so the same doubling is applied here.
+        while self.size > 0 and 2 * (self.size - 1) >= new_capacity:
+            new_capacity *= 2
+        if self.probing.power_of_two:
+            new_capacity = next_power_of_two(new_capacity)
+        if self.stats is not None:
+            started = time.perf_counter()
 
-        # Reset/clear out the hash map.
+        old_buckets = self.buckets
+        old_capacity = self.capacity
+        old_tombstones = self.tombstones
+        old_max_probe = self.max_probe
+
+        # Reset the hash map.  The new bucket array is the only allocation; existing entries are moved, not copied.
         self.buckets = DynamicArray()
         for i in range(new_capacity):
             self.buckets.append(None)
-        self.size = 0
+        self.tombstones = 0
         self.capacity = new_capacity
+        self.max_probe = 0
+
+        # Move every live entry into its new bucket.  Tombstones are dropped and self.size does not change.
+        for i in range(old_capacity):
+            entry = old_buckets.get_at_index(i)
+            if entry is None or entry is TOMBSTONE:
+                continue
 
-        # Repopulate the hash map.  Rehashing is done by put().
-        for node in temp_list:
-            self.put(node.key, node.value)
+            if self.probing.robin_hood:
+                self.robin_hood_insert(entry)
+                continue
 
-        self.calculate_size()
+            # The stored hash is used, so hash_function is not called again.
+            initial_index = entry.hash % new_capacity
+            rehash_index = initial_index
+            iteration = 1
+            # The keys are known to be distinct, so probing only needs to find an empty bucket.
+            while self.buckets.get_at_index(rehash_index) is not None:
+                # With a strategy that does not visit every bucket, the probe sequence may reach no empty bucket.  The old table is still intact, so the resize starts over at twice the capacity.
+                if iteration == new_capacity:
+                    self.buckets, self.capacity, self.tombstones, self.max_probe = old_buckets, old_capacity, old_tombstones, old_max_probe
+                    self.resize_table(new_capacity * 2)
+                    return
+                rehash_index = self.probing.probe(initial_index, iteration, entry.hash, new_capacity)
+                iteration += 1
+
+            if iteration > self.max_probe + 1:
+                self.max_probe = iteration - 1
+            self.buckets.set_at_index(rehash_index, entry)
+
+        if self.stats is not None:
+            self.stats.record_resize(time.perf_counter() - started, old_capacity, new_capacity)
+
+    def enable_stats(self) -> HashMapStats:
+        """
+        This method turns on statistics (see stats.py) and returns the HashMapStats object, which is kept in self.stats.  From then on every key operation records its probe length, and every resize and compaction its time.  Statistics that are already on are kept.
+        """
+        if self.stats is None:
+            self.stats = HashMapStats()
+        return self.stats
+
+    def disable_stats(self) -> None:
+        """
+        This method turns statistics off and drops them.
+        """
+        self.stats = None
 
     def get_keys(self) -> DynamicArray:
         """
         This method returns a Dynamic Array with all the keys from the hash map in it.
         """
+        self.finish_migration()
         return_arr = DynamicArray()
         
         # Append values to return_arr.
@@ -311,7 +710,7 @@ class HashMap:
             if bucket is None:
                 continue
             # If the bucket is occupied and it is not a tombstone.
-            elif bucket is not None and bucket.is_tombstone is False:
+            elif bucket is not TOMBSTONE:
                 return_arr.append(bucket.key)
             # The bucket is occupied but it is a tombstone.
             else:
@@ -319,6 +718,218 @@ class HashMap:
 
         return return_arr
 
+    def items(self):
+        """
+        This method is a generator that yields every (key, value) pair stored in the hash map.
+        """
+        self.finish_migration()
+        for i in range(self.capacity):
+            bucket = self.buckets.get_at_index(i)
+            if bucket is not None and bucket is not TOMBSTONE:
+                yield bucket.key, bucket.value
+
+    def dump(self, file, keep_hashes: bool = False) -> None:
+        """
+        This method writes the hash map to a binary file object as a compact snapshot: the capacity, the name of the hash function, and a length-prefixed record per entry with the key and the pickled value.  If keep_hashes is True, the stored hash of every entry is written too, so that load() does not have to hash the keys again.
+        """
+        self.finish_migration()
+        entries = ((entry.key, entry.value, entry.hash) for entry in self.buckets.data if entry is not None and entry is not TOMBSTONE)
+        write_snapshot(file, self.capacity, self.hash_function, self.size, entries, keep_hashes)
+
+    @classmethod
+    def load(cls, file, function=None, **options) -> 'HashMap':
+        """
+        This method reads a snapshot written by dump() from a binary file object and returns a new hash map with the snapshot's capacity, filled in a single pass.  If function is None, the hash function is found by its name (Python's hash() or a function of hash_functions.py).  Stored hashes are used if the snapshot has them and was made with the same hash function, except for hash() and builtin_hash() whose values change between processes.  Other keyword arguments are passed on to HashMap().
+        """
+        capacity, function, pairs, hashes = load_arguments(file, function)
+        hash_map = cls(capacity, function, **options)
+        hash_map.put_many(pairs, hashes)
+        return hash_map
+
+    def put_many(self, pairs, hashes: list = None) -> None:
+        """
+        This method takes an iterable of (key, value) pairs and puts all of them into the hash map.  The table is resized at most once up front for the whole batch and all keys are hashed in one pass, so there is no load check per key.  The result is the same as calling put() for each pair in order.  If hashes is given, it holds the hash value of every key, such as the hashes stored by dump(), and the keys are not hashed again.
+        """
+        pairs = list(pairs)
+        if not pairs:
+            return
+
+        # The batch works on a single table.
+        self.finish_migration()
+
+        # Presize the table as if every key were new, using the same doubling rule as put().
+        new_capacity = self.capacity
+        while 2 * (self.size + len(pairs) - 1) >= new_capacity:
+            new_capacity *= 2
+        if new_capacity != self.capacity:
+            self.resize_table(new_capacity)
+
+        # Hash all keys in one pass, vectorized if possible.
+        if hashes is None:
+            hashes, indices = hash_batch([key for key, _ in pairs], self.hash_function, self.capacity)
+        else:
+            indices = [hashed % self.capacity for hashed in hashes]
+
+        if self.probing.robin_hood:
+            for (key, value), hashed_key in zip(pairs, hashes):
+                index = self.robin_hood_find(key, hashed_key)
+                if index is not None:
+                    self.buckets.get_at_index(index).value = value
+                else:
+                    if self.stats is not None:
+                        self.stats.record_insert(self.buckets.get_at_index(hashed_key % self.capacity) is not None)
+                    self.robin_hood_insert(HashEntry(key, value, hashed_key))
+                    self.size += 1
+            return
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        capacity = self.capacity
+        probe = self.probing.probe
+        size, tombstones, max_probe = self.size, self.tombstones, self.max_probe
+        stats = self.stats
+
+        for position, ((key, value), hashed_key, initial_index) in enumerate(zip(pairs, hashes, indices)):
+            index = initial_index
+            bucket = data[index]
+            iteration = 1
+            tombstone_index = None
+
+            # Same probing as put().
+            while bucket is not None:
+                if bucket.hash == hashed_key and bucket.key == key:
+                    break
+                if bucket is TOMBSTONE and tombstone_index is None:
+                    tombstone_index = index
+                if iteration == capacity:
+                    # As in put(), grow the table if the probe sequence reaches no free bucket, and put the rest of the batch into the new one.
+                    if tombstone_index is None:
+                        self.size, self.tombstones, self.max_probe = size, tombstones, max_probe
+                        self.resize_table(capacity * 2)
+                        self.put_many(pairs[position:], hashes[position:])
+                        return
+                    bucket = None
+                    break
+                index = probe(initial_index, iteration, hashed_key, capacity)
+                bucket = data[index]
+                iteration += 1
+
+            if stats is not None:
+                stats.record_lookup(iteration, bucket is not None)
+                if bucket is None:
+                    stats.record_insert(iteration > 1 and tombstone_index != initial_index)
+                    stats.record_tombstones(0, 0 if tombstone_index is None else 1)
+
+            if bucket is not None:
+                bucket.value = value
+                continue
+
+            if iteration > max_probe + 1:
+                max_probe = iteration - 1
+            if tombstone_index is not None:
+                index = tombstone_index
+                tombstones -= 1
+
+            data[index] = HashEntry(key, value, hashed_key)
+            size += 1
+
+        self.size, self.tombstones, self.max_probe = size, tombstones, max_probe
+
+    def get_many(self, keys) -> list:
+        """
+        This method takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the hash map.  All keys are hashed in one pass (see hash_functions.hash_batch()).  It mostly saves the method call per key, so it is only slightly faster than calling get() for each key (see benchmark_batch() in benchmark.py).
+        """
+        # Hash all keys in one pass, vectorized if possible.  The batch works on a single table.
+        self.finish_migration()
+        keys = list(keys)
+        hashes, indices = hash_batch(keys, self.hash_function, self.capacity)
+
+        if self.probing.robin_hood:
+            values = []
+            for key, hashed_key in zip(keys, hashes):
+                index = self.robin_hood_find(key, hashed_key)
+                values.append(None if index is None else self.buckets.get_at_index(index).value)
+            return values
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        capacity = self.capacity
+        probe = self.probing.probe
+        stats = self.stats
+        values = []
+
+        for key, hashed_key, initial_index in zip(keys, hashes, indices):
+            bucket = data[initial_index]
+            iteration = 1
+
+            # Same probing as get().
+            while bucket is not None and not (bucket.hash == hashed_key and bucket.key == key):
+                if iteration == capacity:
+                    bucket = None
+                    break
+                bucket = data[probe(initial_index, iteration, hashed_key, capacity)]
+                iteration += 1
+
+            if stats is not None:
+                stats.record_lookup(iteration, bucket is not None)
+
+            values.append(None if bucket is None else bucket.value)
+
+        return values
+
+    def remove_many(self, keys) -> None:
+        """
+        This method takes an iterable of keys and removes each of them from the hash map.  Keys that are not in the hash map are ignored.  All keys are hashed in one pass and the tombstone compaction check runs once at the end of the batch.
+        """
+        # Hash all keys in one pass, vectorized if possible.  The batch works on a single table.
+        self.finish_migration()
+        keys = list(keys)
+        hashes, indices = hash_batch(keys, self.hash_function, self.capacity)
+
+        if self.probing.robin_hood:
+            for key, hashed_key in zip(keys, hashes):
+                index = self.robin_hood_find(key, hashed_key)
+                if index is not None:
+                    self.robin_hood_remove(index)
+                    self.size -= 1
+            return
+
+        # Work on the underlying list directly to skip the DynamicArray bounds checks.
+        data = self.buckets.data
+        capacity = self.capacity
+        probe = self.probing.probe
+        stats = self.stats
+        removed = 0
+
+        for key, hashed_key, initial_index in zip(keys, hashes, indices):
+            index = initial_index
+            bucket = data[index]
+            iteration = 1
+
+            # Same probing as remove().
+            while bucket is not None:
+                if bucket.hash == hashed_key and bucket.key == key:
+                    data[index] = TOMBSTONE
+                    removed += 1
+                    break
+                if iteration == capacity:
+                    bucket = None
+                    break
+                index = probe(initial_index, iteration, hashed_key, capacity)
+                bucket = data[index]
+                iteration += 1
+
+            if stats is not None:
+                stats.record_lookup(iteration, bucket is not None)
+
+        # Removing only turns live entries into tombstones, so the number of empty buckets is unchanged and compaction can wait until the end.
+        self.size -= removed
+        self.tombstones += removed
+        if stats is not None:
+            stats.record_tombstones(removed, 0)
+        if self.tombstones > self.max_tombstone_ratio * self.capacity:
+            self.resize_table(self.capacity)
+
 #--------
 # Tests 
 #--------
@@ -628,3 +1239,133 @@ if __name__ == "__main__":
     m.remove('100')
     m.resize_table(2)
     print(m.get_keys())
+
+    # Tombstone example 1
+    # -------------------------
+    # 40 0 100
+    # 15 25 100
+    # 14 0 100
+    # 13 1 100
+    # 40 0 100
+
+    print("\nTombstone example 1")
+    print("-------------------------")
+    m = HashMap(100, hash_function_2)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    print(m.size, m.tombstones, m.capacity)
+    for i in range(25):
+        m.remove('key' + str(i))
+    print(m.size, m.tombstones, m.capacity)
+    # The 26th tombstone exceeds 0.25 * capacity and compacts the table.
+    m.remove('key25')
+    print(m.size, m.tombstones, m.capacity)
+    m.remove('key26')
+    print(m.size, m.tombstones, m.capacity)
+    # Re-inserting reuses tombstones.
+    for i in range(27):
+        m.put('key' + str(i), i)
+    print(m.size, m.tombstones, m.capacity)
+
+    # From_items example 1
+    # --------------------------
+    # 100 400 0.25
+    # 101 400 42
+    # [('a', 1), ('b', 2)]
+
+    print("\nFrom_items example 1")
+    print("--------------------------")
+    m = HashMap.from_items({'key' + str(i): i for i in range(100)}, hash_function_2)
+    print(m.size, m.capacity, m.table_load())
+    m.put('key100', 100)
+    print(m.size, m.capacity, m.get('key42'))
+    m = HashMap.from_items([('a', 1), ('b', 2)], hash_function_1)
+    print(sorted(m.items()))
+
+    # Incremental resize example 1
+    # ----------------------------------
+    # 5 10 False
+    # 6 20 True
+    # 7 20 True
+    # 8 20 False
+    # 9 20 False
+    # 12 40 True
+    # 0 True 12 40 False
+
+    print("\nIncremental resize example 1")
+    print("----------------------------------")
+    m = HashMap(10, hash_function_1, incremental_resize=4)
+    # The 6th put() starts the migration of the 10 old buckets, which takes three operations.
+    for i in range(9):
+        m.put('key' + str(i), i)
+        if i >= 4:
+            print(m.size, m.capacity, m.old_buckets is not None)
+    for i in range(9, 12):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity, m.old_buckets is not None)
+    # Lookups check both tables, and get_keys() finishes the migration first.
+    print(m.get('key0'), m.contains_key('key11'), m.get_keys().length(), m.capacity, m.old_buckets is not None)
+
+    # Dump example 1
+    # --------------------
+    # True 100 400 hash_function_2
+    # [1, 2] None
+
+    print("\nDump example 1")
+    print("--------------------")
+    import io
+    m = HashMap(50, hash_function_2)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.put('key1', [1, 2])
+    file = io.BytesIO()
+    m.dump(file, keep_hashes=True)
+    file.seek(0)
+    loaded = HashMap.load(file)
+    print(sorted(loaded.items()) == sorted(m.items()), loaded.size, loaded.capacity, loaded.hash_function.__name__)
+    print(loaded.get('key1'), loaded.get('key100'))
+
+    # Stats example 1
+    # ---------------------
+    # 2 0
+    # 100 120 1 0
+    # 51 0 1
+    # True True
+
+    print("\nStats example 1")
+    print("---------------------")
+    m = HashMap(50, hash_function_2)
+    stats = m.enable_stats()
+    for i in range(100):
+        m.put('key' + str(i), i)
+    print(stats.resizes, stats.compactions)
+    for i in range(100):
+        m.get('key' + str(i))
+    for i in range(20):
+        m.get('missing' + str(i))
+    # Inserting a new key counts as a miss.
+    report = stats.report(m)
+    print(report['hits']['count'], report['misses']['count'], report['hits']['p50'], report['tombstones'])
+    # Removing a quarter of the capacity compacts the table, which drops the tombstones.
+    for i in range(51):
+        m.remove('key' + str(i))
+    report = stats.report(m)
+    print(report['tombstones_created'], report['tombstones'], report['compactions'])
+    print(report['hits']['max'] >= report['hits']['p99'], report['resize_seconds'] > 0)
+
+    # Probe limit example 1
+    # ---------------------------
+    # None False 4 16
+    # cab cba 6 32
+
+    print("\nProbe limit example 1")
+    print("---------------------------")
+    # Anagrams share a hash_function_1 value, and quadratic probing only reaches 4 of the 16 buckets from their initial index.
+    m = HashMap(16, hash_function_1)
+    for key in ('abc', 'acb', 'bac', 'bca'):
+        m.put(key, key)
+    print(m.get('cab'), m.contains_key('cab'), m.size, m.capacity)
+    # The probe sequence of a new anagram has no free bucket, so the table grows.
+    m.put('cab', 'cab')
+    m.put('cba', 'cba')
+    print(m.get('cab'), m.get('cba'), m.size, m.capacity)
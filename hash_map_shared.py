@@ -0,0 +1,406 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Open addressing Hash Map that lives in a multiprocessing.shared_memory block, so several processes can read the same map without pickling it into each of them.  Writers are serialized by a multiprocessing lock and readers use a seqlock, so they never block.
+
+import pickle
+import struct
+from multiprocessing import Lock
+from multiprocessing.shared_memory import SharedMemory
+
+from SLL_DA import DynamicArray
+from hash_functions import fnv1a_hash, hash_batch
+from probing import next_power_of_two
+
+# Header: magic, number of slots, arena size, size, tombstones, bytes of the arena in use, and the seqlock version.
+HEADER = struct.Struct('<8sQQQQQQ')
+MAGIC = b'SHMHMAP1'
+VERSION_OFFSET = HEADER.size - 8
+
+# Slot: state, full hash value, and the arena offsets of the key and value records.
+SLOT = struct.Struct('<QQQQ')
+
+# Arena record: the length of the bytes that follow.
+RECORD = struct.Struct('<I')
+
+# Slot states.
+EMPTY = 0
+LIVE = 1
+TOMBSTONE = 2
+
+# Live entries are kept at or below this load factor.  Linear probing is used, which reads neighboring slots of the same cache lines.
+MAX_LOAD = 0.5
+
+
+class SharedHashMapException(Exception):
+    pass
+
+
+class SharedHashMap:
+    """
+    Class implementing a Hash Map Table in shared memory.  Supported methods are: clear(), get(), put(), remove(), contains_key(), table_load(), get_keys(), items(), put_many(), close(), and unlink().  attach() opens a map created by another process.
+
+    The block holds a header, a power-of-two array of fixed-size slots, and an arena.  Keys are stored in the arena as UTF-8 and values are pickled.  The arena is append-only: overwriting or removing an entry does not free its records, and SharedHashMapException is raised once the arena or the slots run out.  The table does not grow, since every process would have to map a new block.
+
+    The hash function must give the same value in every process, so the default is fnv1a_hash() and Python's built-in hash() must not be used.
+    """
+
+    def __init__(self, max_entries: int, arena_size: int, function=fnv1a_hash, name: str = None, lock=None) -> None:
+        """
+        Init a new SharedHashMap in a new shared memory block with room for max_entries entries and arena_size bytes of keys and values.  The block is named name, or gets a random name.  Writers in all processes must use the same lock, which is created if not given.
+        """
+        if max_entries < 1 or arena_size < 1:
+            raise ValueError("max_entries and arena_size must be at least 1")
+
+        capacity = next_power_of_two(-(-max_entries // MAX_LOAD))
+        arena_offset = HEADER.size + capacity * SLOT.size
+        # A new block is zero-filled, so every slot starts out EMPTY.
+        memory = SharedMemory(name, create=True, size=int(arena_offset + arena_size))
+        HEADER.pack_into(memory.buf, 0, MAGIC, int(capacity), arena_size, 0, 0, 0, 0)
+        self.open(memory, function, Lock() if lock is None else lock)
+
+    @classmethod
+    def attach(cls, name: str, lock, function=fnv1a_hash) -> 'SharedHashMap':
+        """
+        This method opens the SharedHashMap in the shared memory block with the given name without copying it.  lock must be the lock of the map's writers; processes that only read never take it.
+        """
+        hash_map = cls.__new__(cls)
+        hash_map.open(SharedMemory(name), function, lock)
+        return hash_map
+
+    def open(self, memory: SharedMemory, function, lock) -> None:
+        """
+        This is a helper method that sets up the attributes of a hash map in the given block.
+        """
+        magic, capacity, arena_size, _, _, _, _ = HEADER.unpack_from(memory.buf, 0)
+        if magic != MAGIC:
+            raise SharedHashMapException("not a SharedHashMap block")
+
+        self.memory = memory
+        self.buf = memory.buf
+        self.capacity = capacity
+        self.mask = capacity - 1
+        self.arena_offset = HEADER.size + capacity * SLOT.size
+        self.arena_size = arena_size
+        self.hash_function = function
+        self.lock = lock
+
+    def __reduce__(self):
+        """
+        A SharedHashMap is pickled as its block name, so passing it to another process attaches to the same map instead of copying it.
+        """
+        return (SharedHashMap.attach, (self.memory.name, self.lock, self.hash_function))
+
+    @property
+    def name(self) -> str:
+        """
+        Name of the shared memory block, used by attach().
+        """
+        return self.memory.name
+
+    @property
+    def size(self) -> int:
+        """
+        Number of live entries.
+        """
+        return HEADER.unpack_from(self.buf, 0)[3]
+
+    def close(self) -> None:
+        """
+        This method detaches this process from the block.  The map can not be used afterwards.
+        """
+        self.buf = None
+        self.memory.close()
+
+    def unlink(self) -> None:
+        """
+        This method frees the block once every process has closed it.  It should be called once, by the process that created the map.
+        """
+        self.memory.unlink()
+
+    def version(self) -> int:
+        """
+        This is a helper method that returns the seqlock version.  It is odd while a writer is modifying the map.
+        """
+        return struct.unpack_from('<Q', self.buf, VERSION_OFFSET)[0]
+
+    def begin_write(self) -> list:
+        """
+        This is a helper method for writers, which must hold the lock.  It makes the version odd, so readers retry, and returns the mutable header fields [size, tombstones, arena_used].
+        """
+        header = HEADER.unpack_from(self.buf, 0)
+        struct.pack_into('<Q', self.buf, VERSION_OFFSET, header[6] + 1)
+        return list(header[3:6])
+
+    def end_write(self, fields: list) -> None:
+        """
+        This is a helper method for writers.  It stores the header fields and makes the version even again.
+        """
+        struct.pack_into('<QQQ', self.buf, HEADER.size - 32, *fields)
+        struct.pack_into('<Q', self.buf, VERSION_OFFSET, self.version() + 1)
+
+    def append_record(self, data: bytes, fields: list) -> int:
+        """
+        This is a helper method for writers.  It appends a length-prefixed record to the arena and returns its offset.
+        """
+        offset = fields[2]
+        end = offset + RECORD.size + len(data)
+        if end > self.arena_size:
+            raise SharedHashMapException("arena is full")
+
+        start = self.arena_offset + offset
+        RECORD.pack_into(self.buf, start, len(data))
+        self.buf[start + RECORD.size:self.arena_offset + end] = data
+        fields[2] = end
+        return offset
+
+    def read_record(self, offset: int) -> bytes:
+        """
+        This is a helper method that returns the bytes of the arena record at the given offset.
+        """
+        start = self.arena_offset + offset
+        length = RECORD.unpack_from(self.buf, start)[0]
+        start += RECORD.size
+        return bytes(self.buf[start:start + length])
+
+    def find_slot(self, key: bytes, hashed_key: int, reuse: bool = False) -> int:
+        """
+        This is a helper method that returns the index of the live slot holding the encoded key, or -1 if the key is not in the hash map.  If reuse is True, a missing key instead returns the complement of the slot it should be stored in (the first tombstone or the empty slot), which is negative.
+        """
+        buf = self.buf
+        index = hashed_key & self.mask
+        tombstone_index = -1
+
+        # Linear probing until either the key or an empty slot is found.
+        while True:
+            state, slot_hash, key_offset, _ = SLOT.unpack_from(buf, HEADER.size + index * SLOT.size)
+            if state == EMPTY:
+                if not reuse:
+                    return -1
+                return ~(index if tombstone_index < 0 else tombstone_index)
+            if state == LIVE:
+                if slot_hash == hashed_key and self.read_record(key_offset) == key:
+                    return index
+            elif tombstone_index < 0:
+                tombstone_index = index
+            index = (index + 1) & self.mask
+
+    def read(self, function, *args):
+        """
+        This is a helper method for readers.  It calls function(*args) until it runs without a writer modifying the map at the same time, and returns its result.  Readers never take the lock.
+        """
+        while True:
+            version = self.version()
+            if version & 1:
+                continue
+            try:
+                result = function(*args)
+            except Exception:
+                # A torn read can send the lookup anywhere; it only counts if the map did not change.
+                if self.version() == version:
+                    raise
+                continue
+            if self.version() == version:
+                return result
+
+    def lookup(self, key: bytes, hashed_key: int) -> bytes:
+        """
+        This is a helper method for get().  It returns the pickled value of the key, or None if the key is not in the hash map.
+        """
+        index = self.find_slot(key, hashed_key)
+        if index < 0:
+            return None
+        return self.read_record(SLOT.unpack_from(self.buf, HEADER.size + index * SLOT.size)[3])
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value.  If the key is not in the hash table, the method returns None.
+        """
+        data = self.read(self.lookup, key.encode('utf-8'), self.hash_function(key))
+        return None if data is None else pickle.loads(data)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.
+        """
+        return self.read(self.find_slot, key.encode('utf-8'), self.hash_function(key)) >= 0
+
+    def store(self, key: str, value: object, hashed_key: int, fields: list) -> None:
+        """
+        This is a helper method for put() and put_many(), which hold the lock and have called begin_write().  It stores one entry.
+        """
+        encoded = key.encode('utf-8')
+        index = self.find_slot(encoded, hashed_key, reuse=True)
+
+        # The key already exists, point its slot at the new value.
+        if index >= 0:
+            value_offset = self.append_record(pickle.dumps(value), fields)
+            struct.pack_into('<Q', self.buf, HEADER.size + index * SLOT.size + 24, value_offset)
+            return
+
+        if fields[0] + 1 > self.capacity * MAX_LOAD:
+            raise SharedHashMapException("hash map is full")
+
+        value_offset = self.append_record(pickle.dumps(value), fields)
+        index = ~index
+        if SLOT.unpack_from(self.buf, HEADER.size + index * SLOT.size)[0] == TOMBSTONE:
+            fields[1] -= 1
+        key_offset = self.append_record(encoded, fields)
+        SLOT.pack_into(self.buf, HEADER.size + index * SLOT.size, LIVE, hashed_key, key_offset, value_offset)
+        fields[0] += 1
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and updates the hash map.  If the given key already exists in the hash map, its associated value is replaced with the new value.  Otherwise the new entry takes the first tombstone found while probing, if any.
+        """
+        with self.lock:
+            fields = self.begin_write()
+            try:
+                self.store(key, value, self.hash_function(key), fields)
+            finally:
+                self.end_write(fields)
+
+    def put_many(self, pairs) -> None:
+        """
+        This method takes an iterable of (key, value) pairs and puts all of them into the hash map.  All keys are hashed in one pass (see hash_functions.hash_batch()), and the lock is taken once for the whole batch, so readers retry until the batch is done.
+        """
+        pairs = list(pairs)
+        hashes, _ = hash_batch([key for key, _ in pairs], self.hash_function, self.capacity)
+        with self.lock:
+            fields = self.begin_write()
+            try:
+                for (key, value), hashed_key in zip(pairs, hashes):
+                    self.store(key, value, hashed_key, fields)
+            finally:
+                self.end_write(fields)
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its associated value from the hash map by marking its slot as a tombstone.  Once tombstones take up a quarter of the slots, the slots are rehashed in place.
+        """
+        with self.lock:
+            fields = self.begin_write()
+            try:
+                index = self.find_slot(key.encode('utf-8'), self.hash_function(key))
+                if index >= 0:
+                    struct.pack_into('<Q', self.buf, HEADER.size + index * SLOT.size, TOMBSTONE)
+                    fields[0] -= 1
+                    fields[1] += 1
+                    if fields[1] > self.capacity // 4:
+                        self.compact(fields)
+            finally:
+                self.end_write(fields)
+
+    def compact(self, fields: list) -> None:
+        """
+        This is a helper method for remove().  It empties the slot array and places every live slot again using its stored hash, which drops the tombstones.  The arena is left as it is.
+        """
+        live = []
+        for index in range(self.capacity):
+            slot = SLOT.unpack_from(self.buf, HEADER.size + index * SLOT.size)
+            if slot[0] == LIVE:
+                live.append(slot)
+
+        self.buf[HEADER.size:self.arena_offset] = bytes(self.arena_offset - HEADER.size)
+        for slot in live:
+            index = slot[1] & self.mask
+            while SLOT.unpack_from(self.buf, HEADER.size + index * SLOT.size)[0] != EMPTY:
+                index = (index + 1) & self.mask
+            SLOT.pack_into(self.buf, HEADER.size + index * SLOT.size, *slot)
+        fields[1] = 0
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map, including its arena, without changing its capacity.
+        """
+        with self.lock:
+            self.begin_write()
+            self.buf[HEADER.size:self.arena_offset] = bytes(self.arena_offset - HEADER.size)
+            self.end_write([0, 0, 0])
+
+    def table_load(self) -> float:
+        """
+        This method calculates and returns the current hash table load factor.
+        """
+        return self.size / self.capacity
+
+    def items(self) -> list:
+        """
+        This method returns a list of every (key, value) pair stored in the hash map, read as one consistent snapshot.
+        """
+        pairs = self.read(self.read_items)
+        return [(key.decode('utf-8'), pickle.loads(value)) for key, value in pairs]
+
+    def read_items(self) -> list:
+        """
+        This is a helper method for items().  It returns the encoded key and pickled value of every live slot.
+        """
+        pairs = []
+        for index in range(self.capacity):
+            state, _, key_offset, value_offset = SLOT.unpack_from(self.buf, HEADER.size + index * SLOT.size)
+            if state == LIVE:
+                pairs.append((self.read_record(key_offset), self.read_record(value_offset)))
+        return pairs
+
+    def get_keys(self) -> DynamicArray:
+        """
+        This method returns a Dynamic Array with all the keys from the hash map in it.
+        """
+        return_arr = DynamicArray()
+        for key, _ in self.items():
+            return_arr.append(key)
+        return return_arr
+
+#--------
+# Tests
+#--------
+
+def count_hits(hash_map: 'SharedHashMap', keys: list, results) -> None:
+    """
+    Reader process of the tests below: counts the keys whose value is their own index.
+    """
+    results.put(sum(1 for i, key in enumerate(keys) if hash_map.get(key) == i))
+    hash_map.close()
+
+
+if __name__ == "__main__":
+    from multiprocessing import Process, Queue
+
+    # Put example 1
+    # -------------------
+    # 3 64 None
+    # [1, 2] 3 True False
+    # 2 True
+
+    print("\nPut example 1")
+    print("-------------------")
+    m = SharedHashMap(20, 4096)
+    m.put('key1', 10)
+    m.put('key2', [1, 2])
+    m.put('key3', 'value')
+    print(m.size, m.capacity, m.get('key4'))
+    m.remove('key1')
+    m.put('key3', 3)
+    print(m.get('key2'), m.get('key3'), m.contains_key('key2'), m.contains_key('key1'))
+    print(m.size, sorted(m.get_keys().data) == ['key2', 'key3'])
+    m.close()
+    m.unlink()
+
+    # Process example 1
+    # -----------------------
+    # [1000, 1000, 1000, 1000]
+
+    print("\nProcess example 1")
+    print("-----------------------")
+    # The map is passed to the reader processes by name; they attach to the same block.
+    m = SharedHashMap(1000, 1 << 20)
+    keys = ['key' + str(i) for i in range(1000)]
+    m.put_many((key, i) for i, key in enumerate(keys))
+    results = Queue()
+    readers = [Process(target=count_hits, args=(m, keys, results)) for _ in range(4)]
+    for reader in readers:
+        reader.start()
+    print([results.get() for _ in readers])
+    for reader in readers:
+        reader.join()
+    m.close()
+    m.unlink()
@@ -0,0 +1,496 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Open addressing Hash Map whose entries can expire.  Expired entries are reclaimed lazily when get() or contains_key() finds them, and by an incremental sweep that examines a bounded number of buckets at a time, so expiry never scans the whole table at once.
+
+import time
+
+from SLL_DA import *
+from hash_map_open_addressing import HashMap, HashEntry, TOMBSTONE
+from hash_functions import hash_function_1, hash_function_2
+from snapshot import write_snapshot, load_arguments
+
+
+class ExpiringEntry(HashEntry):
+    """
+    Class implementing a Hash Entry with an expiry time.  expires is a time of the hash map's clock, or None for an entry that never expires.
+    """
+
+    __slots__ = ('expires',)
+
+    def __init__(self, key: str, value: object, hash: int = None, expires: float = None):
+        """
+        Init an entry that expires at the given time.
+        """
+        super().__init__(key, value, hash)
+        self.expires = expires
+
+    def __str__(self):
+        """
+        Overrides object's string method and returns the content of the entry in a human-readable form.
+        """
+        return f"K: {self.key} V: {self.value} EX: {self.expires}"
+
+
+class TTLHashMap(HashMap):
+    """
+    Class implementing an open addressing Hash Map with a time-to-live per entry.  It supports the methods of the open addressing HashMap, put() and put_many() take a ttl in seconds, sweep() reclaims expired entries incrementally, and dump() and load() keep the time each entry has left to live.
+
+    An entry that has expired is never returned, but it keeps its bucket until it is reclaimed: by get() or contains_key() when they find it, by sweep(), which every put() calls for sweep_step buckets, or by the next resize.  size counts the entries that have not been reclaimed yet.
+    """
+
+    def __init__(self, capacity: int, function, default_ttl: float = None, sweep_step: int = 4, clock=time.monotonic, **options) -> None:
+        """
+        Init a new empty TTLHashMap.  Entries put without a ttl live for default_ttl seconds, or forever if it is None.  clock returns the current time in seconds.  Other keyword arguments, like probing and incremental_resize, are passed on to HashMap().  With incremental_resize, compacting the tombstones left by expired entries is incremental as well.
+        """
+        if sweep_step < 0:
+            raise ValueError("sweep_step must not be negative")
+        super().__init__(capacity, function, **options)
+
+        self.default_ttl = default_ttl
+        self.sweep_step = sweep_step
+        self.clock = clock
+        # Next bucket for sweep() to examine, and the number of expired entries reclaimed so far.
+        self.sweep_index = 0
+        self.expired = 0
+
+    def locate(self, key: str, hashed_key: int) -> tuple:
+        """
+        This is a helper method for probing strategies other than Robin Hood.  It returns the index of the bucket of the current table holding the key, or None, the index of the bucket a new entry for the key would go to: the first tombstone on the probe sequence, or else the empty bucket that ended it, or None if the probe gave up after capacity buckets without finding either, and the number of buckets probed.
+        """
+        data = self.buckets.data
+        capacity = self.capacity
+        probe = self.probing.probe
+        initial_index = hashed_key % capacity
+        index = initial_index
+        bucket = data[index]
+        iteration = 1
+        tombstone_index = None
+
+        while bucket is not None:
+            if bucket.hash == hashed_key and bucket.key == key:
+                if self.stats is not None:
+                    self.stats.record_lookup(iteration, True)
+                return index, index, iteration
+            if bucket is TOMBSTONE and tombstone_index is None:
+                tombstone_index = index
+            # Every bucket the probe sequence can reach has been visited, which only happens with strategies that do not visit every bucket.  The key is not in the table.
+            if iteration == capacity:
+                break
+            index = probe(initial_index, iteration, hashed_key, capacity)
+            bucket = data[index]
+            iteration += 1
+
+        if self.stats is not None:
+            self.stats.record_lookup(iteration, False)
+        if tombstone_index is not None:
+            return None, tombstone_index, iteration
+        return None, index if bucket is None else None, iteration
+
+    def find(self, key: str, hashed_key: int) -> tuple:
+        """
+        This is a helper method that returns the Dynamic Array and the index of the bucket holding the key, expired or not, or (None, None) if the key is not in the hash map.  During an incremental resize the key may still be in the old table.
+        """
+        if self.probing.robin_hood:
+            index = self.robin_hood_find(key, hashed_key)
+            return (None, None) if index is None else (self.buckets, index)
+
+        if self.old_buckets is not None:
+            self.migrate(self.incremental_resize)
+        index = self.locate(key, hashed_key)[0]
+        if index is not None:
+            return self.buckets, index
+        if self.old_buckets is not None:
+            index = self.find_old_index(key, hashed_key)
+            if index is not None:
+                return self.old_buckets, index
+        return None, None
+
+    def is_expired(self, entry: HashEntry, now: float) -> bool:
+        """
+        This is a helper method that returns True if the given live entry has expired at time now.
+        """
+        return entry.expires is not None and entry.expires <= now
+
+    def expire(self, buckets: DynamicArray, index: int) -> None:
+        """
+        This is a helper method that reclaims the expired entry at the given index of the current or the old table like remove() does: it becomes a tombstone, or with Robin Hood probing the following entries are shifted back.  It does not compact the table.
+        """
+        created = 0
+        if buckets is not self.buckets:
+            # migrate() skips the TOMBSTONE, and tombstones of the old table are not counted.
+            buckets.set_at_index(index, TOMBSTONE)
+        elif self.probing.robin_hood:
+            self.robin_hood_remove(index)
+        else:
+            buckets.set_at_index(index, TOMBSTONE)
+            self.tombstones += 1
+            created = 1
+        self.size -= 1
+        self.expired += 1
+        if self.stats is not None:
+            self.stats.record_tombstones(created, 0)
+
+    def drop_expired(self) -> None:
+        """
+        This is a helper method that replaces every expired entry of the current table with the TOMBSTONE, without compacting the table.  It visits every bucket, so it is only called before the table is rehashed anyway.
+        """
+        now = self.clock()
+        data = self.buckets.data
+        for index, entry in enumerate(data):
+            if entry is not None and entry is not TOMBSTONE and entry.expires is not None and entry.expires <= now:
+                data[index] = TOMBSTONE
+                self.tombstones += 1
+                self.size -= 1
+                self.expired += 1
+
+    def compact(self) -> None:
+        """
+        This is a helper method that rehashes the table at the same capacity once there are too many tombstones, like remove() does.  With incremental_resize the entries are migrated into the new table a few buckets per operation instead.
+        """
+        if self.tombstones <= self.max_tombstone_ratio * self.capacity:
+            return
+        if not self.incremental_resize:
+            self.resize_table(self.capacity)
+        elif self.old_buckets is None:
+            self.start_migration(self.capacity)
+
+    def grow(self) -> None:
+        """
+        This is a helper method that put() calls once the load factor reaches 0.5.  Entries that expired without being looked up again would otherwise make the table double over and over, so the expired entries are dropped first, and if that leaves the table at most a quarter full it is only compacted.  With incremental_resize the table always doubles, and migrate() drops the expired entries as it moves the old table.
+        """
+        if self.incremental_resize:
+            self.start_migration(self.capacity * 2)
+            return
+
+        self.drop_expired()
+        if 4 * self.size <= self.capacity:
+            self.resize_table(self.capacity)
+        else:
+            self.resize_table(self.capacity * 2)
+
+    def sweep(self, count: int) -> int:
+        """
+        This method examines the next count buckets of the current table, wrapping around at the end of the table, reclaims the expired entries among them, and returns how many it reclaimed.  Calling it regularly, for example from a timer or once per request, reclaims every expired entry within capacity / count calls.
+        """
+        now = self.clock()
+        data = self.buckets.data
+        capacity = self.capacity
+        robin_hood = self.probing.robin_hood
+        index = self.sweep_index % capacity
+        reclaimed = 0
+
+        for _ in range(min(count, capacity)):
+            entry = data[index]
+            if entry is not None and entry is not TOMBSTONE and entry.expires is not None and entry.expires <= now:
+                self.expire(self.buckets, index)
+                reclaimed += 1
+                # Robin Hood removal shifts the next entry into this bucket, so it is examined next.
+                if robin_hood:
+                    continue
+            index += 1
+            if index == capacity:
+                index = 0
+
+        self.sweep_index = index
+        if reclaimed:
+            self.compact()
+        return reclaimed
+
+    def migrate(self, count: int) -> None:
+        """
+        This is a helper method for incremental resizing that moves the next count buckets of the old table like HashMap.migrate().  Expired entries are dropped instead of being moved.
+        """
+        now = self.clock()
+        old = self.old_buckets.data
+        for i in range(self.migrate_index, min(self.migrate_index + count, self.old_capacity)):
+            entry = old[i]
+            if entry is not None and entry is not TOMBSTONE and entry.expires is not None and entry.expires <= now:
+                old[i] = TOMBSTONE
+                self.size -= 1
+                self.expired += 1
+
+        super().migrate(count)
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        This method takes a new capacity as parameter and changes the capacity of the internal hash map like HashMap.resize_table().  Expired entries are dropped instead of being moved.
+        """
+        if new_capacity < 1 or new_capacity < self.size:
+            return
+
+        # The resize visits every bucket anyway, so dropping the expired entries costs little.  Those of the old table of a migration are dropped by migrate().
+        self.drop_expired()
+        super().resize_table(new_capacity)
+        self.sweep_index = 0
+
+    def start_migration(self, new_capacity: int) -> None:
+        """
+        This is a helper method for incremental resizing that starts a migration like HashMap.start_migration().  sweep() starts over on the new table.
+        """
+        super().start_migration(new_capacity)
+        self.sweep_index = 0
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map without changing its underlying capacity.
+        """
+        super().clear()
+        self.sweep_index = 0
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value.  If the key is not in the hash map or its entry has expired, the method returns None, and an expired entry is reclaimed.
+        """
+        hashed_key = self.hash_function(key)
+        buckets, index = self.find(key, hashed_key)
+        if index is None:
+            return None
+
+        entry = buckets.get_at_index(index)
+        if self.is_expired(entry, self.clock()):
+            self.expire(buckets, index)
+            self.compact()
+            return None
+        return entry.value
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the hash map and has not expired.  Otherwise, it returns False, and an expired entry is reclaimed.
+        """
+        if self.size == 0:
+            return False
+
+        hashed_key = self.hash_function(key)
+        buckets, index = self.find(key, hashed_key)
+        if index is None:
+            return False
+
+        if self.is_expired(buckets.get_at_index(index), self.clock()):
+            self.expire(buckets, index)
+            self.compact()
+            return False
+        return True
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        This method takes a key, value, and optionally a ttl in seconds as parameters and updates the hash map.  The entry expires ttl seconds from now, or after default_ttl seconds if ttl is None.  If the given key already exists in the hash map, its value and expiry time are replaced, even if it had expired.  Before that, sweep_step buckets are swept.
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        expires = None if ttl is None else self.clock() + ttl
+        self.insert(key, value, self.hash_function(key), expires)
+
+    def insert(self, key: str, value: object, hashed_key: int, expires: float) -> None:
+        """
+        This is a helper method for put(), put_many(), and load() that puts the key with the given hash value into the hash map, expiring at the given time of the clock.  Before that, sweep_step buckets are swept.
+        """
+        # Sweep first, since reclaiming may compact the table.
+        if self.sweep_step:
+            self.sweep(self.sweep_step)
+        if self.table_load() >= 0.5:
+            self.grow()
+
+        buckets = self.buckets
+
+        if self.probing.robin_hood:
+            index = self.robin_hood_find(key, hashed_key)
+            if index is None:
+                if self.stats is not None:
+                    self.stats.record_insert(buckets.get_at_index(hashed_key % self.capacity) is not None)
+                self.robin_hood_insert(ExpiringEntry(key, value, hashed_key, expires))
+                self.size += 1
+                return
+        else:
+            if self.old_buckets is not None:
+                self.migrate(self.incremental_resize)
+            index, free_index, iteration = self.locate(key, hashed_key)
+
+            # During a migration the key may still be in the old table, where it is updated in place.
+            if index is None and self.old_buckets is not None:
+                index = self.find_old_index(key, hashed_key)
+                buckets = self.old_buckets
+
+            if index is None:
+                # The probe sequence reaches neither the key nor a free bucket, so the table grows and the key is put again.
+                if free_index is None:
+                    self.resize_table(self.capacity * 2)
+                    self.insert(key, value, hashed_key, expires)
+                    return
+                bucket = self.buckets.get_at_index(free_index)
+                if bucket is TOMBSTONE:
+                    self.tombstones -= 1
+                if self.stats is not None:
+                    self.stats.record_insert(free_index != hashed_key % self.capacity)
+                    self.stats.record_tombstones(0, 1 if bucket is TOMBSTONE else 0)
+                # The probe ended at probe number iteration - 1; a reused tombstone comes earlier on the sequence.
+                if iteration > self.max_probe + 1:
+                    self.max_probe = iteration - 1
+                self.buckets.set_at_index(free_index, ExpiringEntry(key, value, hashed_key, expires))
+                self.size += 1
+                return
+
+        entry = buckets.get_at_index(index)
+        entry.value = value
+        entry.expires = expires
+
+    def put_many(self, pairs, hashes: list = None, ttl: float = None) -> None:
+        """
+        This method takes an iterable of (key, value) pairs and puts each of them into the hash map like put() with the given ttl.  If hashes is given, it holds the hash value of every key and the keys are not hashed again.
+        """
+        if ttl is None:
+            ttl = self.default_ttl
+        expires = None if ttl is None else self.clock() + ttl
+
+        pairs = list(pairs)
+        if hashes is None:
+            hashes = [self.hash_function(key) for key, _ in pairs]
+        for (key, value), hashed_key in zip(pairs, hashes):
+            self.insert(key, value, hashed_key, expires)
+
+    def dump(self, file, keep_hashes: bool = False) -> None:
+        """
+        This method writes the entries that have not expired to a binary file object as a snapshot like HashMap.dump().  Each value is stored together with the number of seconds the entry has left to live, or None if it never expires, so the snapshot is meant to be read back by TTLHashMap.load().
+        """
+        self.finish_migration()
+        now = self.clock()
+        entries = [(entry.key, (entry.value, None if entry.expires is None else entry.expires - now), entry.hash) for entry in self.buckets.data if entry is not None and entry is not TOMBSTONE and not self.is_expired(entry, now)]
+        write_snapshot(file, self.capacity, self.hash_function, len(entries), entries, keep_hashes)
+
+    @classmethod
+    def load(cls, file, function=None, **options) -> 'TTLHashMap':
+        """
+        This method reads a snapshot written by dump() from a binary file object and returns a new TTLHashMap with the snapshot's capacity.  Every entry gets the time it had left to live when it was dumped, counted from now on the clock of the new hash map.  function is found like in HashMap.load(), and other keyword arguments, like default_ttl and clock, are passed on to TTLHashMap().
+        """
+        capacity, function, pairs, hashes = load_arguments(file, function)
+        hash_map = cls(capacity, function, **options)
+        if hashes is None:
+            hashes = [function(key) for key, _ in pairs]
+
+        now = hash_map.clock()
+        for (key, (value, ttl)), hashed_key in zip(pairs, hashes):
+            hash_map.insert(key, value, hashed_key, None if ttl is None else now + ttl)
+        return hash_map
+
+    def get_many(self, keys) -> list:
+        """
+        This method takes an iterable of keys and returns a list with the value of each key, or None for keys that are not in the hash map or have expired.
+        """
+        return [self.get(key) for key in keys]
+
+    def items(self):
+        """
+        This method is a generator that yields every (key, value) pair stored in the hash map that has not expired.
+        """
+        self.finish_migration()
+        now = self.clock()
+        for entry in self.buckets.data:
+            if entry is not None and entry is not TOMBSTONE and not self.is_expired(entry, now):
+                yield entry.key, entry.value
+
+    def get_keys(self) -> DynamicArray:
+        """
+        This method returns a Dynamic Array with all the keys from the hash map that have not expired.
+        """
+        return_arr = DynamicArray()
+        for key, _ in self.items():
+            return_arr.append(key)
+        return return_arr
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    class FakeClock:
+        """
+        Clock for the examples that only moves when told to.
+        """
+
+        def __init__(self) -> None:
+            self.now = 0.0
+
+        def __call__(self) -> float:
+            return self.now
+
+    # Expiry example 1
+    # ----------------------
+    # 10 20 True
+    # None 20 False True
+    # 2 1 1
+    # 30 True
+
+    print("\nExpiry example 1")
+    print("----------------------")
+    clock = FakeClock()
+    m = TTLHashMap(10, hash_function_1, clock=clock)
+    m.put('session', 10, ttl=5)
+    m.put('forever', 20)
+    print(m.get('session'), m.get('forever'), m.contains_key('session'))
+    clock.now = 5.0
+    # The expired entry is reclaimed by the lookup that finds it.
+    print(m.get('session'), m.get('forever'), m.contains_key('session'), m.contains_key('forever'))
+    m.put('short', 30, ttl=1)
+    print(m.size, m.tombstones, m.expired)
+    # Putting an existing key replaces its expiry time.
+    m.put('short', 30, ttl=100)
+    clock.now = 50.0
+    print(m.get('short'), m.contains_key('short'))
+
+    # Sweep example 1
+    # ---------------------
+    # 100 256
+    # 16 16 84
+    # 100 0 0
+    # 100 0 0
+
+    print("\nSweep example 1")
+    print("---------------------")
+    clock = FakeClock()
+    m = TTLHashMap(256, hash_function_2, default_ttl=10, sweep_step=0, clock=clock)
+    for i in range(100):
+        m.put('key' + str(i), i)
+    print(m.size, m.capacity)
+    clock.now = 10.0
+    # Each sweep examines a bounded number of buckets.
+    reclaimed = 0
+    while reclaimed < 16:
+        reclaimed += m.sweep(1)
+    print(reclaimed, m.expired, m.size)
+    # Enough tombstones compact the table, which drops every remaining expired entry.
+    while m.size:
+        m.sweep(32)
+    print(m.expired, m.size, m.tombstones)
+    # Expired entries that have not been reclaimed yet still count in size, but are never returned.
+    for i in range(100, 200):
+        m.put('key' + str(i), i, ttl=1)
+    clock.now = 20.0
+    print(m.size, len(list(m.items())), m.get_keys().length())
+
+    # Dump example 1
+    # --------------------
+    # 2 2
+    # 1 2
+    # None 2
+
+    print("\nDump example 1")
+    print("--------------------")
+    import io
+    clock = FakeClock()
+    m = TTLHashMap(10, hash_function_1, clock=clock)
+    m.put('session', 1, ttl=5)
+    m.put('forever', 2)
+    m.put('short', 3, ttl=1)
+    clock.now = 2.0
+    snapshot = io.BytesIO()
+    m.dump(snapshot)
+    snapshot.seek(0)
+    # Expired entries are not written, and the others keep the time they had left.
+    later = FakeClock()
+    later.now = 100.0
+    m = TTLHashMap.load(snapshot, clock=later)
+    print(m.size, len(list(m.items())))
+    later.now = 102.5
+    print(m.get('session'), m.get('forever'))
+    later.now = 103.0
+    print(m.get('session'), m.get('forever'))
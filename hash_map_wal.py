@@ -0,0 +1,382 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Durability layer for the HashMap classes of hash_map_chaining.py and hash_map_open_addressing.py.  Every put(), remove() and clear() is appended to a write-ahead log before it returns, the log is replayed on startup, and a background thread compacts it into a snapshot once it grows too large.
+
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+
+from hash_map_chaining import HashMap as ChainingHashMap
+from hash_map_open_addressing import HashMap as OpenAddressingHashMap
+from hash_functions import hash_function_1, hash_function_2
+from snapshot import write_snapshot, read_snapshot
+
+# Log record: CRC-32 of the rest of the record, operation, key length and value length, followed by the UTF-8 key and the pickled value.
+RECORD = struct.Struct('<IBII')
+
+# Operations.
+PUT = 1
+REMOVE = 2
+CLEAR = 3
+
+# fsync policies.
+ALWAYS = 'always'
+GROUP = 'group'
+INTERVAL = 'interval'
+NONE = 'none'
+FSYNC_POLICIES = (ALWAYS, GROUP, INTERVAL, NONE)
+
+
+class DurableHashMap:
+    """
+    Class implementing a durable Hash Map around a chaining or open addressing HashMap.  Supported methods are: clear(), get(), put(), remove(), contains_key(), items(), sync(), compact(), and close().  All methods are thread-safe.
+
+    The files in the directory are snapshot-N.bin and wal-N.log.  snapshot-N.bin holds the whole map as of the start of wal-N.log, and the logs from N on hold every mutation since.  The fsync policy decides when a mutation is durable:
+
+    always    put() returns after its record has been written and fsynced on its own.
+    group     put() returns after its record has been fsynced, but one fsync covers every record appended by other threads in the meantime (group commit).
+    interval  put() returns at once; a background thread fsyncs every interval seconds, so at most that much is lost on a crash.
+    none      records are handed to the operating system every batch_size mutations and never fsynced.
+    """
+
+    def __init__(self, directory: str, hash_map, fsync: str = GROUP, interval: float = 1.0, batch_size: int = 1000, compact_bytes: int = 64 * 2 ** 20) -> None:
+        """
+        Init a new DurableHashMap that keeps its files in directory and the entries in hash_map, which should be empty.  If the directory has files from an earlier run, the newest snapshot is loaded and the logs after it are replayed into hash_map.  Once the current log reaches compact_bytes, compact() is started in the background.
+        """
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError("fsync must be one of " + ', '.join(FSYNC_POLICIES))
+
+        self.directory = directory
+        self.map = hash_map
+        self.fsync = fsync
+        self.interval = interval
+        self.batch_size = batch_size
+        self.compact_bytes = compact_bytes
+
+        # The lock guards the map and the log buffer.  Records up to number appended have been added to the buffer, and those up to number durable have been written (and fsynced, unless the policy is none).
+        self.lock = threading.Lock()
+        self.committed = threading.Condition(self.lock)
+        self.buffer = []
+        self.appended = 0
+        self.durable = 0
+        self.committing = False
+        self.compactor = None
+        self.closed = False
+
+        os.makedirs(directory, exist_ok=True)
+        self.generation = self.recover()
+        self.log = open(self.path('wal', self.generation), 'ab')
+        self.log_bytes = self.log.tell()
+
+        self.syncer = None
+        if fsync == INTERVAL:
+            self.syncer = threading.Thread(target=self.sync_periodically, daemon=True)
+            self.syncer.start()
+
+    def path(self, kind: str, generation: int) -> str:
+        """
+        This is a helper method that returns the path of snapshot or log number generation.
+        """
+        extension = '.bin' if kind == 'snapshot' else '.log'
+        return os.path.join(self.directory, kind + '-' + str(generation) + extension)
+
+    def generations(self, kind: str) -> list:
+        """
+        This is a helper method that returns the sorted numbers of the snapshots or logs in the directory.
+        """
+        numbers = []
+        for name in os.listdir(self.directory):
+            prefix, _, rest = name.partition('-')
+            number, _, extension = rest.partition('.')
+            if prefix == kind and number.isdigit() and extension in ('bin', 'log'):
+                numbers.append(int(number))
+        return sorted(numbers)
+
+    def recover(self) -> int:
+        """
+        This is a helper method for startup.  It loads the newest snapshot into the map, replays the logs that follow it, and returns the number of the log to append to.
+        """
+        snapshots = self.generations('snapshot')
+        first = snapshots[-1] if snapshots else 0
+        if snapshots:
+            with open(self.path('snapshot', first), 'rb') as file:
+                _, _, pairs, _ = read_snapshot(file)
+            self.map.put_many(pairs)
+
+        logs = [number for number in self.generations('wal') if number >= first]
+        for number in logs:
+            self.replay(self.path('wal', number))
+        return logs[-1] if logs else first
+
+    def replay(self, path: str) -> None:
+        """
+        This is a helper method for recover().  It applies every record of a log to the map.  A record that is cut short or fails its checksum, as left behind by a crash in the middle of a write, ends the log and is truncated away.
+        """
+        with open(path, 'rb') as file:
+            data = file.read()
+
+        position = 0
+        while position + RECORD.size <= len(data):
+            checksum, operation, key_length, value_length = RECORD.unpack_from(data, position)
+            end = position + RECORD.size + key_length + value_length
+            if end > len(data) or zlib.crc32(data[position + 4:end]) != checksum:
+                break
+
+            start = position + RECORD.size
+            if operation == PUT:
+                key = data[start:start + key_length].decode('utf-8')
+                self.map.put(key, pickle.loads(data[start + key_length:end]))
+            elif operation == REMOVE:
+                self.map.remove(data[start:start + key_length].decode('utf-8'))
+            else:
+                self.map.clear()
+            position = end
+
+        if position < len(data):
+            with open(path, 'r+b') as file:
+                file.truncate(position)
+
+    def append(self, operation: int, key: str = '', value: object = None) -> None:
+        """
+        This is a helper method for put(), remove(), and clear(), which hold the lock and have applied the mutation to the map.  It adds the record to the log buffer and commits it as the fsync policy requires.
+        """
+        encoded = key.encode('utf-8')
+        value = pickle.dumps(value, pickle.HIGHEST_PROTOCOL) if operation == PUT else b''
+        body = struct.pack('<BII', operation, len(encoded), len(value)) + encoded + value
+        self.buffer.append(struct.pack('<I', zlib.crc32(body)) + body)
+        self.appended += 1
+
+        if self.fsync == ALWAYS:
+            self.write_buffer(True)
+        elif self.fsync == GROUP:
+            self.wait_durable(self.appended)
+        elif self.fsync == NONE and len(self.buffer) >= self.batch_size:
+            self.write_buffer(False)
+
+        if self.log_bytes >= self.compact_bytes and self.compactor is None:
+            self.compactor = threading.Thread(target=self.compact, daemon=True)
+            self.compactor.start()
+
+    def write_buffer(self, fsync: bool) -> None:
+        """
+        This is a helper method that writes the log buffer to the log, fsyncs it if fsync is True, and marks the records as durable.  The caller holds the lock.
+        """
+        if self.buffer:
+            data = b''.join(self.buffer)
+            self.buffer = []
+            self.log.write(data)
+            self.log.flush()
+            self.log_bytes += len(data)
+        if fsync:
+            os.fsync(self.log.fileno())
+        self.durable = self.appended
+
+    def wait_durable(self, number: int) -> None:
+        """
+        This is a helper method for group commit.  The caller holds the lock.  The first thread to wait becomes the leader: it takes every buffered record, writes and fsyncs them without holding the lock, and wakes up the others.  Records appended while it does so are committed by the next leader.
+        """
+        while self.durable < number:
+            if self.committing:
+                self.committed.wait()
+                continue
+
+            self.committing = True
+            data = b''.join(self.buffer)
+            self.buffer = []
+            covered = self.appended
+            log = self.log
+
+            # Other threads keep appending to the buffer while the leader waits for the disk.
+            self.lock.release()
+            try:
+                log.write(data)
+                log.flush()
+                os.fsync(log.fileno())
+            finally:
+                self.lock.acquire()
+                self.committing = False
+            self.log_bytes += len(data)
+            self.durable = max(self.durable, covered)
+            self.committed.notify_all()
+
+    def sync_periodically(self) -> None:
+        """
+        This is the loop of the background thread of the interval policy.
+        """
+        while True:
+            time.sleep(self.interval)
+            with self.lock:
+                if self.closed:
+                    return
+                self.write_buffer(True)
+
+    def sync(self) -> None:
+        """
+        This method writes and fsyncs every mutation made so far, whatever the fsync policy.
+        """
+        with self.lock:
+            if self.fsync == GROUP:
+                self.wait_durable(self.appended)
+            else:
+                self.write_buffer(True)
+
+    def get(self, key: str) -> object:
+        """
+        This method takes a key as parameter and returns its associated value.  If the key is not in the hash map, the method returns None.
+        """
+        with self.lock:
+            return self.map.get(key)
+
+    def contains_key(self, key: str) -> bool:
+        """
+        The method takes a key as parameter and returns True if the given key is in the hash map.  Otherwise, it returns False.
+        """
+        with self.lock:
+            return self.map.contains_key(key)
+
+    @property
+    def size(self) -> int:
+        """
+        Number of entries in the hash map.
+        """
+        return self.map.size
+
+    def items(self) -> list:
+        """
+        This method returns a list of every (key, value) pair stored in the hash map.
+        """
+        with self.lock:
+            return list(self.map.items())
+
+    def put(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and updates the hash map and the log.  If the given key already exists in the hash map, its associated value is replaced with the new value.
+        """
+        with self.lock:
+            self.map.put(key, value)
+            self.append(PUT, key, value)
+
+    def remove(self, key: str) -> None:
+        """
+        This method takes a key as parameter and removes its associated value from the hash map.  The removal is logged even if the key is not in the hash map.
+        """
+        with self.lock:
+            self.map.remove(key)
+            self.append(REMOVE, key)
+
+    def clear(self) -> None:
+        """
+        This method clears the contents of the hash map and logs it.
+        """
+        with self.lock:
+            self.map.clear()
+            self.append(CLEAR)
+
+    def compact(self) -> None:
+        """
+        This method replaces the logs with a snapshot.  Under the lock it commits the log buffer, switches to a new log N, and copies the entries.  The copy is then written to snapshot-N.bin without the lock, so writers only wait for the copy.  Once the snapshot is complete, the older snapshots and logs are deleted.  A crash at any point leaves a snapshot and logs that recover() can load.
+        """
+        with self.lock:
+            # A group commit leader writes to the log without the lock, so it has to finish before the log is closed.
+            while self.committing:
+                self.committed.wait()
+            self.write_buffer(self.fsync != NONE)
+            self.log.close()
+            self.generation += 1
+            generation = self.generation
+            self.log = open(self.path('wal', generation), 'ab')
+            self.log_bytes = 0
+            pairs = list(self.map.items())
+            capacity, function = self.map.capacity, self.map.hash_function
+
+        # Write the snapshot next to its final name and rename it once it is complete.
+        path = self.path('snapshot', generation)
+        with open(path + '.tmp', 'wb') as file:
+            write_snapshot(file, capacity, function, len(pairs), ((key, value, None) for key, value in pairs))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(path + '.tmp', path)
+
+        for number in self.generations('snapshot'):
+            if number < generation:
+                os.remove(self.path('snapshot', number))
+        for number in self.generations('wal'):
+            if number < generation:
+                os.remove(self.path('wal', number))
+
+        with self.lock:
+            if self.compactor is threading.current_thread():
+                self.compactor = None
+
+    def close(self) -> None:
+        """
+        This method waits for a running compaction, makes every mutation durable, and closes the log.
+        """
+        compactor = self.compactor
+        if compactor is not None:
+            compactor.join()
+        with self.lock:
+            while self.committing:
+                self.committed.wait()
+            self.write_buffer(True)
+            self.closed = True
+            self.log.close()
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+    import tempfile
+
+    # Replay example 1
+    # ----------------------
+    # 99 None 42 [1, 2]
+    # 99 None 42 [1, 2]
+    # 0 None
+
+    print("\nReplay example 1")
+    print("----------------------")
+    directory = tempfile.mkdtemp()
+    m = DurableHashMap(directory, ChainingHashMap(50, hash_function_1))
+    for i in range(100):
+        m.put('key' + str(i), i)
+    m.put('key1', [1, 2])
+    m.remove('key0')
+    print(m.size, m.get('key0'), m.get('key42'), m.get('key1'))
+    m.close()
+
+    # Reopening replays the log into a new map.
+    m = DurableHashMap(directory, OpenAddressingHashMap(50, hash_function_2))
+    print(m.size, m.get('key0'), m.get('key42'), m.get('key1'))
+    m.clear()
+    m.close()
+    m = DurableHashMap(directory, ChainingHashMap(50, hash_function_1))
+    print(m.size, m.get('key1'))
+    m.close()
+
+    # Compact example 1
+    # -----------------------
+    # ['snapshot-1.bin', 'wal-1.log']
+    # 300 100 299 True
+
+    print("\nCompact example 1")
+    print("-----------------------")
+    directory = tempfile.mkdtemp()
+    m = DurableHashMap(directory, ChainingHashMap(50, hash_function_1), fsync=NONE)
+    for i in range(300):
+        m.put('key' + str(i), i)
+    m.compact()
+    m.put('key100', 100)
+    m.close()
+    print(sorted(os.listdir(directory)))
+
+    # A torn record at the end of the log is dropped on startup.
+    with open(os.path.join(directory, 'wal-1.log'), 'ab') as file:
+        file.write(b'\x01\x02\x03')
+    m = DurableHashMap(directory, ChainingHashMap(50, hash_function_1))
+    print(m.size, m.get('key100'), m.get('key299'), os.path.getsize(os.path.join(directory, 'wal-1.log')) < 40)
+    m.close()
@@ -0,0 +1,521 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: memoize decorator that caches the results of a function in a MemoCache, a bounded cache built on either HashMap of hash_map_chaining.py and hash_map_open_addressing.py.  The cache evicts its least recently used, least frequently used, or random entries once it holds max_entries entries or max_bytes bytes, and counts its hits, misses and evictions.
+
+import functools
+import random
+import sys
+import threading
+
+import hash_map_chaining
+import hash_map_open_addressing
+from hash_functions import builtin_hash
+from probing import TriangularProbing
+
+
+class CacheEntry:
+    """
+    Value of a MemoCache stored in the hash map.  older and newer link the entry into the lists of the eviction policy, count is the number of times it was used, position its index in the list of RandomPolicy, and size the number of bytes it is counted as.
+    """
+
+    __slots__ = ('key', 'value', 'size', 'older', 'newer', 'count', 'position')
+
+    def __init__(self, key: str, value: object, size: int = 0) -> None:
+        """
+        Init a new entry that is not known to any policy yet.
+        """
+        self.key = key
+        self.value = value
+        self.size = size
+        self.older = None
+        self.newer = None
+        self.count = 0
+        self.position = 0
+
+
+def entry_size(key: str, value: object) -> int:
+    """
+    This function returns the default size of a cache entry in bytes: the entry plus the shallow sizes of the key and the value.  Objects that the value refers to are not counted.
+    """
+    return ENTRY_BYTES + sys.getsizeof(key) + sys.getsizeof(value)
+
+
+ENTRY_BYTES = sys.getsizeof(CacheEntry(None, None))
+
+
+def make_key(args: tuple, kwargs: dict) -> str:
+    """
+    This function returns the cache key of the given positional and keyword arguments, which is their repr().  Arguments that compare equal but have different types, like 1 and 1.0, get different keys.  The repr() of most objects without a __repr__() method holds their id(), which is reused once the object is freed, so functions taking such arguments need a key function of their own.
+    """
+    if kwargs:
+        return repr((args, sorted(kwargs.items())))
+    return repr(args)
+
+
+def new_list() -> CacheEntry:
+    """
+    This function returns the sentinel of a new empty circular list of entries.  sentinel.newer is the oldest entry of the list and sentinel.older the newest one.
+    """
+    sentinel = CacheEntry(None, None)
+    sentinel.older = sentinel
+    sentinel.newer = sentinel
+    return sentinel
+
+
+def link_newest(sentinel: CacheEntry, entry: CacheEntry) -> None:
+    """
+    This function links an entry into the list of the given sentinel as its newest entry.
+    """
+    newest = sentinel.older
+    entry.older = newest
+    entry.newer = sentinel
+    newest.newer = entry
+    sentinel.older = entry
+
+
+def unlink(entry: CacheEntry) -> None:
+    """
+    This function takes an entry out of its list.
+    """
+    entry.older.newer = entry.newer
+    entry.newer.older = entry.older
+
+
+class EvictionPolicy:
+    """
+    Base class of the eviction policies.  MemoCache tells its policy about every entry it adds, finds again, or removes, and evicts the entry returned by victim() when it is full.  All methods take O(1) time.
+    """
+
+    def add(self, entry: CacheEntry) -> None:
+        """
+        This method takes an entry that was just added to the cache as parameter.
+        """
+        raise NotImplementedError
+
+    def touch(self, entry: CacheEntry) -> None:
+        """
+        This method takes an entry that was just found in the cache as parameter.
+        """
+        raise NotImplementedError
+
+    def discard(self, entry: CacheEntry) -> None:
+        """
+        This method takes an entry that is being removed from the cache as parameter.
+        """
+        raise NotImplementedError
+
+    def victim(self) -> CacheEntry:
+        """
+        This method returns the entry to evict next.  The cache must not be empty.
+        """
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """
+        This method forgets every entry.
+        """
+        raise NotImplementedError
+
+    def __str__(self) -> str:
+        """
+        Returns the name of the policy.
+        """
+        return type(self).__name__
+
+
+class LRUPolicy(EvictionPolicy):
+    """
+    Evicts the least recently used entry.  Entries are kept in a list ordered by their last use, like in hash_map_lru.LRUCache.
+    """
+
+    def __init__(self) -> None:
+        self.recent = new_list()
+
+    def add(self, entry: CacheEntry) -> None:
+        link_newest(self.recent, entry)
+
+    def touch(self, entry: CacheEntry) -> None:
+        unlink(entry)
+        link_newest(self.recent, entry)
+
+    def discard(self, entry: CacheEntry) -> None:
+        unlink(entry)
+
+    def victim(self) -> CacheEntry:
+        return self.recent.newer
+
+    def clear(self) -> None:
+        self.recent = new_list()
+
+
+class CountList:
+    """
+    List of the entries of an LFUPolicy that were used count times, ordered by their last use.  lower and higher link the lists of all counts in use in order of their count.
+    """
+
+    __slots__ = ('count', 'entries', 'lower', 'higher')
+
+    def __init__(self, count: int) -> None:
+        """
+        Init a new empty list that is not linked to any other list yet.
+        """
+        self.count = count
+        self.entries = new_list()
+        self.lower = self
+        self.higher = self
+
+
+class LFUPolicy(EvictionPolicy):
+    """
+    Evicts the least frequently used entry, and of those the least recently used one.  Entries are kept in one list per use count, ordered by their last use, and the lists are linked in order of their count, so the least frequently used entry is always at the front of the first list and no step searches the entries or the counts.  Counts never decrease, so entries that were popular once stay cached until the cache is cleared.
+    """
+
+    def __init__(self) -> None:
+        self.clear()
+
+    def link(self, entry: CacheEntry, lower: CountList) -> None:
+        """
+        This is a helper method that links an entry into the list of its count, which is either the list following lower or a new list inserted after it.
+        """
+        count_list = lower.higher
+        if count_list.count != entry.count:
+            count_list = self.lists[entry.count] = CountList(entry.count)
+            count_list.lower = lower
+            count_list.higher = lower.higher
+            lower.higher.lower = count_list
+            lower.higher = count_list
+        link_newest(count_list.entries, entry)
+
+    def unlink(self, entry: CacheEntry) -> None:
+        """
+        This is a helper method that takes an entry out of the list of its count, dropping the list once it is empty.
+        """
+        unlink(entry)
+        count_list = self.lists[entry.count]
+        if count_list.entries.newer is count_list.entries:
+            count_list.lower.higher = count_list.higher
+            count_list.higher.lower = count_list.lower
+            del self.lists[entry.count]
+
+    def add(self, entry: CacheEntry) -> None:
+        entry.count = 1
+        self.link(entry, self.counts)
+
+    def touch(self, entry: CacheEntry) -> None:
+        # The list of the old count is passed on before unlink() may drop it, so the new list is put in its place.
+        count_list = self.lists[entry.count]
+        self.unlink(entry)
+        entry.count += 1
+        self.link(entry, count_list if entry.count - 1 in self.lists else count_list.lower)
+
+    def discard(self, entry: CacheEntry) -> None:
+        self.unlink(entry)
+
+    def victim(self) -> CacheEntry:
+        return self.counts.higher.entries.newer
+
+    def clear(self) -> None:
+        # Maps a use count to its list.  counts is the sentinel of the lists linked in order of their count, so counts.higher has the lowest count; its count of 0 is never used by an entry.
+        self.lists = {}
+        self.counts = CountList(0)
+
+
+class RandomPolicy(EvictionPolicy):
+    """
+    Evicts a random entry.  It keeps no order, so hits cost nothing extra, which makes it a good choice when the arguments are used about equally often.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        self.random = random.Random(seed)
+        self.entries = []
+
+    def add(self, entry: CacheEntry) -> None:
+        entry.position = len(self.entries)
+        self.entries.append(entry)
+
+    def touch(self, entry: CacheEntry) -> None:
+        pass
+
+    def discard(self, entry: CacheEntry) -> None:
+        # Move the last entry into the freed position, so the list has no holes.
+        last = self.entries.pop()
+        if last is not entry:
+            self.entries[entry.position] = last
+            last.position = entry.position
+
+    def victim(self) -> CacheEntry:
+        return self.entries[self.random.randrange(len(self.entries))]
+
+    def clear(self) -> None:
+        self.entries = []
+
+
+POLICIES = ('lru', 'lfu', 'random')
+BACKINGS = ('chaining', 'open_addressing')
+
+# Initial capacity of the hash map.  It grows as the cache fills.
+INITIAL_CAPACITY = 16
+
+
+class MemoCache:
+    """
+    Class implementing a bounded cache of computed values backed by a HashMap.  Supported methods are: find(), store(), evict(), clear(), hit_rate(), and report().
+
+    The cache holds at most max_entries entries and max_bytes bytes, as measured by sizeof(key, value), whichever limits are given.  hits and misses count the find() calls that found their key and those that did not, and evictions the entries evicted to stay within the limits.  Its methods may be called from several threads.
+    """
+
+    def __init__(self, max_entries: int = 128, max_bytes: int = None, policy: str = 'lru', backing: str = 'chaining', function=builtin_hash, sizeof=entry_size, seed: int = None) -> None:
+        """
+        Init a new empty MemoCache.  policy is 'lru', 'lfu' or 'random', and seed seeds the random policy.  backing is 'chaining' or 'open_addressing', and function is the hash function of the HashMap.  If both max_entries and max_bytes are None, the cache is unbounded.
+        """
+        if policy not in POLICIES:
+            raise ValueError("policy must be one of " + ", ".join(POLICIES))
+        if backing not in BACKINGS:
+            raise ValueError("backing must be one of " + ", ".join(BACKINGS))
+        if max_entries is not None and max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+
+        if backing == 'chaining':
+            # Grow the table like LRUCache does, so chains stay short as the cache fills.
+            self.map = hash_map_chaining.HashMap(INITIAL_CAPACITY, function, max_load_factor=1.0)
+        else:
+            # Evictions leave tombstones, so the probe sequence has to reach every bucket, which quadratic probing does not guarantee.
+            self.map = hash_map_open_addressing.HashMap(INITIAL_CAPACITY, function, probing=TriangularProbing())
+        if policy == 'lru':
+            self.policy = LRUPolicy()
+        elif policy == 'lfu':
+            self.policy = LFUPolicy()
+        else:
+            self.policy = RandomPolicy(seed)
+
+        self.backing = backing
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    def find(self, key: str) -> CacheEntry:
+        """
+        This method takes a key as parameter and returns its entry, which counts as a use for the eviction policy, or None if the key is not in the cache.
+        """
+        with self.lock:
+            entry = self.map.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self.policy.touch(entry)
+            return entry
+
+    def store(self, key: str, value: object) -> None:
+        """
+        This method takes a key and value as parameters and adds them to the cache.  If the cache is full, entries chosen by the policy are evicted first.  If the key is already in the cache, for example because another thread computed the same value meanwhile, its value is replaced.  A value larger than max_bytes on its own is not cached.
+        """
+        size = self.sizeof(key, value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+
+        with self.lock:
+            entry = self.map.get(key)
+            if entry is not None:
+                self.bytes += size - entry.size
+                entry.value = value
+                entry.size = size
+                while self.max_bytes is not None and self.bytes > self.max_bytes:
+                    self.evict()
+                return
+
+            # Evict before adding, so the new entry is never the victim.
+            while self.map.size > 0 and ((self.max_entries is not None and self.map.size >= self.max_entries) or (self.max_bytes is not None and self.bytes + size > self.max_bytes)):
+                self.evict()
+            entry = CacheEntry(key, value, size)
+            self.map.put(key, entry)
+            self.policy.add(entry)
+            self.bytes += size
+
+    def evict(self) -> None:
+        """
+        This method removes the entry chosen by the eviction policy.  If the cache is empty, the method does nothing.
+        """
+        if self.map.size == 0:
+            return
+        entry = self.policy.victim()
+        self.policy.discard(entry)
+        self.map.remove(entry.key)
+        self.bytes -= entry.size
+        self.evictions += 1
+
+    def clear(self) -> None:
+        """
+        This method removes every entry from the cache.  The counters are kept.
+        """
+        with self.lock:
+            self.map.clear()
+            self.policy.clear()
+            self.bytes = 0
+
+    def hit_rate(self) -> float:
+        """
+        This method returns the fraction of find() calls that found their key, or 0 if find() has not been called.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def report(self) -> dict:
+        """
+        This method returns the statistics of the cache as a dict of plain numbers and strings, ready to be logged or serialized as JSON.  If statistics of the hash map are turned on (see HashMap.enable_stats()), their report is included as 'map'.
+        """
+        with self.lock:
+            report = {
+                'policy': str(self.policy),
+                'backing': self.backing,
+                'size': self.map.size,
+                'bytes': self.bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hit_rate(),
+            }
+            if self.map.stats is not None:
+                report['map'] = self.map.stats.report(self.map)
+            return report
+
+
+def memoize(function=None, *, max_entries: int = 128, max_bytes: int = None, policy: str = 'lru', backing: str = 'chaining', hash_function=builtin_hash, key=make_key, sizeof=entry_size, seed: int = None):
+    """
+    This function is a decorator that caches the results of a function in a MemoCache with the given limits, policy and backing HashMap.  It can be used as @memoize or with arguments, as in @memoize(max_entries=1000, policy='lfu').  key(args, kwargs) returns the string key of the arguments of a call.  Exceptions are not cached.
+
+    The decorated function has the attributes cache, the MemoCache, cache_info(), which returns cache.report(), and cache_clear(), which clears the cache.
+    """
+    def decorate(function):
+        cache = MemoCache(max_entries, max_bytes, policy, backing, hash_function, sizeof, seed)
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            cache_key = key(args, kwargs)
+            entry = cache.find(cache_key)
+            if entry is not None:
+                return entry.value
+            # The lock is not held while computing, so the function may call itself or run in several threads at once.
+            value = function(*args, **kwargs)
+            cache.store(cache_key, value)
+            return value
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.report
+        wrapper.cache_clear = cache.clear
+        return wrapper
+
+    if function is not None:
+        return decorate(function)
+    return decorate
+
+#--------
+# Tests
+#--------
+
+if __name__ == "__main__":
+
+    # LRU example 1
+    # -------------------
+    # 832040 31
+    # 832040 31
+    # 29 31 0 0.48
+    # ['(2,)', '(3,)'] 2 4
+
+    print("\nLRU example 1")
+    print("-------------------")
+    calls = []
+
+    @memoize(max_entries=100)
+    def fib(n):
+        calls.append(n)
+        return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+    # Every argument is computed once.
+    print(fib(30), len(calls))
+    print(fib(30), len(calls))
+    info = fib.cache_info()
+    print(info['hits'], info['misses'], info['evictions'], round(info['hit_rate'], 2))
+
+    calls = []
+
+    @memoize(max_entries=2)
+    def double(x):
+        calls.append(x)
+        return 2 * x
+
+    double(1)
+    double(2)
+    double(1)
+    # 2 is the least recently used argument, so it is evicted for 3 and computed again.
+    double(3)
+    double(2)
+    print(sorted(key for key, _ in double.cache.map.items()), double.cache.evictions, len(calls))
+
+    # LFU example 1
+    # -------------------
+    # ["('a',)", "('b',)", "('c',)"]
+    # ["('a',)", "('c',)", "('d',)"] 1
+
+    print("\nLFU example 1")
+    print("-------------------")
+
+    @memoize(max_entries=3, policy='lfu')
+    def upper(word):
+        return word.upper()
+
+    for word in ('a', 'a', 'b', 'c', 'c', 'c'):
+        upper(word)
+    print(sorted(key for key, _ in upper.cache.map.items()))
+    # 'b' was used least often, so it is evicted for 'd'.
+    upper('d')
+    print(sorted(key for key, _ in upper.cache.map.items()), upper.cache.evictions)
+
+    # Random example 1
+    # ----------------------
+    # 10 990 True
+    # open_addressing 0 True
+
+    print("\nRandom example 1")
+    print("----------------------")
+
+    @memoize(max_entries=10, policy='random', backing='open_addressing', seed=1)
+    def square(x):
+        return x * x
+
+    for i in range(1000):
+        square(i)
+    print(square.cache.map.size, square.cache.evictions, square(999) == 998001)
+    square.cache_clear()
+    print(square.cache_info()['backing'], square.cache.map.size, square(3) == 9)
+
+    # Max_bytes example 1
+    # -------------------------
+    # 3 303 0
+    # 3 299 2
+    # 3 299 None
+
+    print("\nMax_bytes example 1")
+    print("-------------------------")
+
+    @memoize(max_entries=None, max_bytes=310, sizeof=lambda key, value: len(value))
+    def block(n):
+        return b'x' * n
+
+    for n in (100, 101, 102):
+        block(n)
+    print(block.cache.map.size, block.cache.bytes, block.cache.evictions)
+    # The two least recently used values are evicted to make room.
+    block(98)
+    block(99)
+    print(block.cache.map.size, block.cache.bytes, block.cache.evictions)
+    # Values larger than max_bytes are computed every time and never cached.
+    block(1000)
+    print(block.cache.map.size, block.cache.bytes, block.cache.find(repr((1000,))))
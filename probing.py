@@ -0,0 +1,85 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Probing strategies for the open addressing HashMap in hash_map_open_addressing.py.
+
+
+def next_power_of_two(number: int) -> int:
+    """
+    This function returns the smallest power of two that is greater than or equal to the given number (at least 1).
+    """
+    power = 1
+    while power < number:
+        power *= 2
+    return power
+
+
+class ProbingStrategy:
+    """
+    Base class of the probing strategies.  probe() returns the index of the nth bucket to visit for a key, where iteration 0 is the initial index.
+
+    power_of_two is True if the strategy only visits every bucket when the capacity is a power of two; HashMap then rounds its capacity up.  robin_hood is True if HashMap has to use Robin Hood insertion and backward-shift deletion instead of tombstones.
+    """
+
+    power_of_two = False
+    robin_hood = False
+
+    def probe(self, initial: int, iteration: int, hashed_key: int, capacity: int) -> int:
+        """
+        This method takes the initial index, nth iteration, full hash value and capacity as parameters and returns the index of the bucket to visit.
+        """
+        raise NotImplementedError
+
+    def __str__(self) -> str:
+        """
+        Returns the name of the strategy.
+        """
+        return type(self).__name__
+
+
+class LinearProbing(ProbingStrategy):
+    """
+    Visits consecutive buckets.  Best cache locality, but prone to primary clustering.
+    """
+
+    def probe(self, initial: int, iteration: int, hashed_key: int, capacity: int) -> int:
+        return (initial + iteration) % capacity
+
+
+class QuadraticProbing(ProbingStrategy):
+    """
+    Visits initial + i^2.  This is the original probing of HashMap and its default.  With an arbitrary capacity it is not guaranteed to visit every bucket, so HashMap gives up on a probe sequence after capacity buckets: a lookup then misses, and an insert grows the table.
+    """
+
+    def probe(self, initial: int, iteration: int, hashed_key: int, capacity: int) -> int:
+        return (initial + iteration * iteration) % capacity
+
+
+class TriangularProbing(ProbingStrategy):
+    """
+    Visits initial + i(i + 1)/2.  Over a power-of-two capacity the first capacity probes visit every bucket exactly once.
+    """
+
+    power_of_two = True
+
+    def probe(self, initial: int, iteration: int, hashed_key: int, capacity: int) -> int:
+        return (initial + iteration * (iteration + 1) // 2) % capacity
+
+
+class DoubleHashing(ProbingStrategy):
+    """
+    Visits initial + i * step, where the step is a second hash taken from the full hash value (Fibonacci hashing), so keys that share an initial index usually follow different sequences.  The step is odd and the capacity a power of two, so every bucket is visited.
+    """
+
+    power_of_two = True
+
+    def probe(self, initial: int, iteration: int, hashed_key: int, capacity: int) -> int:
+        step = (((hashed_key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> 32) | 1
+        return (initial + iteration * step) % capacity
+
+
+class RobinHoodProbing(LinearProbing):
+    """
+    Linear probing where an insert takes the bucket of any entry that is closer to its own initial index than the new entry is, and a remove shifts the following entries back instead of leaving a tombstone.  Probe lengths stay short and even, and lookups for missing keys stop early.
+    """
+
+    robin_hood = True
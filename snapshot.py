@@ -0,0 +1,111 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Binary snapshot format used by HashMap.dump() and HashMap.load() in hash_map_chaining.py and hash_map_open_addressing.py.
+
+import pickle
+import struct
+
+import hash_functions
+
+# Header: magic, flags, capacity, number of entries, and the length of the hash function name that follows it.
+HEADER = struct.Struct('<8sBQQH')
+MAGIC = b'HMSNAP01'
+
+# Flags.
+KEEP_HASHES = 1
+
+# Entry: optional stored hash, key length and value length, followed by the UTF-8 key and the pickled value.
+ENTRY = struct.Struct('<II')
+HASHED_ENTRY = struct.Struct('<QII')
+
+# Hash functions whose values differ between processes, so stored hashes are never reused for them.
+RANDOMIZED_HASHES = ('hash', 'builtin_hash')
+
+
+def write_snapshot(file, capacity: int, function, size: int, entries, keep_hashes: bool = False) -> None:
+    """
+    This function writes a snapshot to a binary file object.  entries is an iterable of (key, value, hash) for the size entries of the hash map.  The stored hashes are only written if keep_hashes is True, the hash function gives the same values in every process, and every hash fits in an unsigned 64-bit integer.
+    """
+    keep_hashes = keep_hashes and function.__name__ not in RANDOMIZED_HASHES
+    if keep_hashes:
+        # A negative or wider hash cannot be packed, and masking it would no longer match what the hash function returns after load().  The hashes are checked before anything is written, and the snapshot is written without them if one does not fit.
+        entries = list(entries)
+        keep_hashes = all(0 <= hashed_key <= hash_functions.MASK_64 for _, _, hashed_key in entries)
+    name = function.__name__.encode('utf-8')
+    file.write(HEADER.pack(MAGIC, KEEP_HASHES if keep_hashes else 0, capacity, size, len(name)) + name)
+
+    chunk = []
+    dumps = pickle.dumps
+    for key, value, hashed_key in entries:
+        encoded = key.encode('utf-8')
+        value = dumps(value, pickle.HIGHEST_PROTOCOL)
+        if keep_hashes:
+            chunk.append(HASHED_ENTRY.pack(hashed_key, len(encoded), len(value)))
+        else:
+            chunk.append(ENTRY.pack(len(encoded), len(value)))
+        chunk.append(encoded)
+        chunk.append(value)
+
+        # Write the entries out in large chunks.
+        if len(chunk) >= 3 * 4096:
+            file.write(b''.join(chunk))
+            chunk = []
+    file.write(b''.join(chunk))
+
+
+def read_snapshot(file) -> tuple:
+    """
+    This function reads a snapshot written by write_snapshot() from a binary file object and returns (capacity, hash function name, list of (key, value) pairs, list of stored hashes or None).
+    """
+    data = file.read()
+    magic, flags, capacity, size, name_length = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("not a HashMap snapshot")
+    position = HEADER.size
+    name = data[position:position + name_length].decode('utf-8')
+    position += name_length
+
+    pairs = []
+    hashes = [] if flags & KEEP_HASHES else None
+    loads = pickle.loads
+    view = memoryview(data)
+    for _ in range(size):
+        if hashes is not None:
+            hashed_key, key_length, value_length = HASHED_ENTRY.unpack_from(data, position)
+            hashes.append(hashed_key)
+            position += HASHED_ENTRY.size
+        else:
+            key_length, value_length = ENTRY.unpack_from(data, position)
+            position += ENTRY.size
+        key = data[position:position + key_length].decode('utf-8')
+        position += key_length
+        pairs.append((key, loads(view[position:position + value_length])))
+        position += value_length
+
+    return capacity, name, pairs, hashes
+
+
+def resolve_hash_function(name: str):
+    """
+    This function returns the hash function with the given name: Python's hash(), a function of hash_functions.py, or a seeded_hash() function.  It raises ValueError for any other name.
+    """
+    if name == 'hash':
+        return hash
+    function = getattr(hash_functions, name, None)
+    if callable(function) and getattr(function, '__name__', None) == name:
+        return function
+    if name.startswith('seeded_hash_'):
+        return hash_functions.seeded_hash(int(name[len('seeded_hash_'):]))
+    raise ValueError("unknown hash function " + name + ", pass it to load()")
+
+
+def load_arguments(file, function) -> tuple:
+    """
+    This function reads a snapshot for HashMap.load() and returns (capacity, hash function, pairs, hashes).  If function is None, the hash function is looked up by the name in the snapshot.  The stored hashes are only returned if they were made by the same function in a way that does not change between processes.
+    """
+    capacity, name, pairs, hashes = read_snapshot(file)
+    if function is None:
+        function = resolve_hash_function(name)
+    if function.__name__ != name or name in RANDOMIZED_HASHES:
+        hashes = None
+    return capacity, function, pairs, hashes
@@ -0,0 +1,148 @@
+# Author: Elliott Larsen
+# Date: 10/17/2026
+# Description: Opt-in statistics for hash_map_chaining.py and hash_map_open_addressing.py.  HashMap.enable_stats() attaches a HashMapStats object that the hash map updates on every key operation and resize.  Without it, each operation only pays for one "is None" check.
+
+class HashMapStats:
+    """
+    Class collecting statistics of one hash map.  Supported methods are: record_lookup(), record_insert(), record_tombstones(), record_resize(), reset(), report(), and is_degenerate().
+
+    Every key looked up by get(), put(), remove(), contains_key() and the batch methods adds its length to the hit or miss histogram.  For the chaining map the length is the number of nodes compared, for the open addressing map the number of buckets probed.
+    """
+
+    def __init__(self) -> None:
+        """
+        Init a new HashMapStats with all counters at zero.
+        """
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        This method sets all counters back to zero.
+        """
+        # Histograms map a chain or probe length to the number of lookups of that length.
+        self.hits = {}
+        self.misses = {}
+        # Inserts of new keys, and how many of them found their initial bucket taken by another key.
+        self.inserts = 0
+        self.collisions = 0
+        self.resizes = 0
+        self.compactions = 0
+        self.resize_seconds = 0.0
+        self.longest_resize = 0.0
+        self.tombstones_created = 0
+        self.tombstones_reused = 0
+
+    def record_lookup(self, length: int, hit: bool) -> None:
+        """
+        This method adds a lookup of the given chain or probe length to the hit or miss histogram.
+        """
+        histogram = self.hits if hit else self.misses
+        histogram[length] = histogram.get(length, 0) + 1
+
+    def record_insert(self, collision: bool) -> None:
+        """
+        This method counts an insert of a new key.  collision is True if the initial bucket of the key already held another key.
+        """
+        self.inserts += 1
+        if collision:
+            self.collisions += 1
+
+    def record_tombstones(self, created: int, reused: int) -> None:
+        """
+        This method counts tombstones left by removals and tombstones taken by inserts.
+        """
+        self.tombstones_created += created
+        self.tombstones_reused += reused
+
+    def record_resize(self, seconds: float, old_capacity: int, new_capacity: int) -> None:
+        """
+        This method counts a resize that took the given time.  A rehash at the same capacity, as done to drop tombstones, is counted as a compaction.
+        """
+        if old_capacity == new_capacity:
+            self.compactions += 1
+        else:
+            self.resizes += 1
+        self.add_resize_time(seconds)
+
+    def add_resize_time(self, seconds: float) -> None:
+        """
+        This method adds time spent resizing, such as a step of an incremental migration, without counting another resize.
+        """
+        self.resize_seconds += seconds
+        self.longest_resize = max(self.longest_resize, seconds)
+
+    def report(self, hash_map=None) -> dict:
+        """
+        This method returns the statistics as a dict of plain numbers, lists and dicts, ready to be logged or serialized as JSON.  If a hash map is given, its current size, capacity, load factor and tombstones are included.
+        """
+        report = {
+            'hits': summarize(self.hits),
+            'misses': summarize(self.misses),
+            'inserts': self.inserts,
+            'collisions': self.collisions,
+            'collision_rate': self.collisions / self.inserts if self.inserts else 0.0,
+            'resizes': self.resizes,
+            'compactions': self.compactions,
+            'resize_seconds': self.resize_seconds,
+            'longest_resize_seconds': self.longest_resize,
+            'tombstones_created': self.tombstones_created,
+            'tombstones_reused': self.tombstones_reused,
+        }
+        if hash_map is not None:
+            report['size'] = hash_map.size
+            report['capacity'] = hash_map.capacity
+            report['load_factor'] = hash_map.table_load()
+            report['tombstones'] = getattr(hash_map, 'tombstones', 0)
+        return report
+
+    def is_degenerate(self, limit: float = 8.0) -> bool:
+        """
+        This method returns True if the lookups recorded so far needed more than limit comparisons or probes on average, which usually means that the hash function sends many keys to the same buckets.
+        """
+        count, total = 0, 0
+        for histogram in (self.hits, self.misses):
+            for length, lookups in histogram.items():
+                count += lookups
+                total += length * lookups
+        return count > 0 and total / count > limit
+
+
+def summarize(histogram: dict) -> dict:
+    """
+    This function returns the count, mean, 50th and 99th percentile, maximum, and the histogram itself as a list of [length, lookups] pairs sorted by length.
+    """
+    count = sum(histogram.values())
+    pairs = sorted(histogram.items())
+    if count == 0:
+        return {'count': 0, 'mean': 0.0, 'p50': 0, 'p99': 0, 'max': 0, 'histogram': []}
+
+    percentiles = {}
+    seen = 0
+    for length, lookups in pairs:
+        seen += lookups
+        for name, fraction in (('p50', 0.5), ('p99', 0.99)):
+            if name not in percentiles and seen >= fraction * count:
+                percentiles[name] = length
+
+    return {
+        'count': count,
+        'mean': sum(length * lookups for length, lookups in pairs) / count,
+        'p50': percentiles['p50'],
+        'p99': percentiles['p99'],
+        'max': pairs[-1][0],
+        'histogram': [[length, lookups] for length, lookups in pairs],
+    }
+
+
+def chain_length(bucket, node) -> int:
+    """
+    This function returns the number of nodes of a chain compared to find node, or the whole length of the chain if node is None.
+    """
+    if node is None:
+        return bucket.length()
+    length = 1
+    cur = bucket.head
+    while cur is not node:
+        cur = cur.next
+        length += 1
+    return length